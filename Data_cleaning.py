@@ -8,8 +8,9 @@ from collections import Counter
 from difflib import get_close_matches
 from difflib import SequenceMatcher
 import difflib
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
+from relative_dates import parse_relative_dates, scrape_timestamp
 try:
     from rapidfuzz import process as _rf_process, fuzz as _rf_fuzz  # optional, faster fuzzy matching
     RAPIDFUZZ_AVAILABLE = True
@@ -505,8 +506,9 @@ def load_skill_overrides(path: str):
         print(f"⚠ Warning: failed to load overrides from {path}: {e}")
         return {}
 
-def general_cleaning(df, interactive=True, howlong_choice=None, convert_avg_choice=None, map_category=False, map_column=None):
-    """General cleaning function"""
+def general_cleaning(df, interactive=True, howlong_choice=None, convert_avg_choice=None, map_category=False, map_column=None,
+                     scraped_at=None):
+    """General cleaning function (scraped_at: when the 'How Long Ago' values were scraped, default now)"""
     print("\n=== GENERAL CLEANING STARTED ===\n")
     
     # Trim all columns
@@ -525,29 +527,8 @@ def general_cleaning(df, interactive=True, howlong_choice=None, convert_avg_choi
         else:
             date_choice = str(howlong_choice) if howlong_choice in ('1', '2') else '1'
 
-        def convert_time_ago(text):
-            if pd.isna(text):
-                return None
-
-            now = datetime.now()
-            text = str(text).lower()
-
-            if 'minute' in text or 'min' in text:
-                mins = int(re.search(r'\d+', text).group())
-                return now - timedelta(minutes=mins)
-            elif 'hour' in text:
-                hours = int(re.search(r'\d+', text).group())
-                return now - timedelta(hours=hours)
-            elif 'day' in text:
-                days = int(re.search(r'\d+', text).group())
-                return now - timedelta(days=days)
-            elif 'month' in text:
-                months = int(re.search(r'\d+', text).group())
-                return now - timedelta(days=months*30)
-
-            return None
-
-        df['Date Posted'] = df['How Long Ago'].apply(convert_time_ago)
+        # Relative to the scrape, not to when the cleaning runs
+        df['Date Posted'] = parse_relative_dates(df['How Long Ago'], scraped_at or datetime.now())
 
         if date_choice == '1':
             df['Date Posted'] = pd.to_datetime(df['Date Posted']).dt.date
@@ -850,6 +831,7 @@ def main():
     parser.add_argument('--skills-overrides', help='Path to JSON/CSV file with overrides mapping (variant -> canonical)')
     parser.add_argument('--use-rapidfuzz', action='store_true', help='Use rapidfuzz for fuzzy matching if available')
     parser.add_argument('--interactive-review', action='store_true', help='If interactive, open a quick review of mapping report and allow small overrides')
+    parser.add_argument('--scraped-at', help="When the data was scraped (ISO date/time) for 'How Long Ago'; default: SCRAPED_AT or the input file's modification time")
     parser.add_argument('--howlong-choice', choices=['1', '2'], help="How Long Ago conversion: 1=date only,2=date+time")
     parser.add_argument('--convert-years-avg', action='store_true', help='Convert Years Of Exp to average')
     parser.add_argument('--create-dims', action='store_true', help='Create dimension tables (non-interactive will skip)')
@@ -969,6 +951,7 @@ def main():
             convert_avg_choice=args.convert_years_avg,
             map_category=args.map_category,
             map_column=args.map_column,
+            scraped_at=pd.Timestamp(args.scraped_at) if args.scraped_at else scrape_timestamp(file_path),
         )
     else:
         print("Invalid choice!")
@@ -1,7 +1,14 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import subprocess
+import sys
 from PyInstaller.utils.hooks import collect_all
 
-datas = [('assets', 'assets'), ('Jobs.xlsx', '.'), ('Skills_Cleaned_UnPivot.xlsx', '.'), ('geocode_cache.json', '.')]
+# Prebuilt data (build_data_artifact.py): the exe memory-maps it instead of parsing the Excel files
+DATA_ARTIFACT = os.path.join('build', 'data_snapshot')
+subprocess.check_call([sys.executable, 'build_data_artifact.py', '--out', DATA_ARTIFACT])
+
+datas = [('assets', 'assets'), (DATA_ARTIFACT, 'data_snapshot')]
 binaries = []
 hiddenimports = []
 tmp_ret = collect_all('dash_leaflet')
@@ -17,7 +24,8 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Notebook support dash probes for at import (optional, ImportError is handled); slow to load in the exe
+    excludes=['IPython', 'ipykernel', 'jupyter_client', 'nbformat'],
     noarchive=False,
     optimize=0,
 )
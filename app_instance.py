@@ -14,9 +14,29 @@ app = dash.Dash(
 )
 server = app.server
 
-# Initialize cache for map performance
-cache = Cache(app.server, config={
-    'CACHE_TYPE': 'simple',  # In-memory cache
-    'CACHE_DEFAULT_TIMEOUT': 300  # 5 minutes
-})
+import os
+import tempfile
 
+# Shared cache (filters, figures, map payloads, full-map HTML).
+# CACHE_BACKEND: 'sqlite' (default) - one SQLite file shared by all gunicorn workers,
+# 'redis' (CACHE_REDIS_URL) for multi-host deployments, 'simple' (per-process) or 'null' (off).
+# Namespace TTLs and the size budget are described in shared_cache.py.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite').lower()
+cache_config = {'CACHE_DEFAULT_TIMEOUT': 300}  # 5 minutes
+if CACHE_BACKEND == 'redis':
+    cache_config.update({
+        'CACHE_TYPE': 'RedisCache',
+        'CACHE_REDIS_URL': os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0'),
+        'CACHE_KEY_PREFIX': 'ecm:'
+    })
+elif CACHE_BACKEND in ('simple', 'null'):
+    cache_config['CACHE_TYPE'] = CACHE_BACKEND
+else:
+    cache_config.update({
+        'CACHE_TYPE': 'shared_cache.SQLiteCache',
+        'CACHE_PATH': os.environ.get('CACHE_PATH', os.path.join(tempfile.gettempdir(), 'egypt_career_map_cache.sqlite')),
+        'CACHE_MAX_BYTES': int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    })
+
+cache = Cache(app.server, config=cache_config)
+print(f"[+] Cache backend: {cache_config['CACHE_TYPE']}")
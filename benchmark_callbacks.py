@@ -0,0 +1,211 @@
+"""
+Callback Benchmark Suite
+Calls the page callbacks (update_overview, update_deep_analysis,
+update_time_analysis, update_skills_analysis, update_city_map) and
+filter_dataframe_by_search directly, with representative filter combinations,
+on synthetic job datasets of increasing size shaped like Jobs.xlsx.
+
+Each dataset is generated once by synthetic_data.py as a pinned data snapshot
+under bench_data/ and benchmarked in its own process (DATA_SNAPSHOT_DIR pointing at it, caching
+off), so the app loads it exactly like the real data. Per callback and
+scenario it reports the time (min / median of the repeats), the peak Python
+memory allocated during one call (tracemalloc) and the JSON size of the output.
+
+Run: python benchmark_callbacks.py [--sizes 10000,100000,1000000] [--repeats N]
+                                   [--save results.json] [--baseline results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BENCH_DATA_DIR = os.path.join(ROOT, 'bench_data')
+sys.path.insert(0, ROOT)
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+parser.add_argument('--sizes', default='10000,100000,1000000', help='comma-separated job counts')
+parser.add_argument('--repeats', type=int, help='timed calls per scenario (default 3, 1 from 1M rows)')
+parser.add_argument('--save', help='write the results as JSON (use as a later --baseline)')
+parser.add_argument('--baseline', help='earlier --save output to compare against')
+parser.add_argument('--seed', type=int, default=42)
+parser.add_argument('--worker', nargs=2, help=argparse.SUPPRESS)  # internal: <repeats> <result file>
+
+
+# ============================================
+# Worker: benchmark one dataset in this process
+# ============================================
+
+def scenarios(df):
+    """Representative filter combinations, picked from the dataset itself."""
+    top = lambda col, n=1: df[col].value_counts().index[:n].tolist()
+    last_day = df['posted'].max()
+    return {
+        'no filters': {},
+        'top city': {'cities': top('City')},
+        'city+categories+mode': {'cities': top('City'), 'categories': top('Category', 3),
+                                 'work_modes': top('Work Mode'), 'avg_exp_range': [2, 6]},
+        'last 30 days': {'start_date': str((last_day - pd.Timedelta(days=30)).date()), 'end_date': str(last_day.date())},
+        'search "python"': {'search_text': 'python'},
+    }
+
+
+SEARCH_TERMS = ['python', 'sales manager', 'cairo', 'zzz-no-match']
+
+# Values the layouts start with, for arguments a scenario does not set
+DEFAULT_ARGS = {
+    'theme': 'light', 'job_statuses': ['Open'], 'map_style': 'satellite', 'map_mode': 'leaflet',
+    'page_current': 0, 'page_size': 15,
+}
+
+
+def callback_args(func, scenario):
+    import inspect
+    params = inspect.signature(func).parameters
+    values = dict(DEFAULT_ARGS, **scenario)
+    if 'search_term' in params:  # update_city_map names it differently
+        values['search_term'] = scenario.get('search_text')
+    return [values.get(name) for name in params]
+
+
+def output_size(output):
+    from dash import no_update
+    from plotly.io.json import to_json_plotly
+    if isinstance(output, tuple):
+        output = [None if item is no_update else item for item in output]
+    return len(to_json_plotly(output))
+
+
+def measure(call, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = call()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'min_ms': round(min(timings), 1), 'median_ms': round(statistics.median(timings), 1),
+            'peak_mb': round(peak / 1024 / 1024, 1)}, output
+
+
+def run_worker(repeats):
+    import resource
+    load_start = time.perf_counter()
+    import index  # noqa: F401  (loads the dataset snapshot and registers the callbacks)
+    load_s = time.perf_counter() - load_start
+
+    from dash._callback_context import context_value
+    from dash._utils import AttributeDict
+    from data_loader import df
+    from utils import filter_dataframe_by_search
+    from callbacks.overview_callbacks import update_overview
+    from callbacks.deep_analysis_callbacks import update_deep_analysis
+    from callbacks.time_analysis_callbacks import update_time_analysis
+    from callbacks.skills_analysis_callbacks import update_skills_analysis
+    from callbacks.city_map_callbacks_leaflet import update_city_map
+
+    # update_city_map reads callback_context.triggered: pretend a sidebar filter changed
+    context_value.set(AttributeDict(triggered_inputs=[{'prop_id': 'sidebar-city-filter.value', 'value': None}]))
+
+    results = {}
+    for func in (update_overview, update_deep_analysis, update_time_analysis, update_skills_analysis, update_city_map):
+        for name, scenario in scenarios(df).items():
+            args = callback_args(func, scenario)
+            stats, output = measure(lambda: func(*args), repeats)
+            stats['output_kb'] = round(output_size(output) / 1024, 1)
+            if isinstance(output, tuple) and output and output[0] == 'Error':
+                stats['error'] = True
+            results[f'{func.__name__} | {name}'] = stats
+            print(f"  {func.__name__:<24}{name:<24}{stats['median_ms']:>10.0f} ms")
+
+    for term in SEARCH_TERMS:
+        stats, output = measure(lambda: filter_dataframe_by_search(df, term), repeats)
+        stats['output_kb'] = round(output.memory_usage(index=True).sum() / 1024, 1)
+        stats['rows'] = len(output)
+        results[f'filter_dataframe_by_search | "{term}"'] = stats
+
+    return {'rows': len(df), 'load_s': round(load_s, 1),
+            'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'results': results}
+
+
+# ============================================
+# Driver
+# ============================================
+
+def run_size(rows, seed, repeats):
+    from synthetic_data import ensure_dataset
+    path = ensure_dataset(rows, seed)
+    env = dict(os.environ, DATA_SNAPSHOT_DIR=path, CACHE_BACKEND='null', WARMUP='0', SLOW_REQUEST_MS='0',
+               PYTHONUNBUFFERED='1')
+    result_path = os.path.join(BENCH_DATA_DIR, f'result_{rows}_{os.getpid()}.json')
+    print(f"\nBenchmarking {rows:,} jobs ({repeats} repeats)...")
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(repeats), result_path],
+                          env=env, cwd=ROOT)
+    if proc.returncode != 0 or not os.path.exists(result_path):
+        print(f"[!] Worker for {rows:,} jobs failed (exit code {proc.returncode})")
+        return {'rows': rows, 'failed': proc.returncode}
+    with open(result_path) as fh:
+        result = json.load(fh)
+    os.remove(result_path)
+    return result
+
+
+def print_report(all_results, baseline):
+    for size, data in all_results.items():
+        print(f"\n{'=' * 100}\n{int(size):,} jobs", end='')
+        if data.get('failed') is not None:
+            print(f" - FAILED (exit code {data['failed']})")
+            continue
+        print(f" (load {data['load_s']}s, max RSS {data['max_rss_mb']} MB)\n{'=' * 100}")
+        base = baseline.get(size, {}).get('results', {})
+        print(f"{'Callback | scenario':<52}{'Min':>9}{'Median':>10}{'Peak MB':>9}{'Out KB':>10}"
+              + (f"{'Baseline':>11}{'Change':>8}" if base else ''))
+        for name, stats in data['results'].items():
+            line = (f"{name:<52}{stats['min_ms']:>7.0f}ms{stats['median_ms']:>8.0f}ms{stats['peak_mb']:>9.1f}"
+                    f"{stats['output_kb']:>10.1f}")
+            if name in base:
+                before = base[name]['median_ms']
+                line += f"{before:>9.0f}ms{(stats['median_ms'] - before) / before * 100 if before else 0:>+7.0f}%"
+            if stats.get('error'):
+                line += '  ERROR'
+            print(line)
+
+
+def main(args):
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    all_results = {}
+    for rows in sizes:
+        repeats = args.repeats or (3 if rows < 1_000_000 else 1)
+        all_results[str(rows)] = run_size(rows, args.seed, repeats)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+    print_report(all_results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump(all_results, fh, indent=1)
+        print(f"\nSaved results to {args.save}")
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    if args.worker:
+        repeats, result_path = args.worker
+        result = run_worker(int(repeats))
+        with open(result_path, 'w') as fh:
+            json.dump(result, fh)
+    else:
+        main(args)
@@ -0,0 +1,94 @@
+"""
+Figure Construction Benchmark
+Compares the Plotly Express styling path with figure_factory (cached skeletons)
+for the Overview and Deep Analysis charts on the real dataset.
+Run: python benchmark_figures.py [repeats]
+"""
+
+import json
+import sys
+import time
+
+from plotly.io.json import to_json_plotly
+
+sys.path.insert(0, '.')
+from data_loader import df
+import figure_factory as ff
+from chart_templates import strip_template_defaults
+
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+print(f"Loaded {len(df)} jobs, {REPEATS} repeats per chart\n")
+
+
+def counts(col, top=None):
+    vc = df[col].value_counts()
+    return (vc.head(top) if top else vc).sort_values()
+
+
+def to_json(fig):
+    # Same encoder Dash uses for callback responses
+    return to_json_plotly(fig)
+
+
+def timed(builder):
+    builder()  # warm-up (builds the skeleton on the factory path)
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fig = builder()
+    elapsed = (time.perf_counter() - start) / REPEATS * 1000
+    # Dash serializes the returned figure on every response, so include it
+    start = time.perf_counter()
+    payload = to_json(fig)
+    serialize = (time.perf_counter() - start) * 1000
+    return elapsed, serialize, len(payload)
+
+
+edu = counts('education_level')
+career = counts('Career Level')
+categories = counts('Category', top=10)
+work_mode = counts('Work Mode')
+hover = '<b>%{y}</b><br>Count: %{x}<br>Percentage: %{customdata}%<extra></extra>'
+pct = (edu / edu.sum() * 100).round(1)
+
+CHARTS = {
+    'Deep bar (education)': (
+        lambda: ff.deep_bar_reference(edu.index, edu.values, 'light', 'Education Requirements', 'count', 'Education Level', '%{x}', hover, customdata=pct.values),
+        lambda: ff.deep_bar_figure(edu.index, edu.values, 'light', 'Education Requirements', 'count', 'Education Level', '%{x}', hover, customdata=pct.values),
+    ),
+    'Overview bar (career level)': (
+        lambda: ff.overview_bar_reference(career.index, career.values, 'light', 'Jobs by Career Level', 'Career Level'),
+        lambda: ff.overview_bar_figure(career.index, career.values, 'light', 'Jobs by Career Level', 'Career Level'),
+    ),
+    'Overview bar (top categories, selected)': (
+        lambda: ff.overview_bar_reference(categories.index, categories.values, 'dark', 'Top 10 Categories', 'Category', [categories.index[-1]]),
+        lambda: ff.overview_bar_figure(categories.index, categories.values, 'dark', 'Top 10 Categories', 'Category', [categories.index[-1]]),
+    ),
+    'Donut (work mode)': (
+        lambda: ff.donut_reference(work_mode.index, work_mode.values, 'light', 'Jobs by Work Mode', 'Work Mode'),
+        lambda: ff.donut_figure(work_mode.index, work_mode.values, 'light', 'Jobs by Work Mode', 'Work Mode'),
+    ),
+}
+
+print(f"{'Chart':<42}{'Path':<14}{'Build (ms)':>12}{'JSON (ms)':>12}{'Size (KB)':>12}")
+print("-" * 92)
+total_ref = total_new = 0
+for name, (reference, factory) in CHARTS.items():
+    ref_ms, ref_ser, ref_size = timed(reference)
+    new_ms, new_ser, new_size = timed(factory)
+    total_ref += ref_ms + ref_ser
+    total_new += new_ms + new_ser
+    print(f"{name:<42}{'plotly.express':<14}{ref_ms:>12.2f}{ref_ser:>12.2f}{ref_size / 1024:>12.1f}")
+    print(f"{'':<42}{'factory':<14}{new_ms:>12.2f}{new_ser:>12.2f}{new_size / 1024:>12.1f}")
+
+    # Sanity check: the factory dict must describe the same figure
+    ref_fig = json.loads(to_json(reference()))
+    new_fig = json.loads(to_json(factory()))
+    ref_layout = strip_template_defaults(ref_fig['layout'], ref_fig['layout']['template']['layout'])
+    same_layout = ref_layout == new_fig['layout']
+    if not same_layout:
+        print(f"   ⚠️ layout differs from the Plotly Express path")
+
+print("-" * 92)
+print(f"Total build + serialize: plotly.express {total_ref:.1f} ms, factory {total_new:.1f} ms "
+      f"({total_ref / total_new:.1f}x faster)")
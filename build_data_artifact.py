@@ -0,0 +1,64 @@
+"""
+Desktop Data Artifact
+Builds the data snapshot bundled into the PyInstaller exe (EgyptCareerMap.spec
+runs this before packaging). The Excel sources are loaded and normalized once at
+build time and written as memory-mappable columns, together with the load-time
+indexes, facets, time cube and dataset version (data_loader.build_derived). The
+frozen app maps them at launch instead of unpacking and parsing the spreadsheets.
+
+The artifact is pinned (see dataset_snapshot): the bundled copy is used as is,
+whatever the file times inside the exe's temporary folder. Relative "N days ago"
+dates are resolved at build time against the scrape time: --scraped-at (or
+SCRAPED_AT), falling back to Jobs.xlsx's modification time, which a fresh
+checkout does not preserve. The anchor used is recorded in the artifact.
+
+Run: python build_data_artifact.py [--out build/data_snapshot] [--scraped-at 2025-10-23T21:36]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(ROOT, 'build', 'data_snapshot')
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+parser.add_argument('--out', default=DEFAULT_OUT, help='artifact directory (bundled as data_snapshot)')
+parser.add_argument('--scraped-at', help='when Jobs.xlsx was scraped, local ISO date/time (default: SCRAPED_AT or the file time)')
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    os.environ['WARMUP'] = '0'
+    if args.scraped_at:
+        os.environ['SCRAPED_AT'] = args.scraped_at
+    if os.environ.get('SCRAPED_AT'):
+        os.environ['DATA_SNAPSHOT'] = '0'  # the local snapshot may have resolved dates against another anchor
+    start = time.perf_counter()
+
+    # Same data the server would load: the Excel files, or the local snapshot when it is up to date (and no anchor is given)
+    import data_loader
+    from dataset_snapshot import write_snapshot, load_snapshot, load_derived
+    from relative_dates import scrape_timestamp
+
+    scraped_at = scrape_timestamp(data_loader.SNAPSHOT_SOURCES[0])
+    if not os.environ.get('SCRAPED_AT'):
+        print(f"[!] No --scraped-at / SCRAPED_AT: relative dates use Jobs.xlsx's file time ({scraped_at})")
+
+    derived = data_loader.build_derived(data_loader.df, data_loader.skills_df)
+    derived['code_stamp'] = None  # the exe has no sources to compare against
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    write_snapshot(args.out, {'jobs': data_loader.df, 'skills': data_loader.skills_df}, data_loader.SNAPSHOT_SOURCES,
+                   pinned={'artifact': 'desktop', 'built_at': datetime.now().isoformat(timespec='seconds'),
+                           'scraped_at': scraped_at.isoformat(), 'data_version': derived['data_version']},
+                   derived=derived)
+
+    # Read it back the way the frozen app will
+    tables, saved = load_snapshot(args.out), load_derived(args.out)
+    if tables is None or saved is None or len(tables['jobs']) != len(data_loader.df):
+        sys.exit(f"[!] Artifact at {args.out} could not be read back")
+    size = sum(os.path.getsize(os.path.join(folder, name)) for folder, _, names in os.walk(args.out) for name in names)
+    print(f"[+] Wrote data artifact {args.out}: {len(data_loader.df):,} jobs, {len(data_loader.skills_df):,} skills rows, "
+          f"data version {saved['data_version']}, {size / 1024 / 1024:.1f} MB in {time.perf_counter() - start:.1f}s")
@@ -2,17 +2,14 @@ from dash import Input, Output, State, dash_table, callback_context, no_update,
 import dash_leaflet as dl
 import pandas as pd
 from app_instance import app
-from data_loader import df
+from data_loader import df, exp_range_index, data_version
+from shared_cache import cache_key, cached_value
 from utils import get_color_scale, apply_visual_highlighting, apply_chart_styling
 import json
 import uuid
-import folium
-from folium.plugins import FastMarkerCluster
-import uuid
 import gc
 import sys
 import time
-from dash_extensions.javascript import Namespace
 
 # Callback to Toggle Map Mode
 @app.callback(
@@ -114,6 +111,64 @@ app.clientside_callback(
     prevent_initial_call=True
 )
 
+def build_jobs_geojson(map_df):
+    """Clustered-marker FeatureCollection (HTML tooltip + link per job), or None when there are no points"""
+    if 'Latitude' not in map_df.columns or 'Longitude' not in map_df.columns:
+        return None
+    features = []
+
+    # Convert columns to lists for speed
+    titles = map_df['Job Title'].astype(str).str.replace("'", "", regex=False).fillna("Job").tolist()
+    companies = map_df['Company'].astype(str).str.replace("'","", regex=False).fillna("").tolist()
+    cities = map_df['City'].astype(str).fillna("").tolist()
+    in_cities = map_df['In_City'].astype(str).fillna("").tolist()
+    links = map_df['Link'].astype(str).fillna("#").tolist()
+    lats = map_df['Latitude'].tolist()
+    lons = map_df['Longitude'].tolist()
+
+    for lat, lon, title, comp, city, in_city, link in zip(lats, lons, titles, companies, cities, in_cities, links):
+        try:
+            lat_flt = float(lat)
+            lon_flt = float(lon)
+            if pd.isna(lat_flt) or pd.isna(lon_flt): continue
+
+            # Format Location String
+            loc_str = str(city)
+            inc = str(in_city).lower()
+            if inc and inc not in ['nan', 'none', '']:
+                loc_str = f"{loc_str} | {str(in_city)}"
+
+            # BEAAUTIFUL HTML TOOLTIP (Restored)
+            # Using CSS classes from assets/map_cluster.css for styling
+            tooltip_html = (
+                f'<div>'
+                f'<div class="job-tooltip-title">{title}</div>'
+                f'<div class="job-tooltip-comp">{comp}</div>'
+                f'<div class="job-tooltip-loc">{loc_str}</div>'
+                f'<div class="job-tooltip-link">Click to Visit</div>'
+                f'</div>'
+            )
+
+            features.append({
+                "type": "Feature",
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": [lon_flt, lat_flt]
+                },
+                "properties": {
+                    "tooltip": tooltip_html, # Dash Leaflet renders HTML string automatically
+                    "link": link
+                }
+            })
+        except: continue
+
+    if not features:
+        return None
+    return {
+        "type": "FeatureCollection",
+        "features": features
+    }
+
 @app.callback(
     [Output('city-total-jobs-kpi', 'children'),
      Output('city-top-city-kpi', 'children'),
@@ -152,7 +207,6 @@ def update_city_map(companies, cities, categories, work_modes, job_statuses, emp
                     active_cell, map_mode, page_current, page_size, nav_action_data, current_table_data):
     
     try:
-        print("DEBUG: update_city_map triggered")
         # Explicit GC
         gc.collect()
         
@@ -193,17 +247,15 @@ def update_city_map(companies, cities, categories, work_modes, job_statuses, emp
         if education_levels:
             # Fixed Column Name
             filtered_df = filtered_df[filtered_df['education_level'].isin(education_levels)]
-        if avg_exp_range:
-            # Added Avg Exp Filter
+        if avg_exp_range and exp_range_index is not None:
+            # Added Avg Exp Filter (range index lookup)
             min_exp, max_exp = avg_exp_range
             # Include NaNs if min_exp is 0 (default range start)
-            mask = (filtered_df['Year Of Exp_Avg'] >= min_exp) & (filtered_df['Year Of Exp_Avg'] <= max_exp)
-            if min_exp == 0:
-                mask = mask | filtered_df['Year Of Exp_Avg'].isna()
-            filtered_df = filtered_df[mask]
+            filtered_df = exp_range_index.filter(filtered_df, min_exp, max_exp, include_missing=(min_exp == 0))
             
         if search_term:
-            mask = filtered_df.apply(lambda row: row.astype(str).str.contains(search_term, case=False, na=False).any(), axis=1)
+            # exp_bucket is a derived label column, keep it out of the text search
+            mask = filtered_df.drop(columns=['exp_bucket'], errors='ignore').apply(lambda row: row.astype(str).str.contains(search_term, case=False, na=False).any(), axis=1)
             filtered_df = filtered_df[mask]
 
         # DEFINITION MOVED TO TOP SCOPE TO PREVENT NameError
@@ -349,6 +401,9 @@ def update_city_map(companies, cities, categories, work_modes, job_statuses, emp
              
         # --- BRANCH A: INTERACTIVE (FOLIUM) MODE ---
         if map_mode == 'interactive' and run_map_logic:
+            # Folium is only needed here; imported on first use to keep it out of startup
+            import folium
+            from folium.plugins import FastMarkerCluster
             center_location = [26.8, 30.8]
             # ... (Rest of Branch A variables) ...
             zoom_level = 6
@@ -750,76 +805,11 @@ def update_city_map(companies, cities, categories, work_modes, job_statuses, emp
                 # RESTORED LOGIC: Full Data + Clustering (Plain Text Tooltips)
                 # ---------------------------------------------------------
                 
-                geojson_data = None
-                
-
-
-                # 2. Map Data Generation
-                if 'Latitude' in map_df.columns and 'Longitude' in map_df.columns:
-                    features = []
-                    
-                    # Convert columns to lists for speed
-                    # ... (keep existing setup) ...
-                    titles = map_df['Job Title'].astype(str).str.replace("'", "", regex=False).fillna("Job").tolist()
-                    companies = map_df['Company'].astype(str).str.replace("'","", regex=False).fillna("").tolist()
-                    cities = map_df['City'].astype(str).fillna("").tolist()
-                    in_cities = map_df['In_City'].astype(str).fillna("").tolist()
-                    links = map_df['Link'].astype(str).fillna("#").tolist()
-                    lats = map_df['Latitude'].tolist()
-                    lons = map_df['Longitude'].tolist()
-
-                    # Define row for single view if needed (Safe Check)
-                    if is_single_view and selected_row is not None:
-                        row = selected_row
-                        # ... Logic will follow in next chunk or rely on existing loop if I don't change it ..
-                        # Wait, I need to check where I am editing.
-                        # The block below 'if is_single_view and selected_row:' is further down.
-                        # I will edit that separately or include it here if contiguous.
-                        # It is separated by the loop. I'll stick to Bar Chart here and do the Series fix in a separate chunk.
-                        pass
-
-                    
-                    for lat, lon, title, comp, city, in_city, link in zip(lats, lons, titles, companies, cities, in_cities, links):
-                        try:
-                            lat_flt = float(lat)
-                            lon_flt = float(lon)
-                            if pd.isna(lat_flt) or pd.isna(lon_flt): continue
-                            
-                            # Format Location String
-                            loc_str = str(city)
-                            inc = str(in_city).lower()
-                            if inc and inc not in ['nan', 'none', '']:
-                                loc_str = f"{loc_str} | {str(in_city)}"
-                            
-                            # BEAAUTIFUL HTML TOOLTIP (Restored)
-                            # Using CSS classes from assets/map_cluster.css for styling
-                            tooltip_html = (
-                                f'<div>'
-                                f'<div class="job-tooltip-title">{title}</div>'
-                                f'<div class="job-tooltip-comp">{comp}</div>'
-                                f'<div class="job-tooltip-loc">{loc_str}</div>'
-                                f'<div class="job-tooltip-link">Click to Visit</div>'
-                                f'</div>'
-                            )
-                            
-                            features.append({
-                                "type": "Feature",
-                                "geometry": {
-                                    "type": "Point",
-                                    "coordinates": [lon_flt, lat_flt]
-                                },
-                                "properties": {
-                                    "tooltip": tooltip_html, # Dash Leaflet renders HTML string automatically
-                                    "link": link
-                                }
-                            })
-                        except: continue
-
-                    if features:
-                        geojson_data = {
-                            "type": "FeatureCollection",
-                            "features": features
-                        }
+                # 2. Map Data Generation - the GeoJSON only depends on the filters, so it is
+                # shared across workers through the 'map' cache namespace
+                geojson_key = cache_key('map', data_version, companies, cities, categories, work_modes, job_statuses,
+                                        employment_types, career_levels, education_levels, avg_exp_range, search_term)
+                geojson_data = cached_value(geojson_key, lambda: build_jobs_geojson(map_df))
 
                 # TILE LAYER SELECTION (Fixed URLs)
                 # Ensure we use {z}/{x}/{y} format which is standard for Leaflet
@@ -1,95 +1,22 @@
 from dash import Input, Output, State
-import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from app_instance import app
-from data_loader import df
-from utils import get_color_scale, create_empty_chart, apply_large_fonts_to_chart
+from shared_cache import cached_callback
+from data_loader import df, exp_range_index
+from utils import create_empty_chart
+from data_index import bucket_counts
+from figure_factory import deep_bar_figure
+from parallel_figures import build_figures
 
-@app.callback(
-    [Output('top-companies-chart', 'figure'),
-     Output('education-level-chart', 'figure'),
-     Output('skills-cloud', 'figure'),
-     Output('experience-chart', 'figure'),
-     Output('applicants-chart', 'figure'),
-     Output('deep-total-jobs-kpi', 'children'),
-     Output('deep-total-applicants-kpi', 'children'),
-     Output('deep-avg-exp-kpi', 'children'),
-     Output('deep-avg-applicants-kpi', 'children'),
-     Output('deep-top-career-kpi', 'children')],
-    [Input('sidebar-company-filter', 'value'),
-     Input('sidebar-city-filter', 'value'),
-     Input('sidebar-category-filter', 'value'),
-     Input('sidebar-work-mode-filter', 'value'),
-     Input('sidebar-employment-type-filter', 'value'),
-     Input('sidebar-career-level-filter', 'value'),
-     Input('sidebar-education-filter', 'value'),
-     Input('sidebar-date-filter', 'start_date'),
-     Input('sidebar-date-filter', 'end_date'),
-     Input('sidebar-in-city-filter', 'value'),
-     Input('sidebar-avg-exp-filter', 'value'),
-     Input('sidebar-month-filter', 'value'),
-     Input('global-search-bar', 'value'),
-     Input('theme-store', 'data')],
-    prevent_initial_call=False
-)
-def update_deep_analysis(companies, cities, categories, work_modes, employment_types, career_levels, education_levels, start_date, end_date, in_cities, avg_exp_range, months, search_text, theme):
-    filtered_df = df.copy()
-    
-    # Ensure Year Of Exp_Avg is numeric BEFORE filtering
-    if 'Year Of Exp_Avg' in filtered_df.columns:
-        filtered_df['Year Of Exp_Avg'] = pd.to_numeric(filtered_df['Year Of Exp_Avg'], errors='coerce')
-        
-    # Ensure posted is datetime
-    if 'posted' in filtered_df.columns:
-        filtered_df['posted'] = pd.to_datetime(filtered_df['posted'], errors='coerce')
-        
-    # Ensure applicants is numeric
-    if 'applicants' in filtered_df.columns:
-        filtered_df['applicants'] = pd.to_numeric(filtered_df['applicants'], errors='coerce')
-    
-    # Apply filters
-    if companies:
-        filtered_df = filtered_df[filtered_df['Company'].isin(companies)]
-    if cities:
-        filtered_df = filtered_df[filtered_df['City'].isin(cities)]
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    if work_modes:
-        filtered_df = filtered_df[filtered_df['Work Mode'].isin(work_modes)]
-    if employment_types:
-        filtered_df = filtered_df[filtered_df['Employment Type'].isin(employment_types)]
-    if career_levels:
-        filtered_df = filtered_df[filtered_df['Career Level'].isin(career_levels)]
-    if education_levels:
-        filtered_df = filtered_df[filtered_df['education_level'].isin(education_levels)]
-    if start_date and end_date and 'posted' in filtered_df.columns:
-        filtered_df = filtered_df[(filtered_df['posted'] >= start_date) & (filtered_df['posted'] <= end_date)]
-    if in_cities and 'In_City' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['In_City'].isin(in_cities)]
-    if avg_exp_range and 'Year Of Exp_Avg' in filtered_df.columns:
-        min_exp, max_exp = avg_exp_range[0], avg_exp_range[1]
-        if min_exp == 0:
-             filtered_df = filtered_df[((filtered_df['Year Of Exp_Avg'] >= min_exp) & (filtered_df['Year Of Exp_Avg'] <= max_exp)) | (filtered_df['Year Of Exp_Avg'].isna())]
-        else:
-             filtered_df = filtered_df[(filtered_df['Year Of Exp_Avg'] >= min_exp) & (filtered_df['Year Of Exp_Avg'] <= max_exp)]
-    if months and 'posted' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['posted'].dt.month.isin(months)]
-    
-    # Apply search text filter
-    if search_text and search_text.strip():
-        from utils import filter_dataframe_by_search
-        filtered_df = filter_dataframe_by_search(filtered_df, search_text)
+def _get_mode(series):
+    """Helper to get mode safely"""
+    m = series.mode()
+    return m[0] if not m.empty else 'N/A'
 
-    deep_blue_scale = get_color_scale(theme)
+def company_performance_chart(filtered_df, theme):
+    """CHART 1: Company Performance (top companies by total applicants, or job postings)"""
     has_applicants = 'applicants' in filtered_df.columns
-    
-    # Helper to get mode safely
-    def get_mode(series):
-        m = series.mode()
-        return m[0] if not m.empty else 'N/A'
-
-    # CHART 1: Company Performance
     if 'Company' in filtered_df.columns and not filtered_df.empty:
         # Columns to aggregate
         agg_dict = {'Job Title': 'count'}
@@ -122,9 +49,9 @@ def update_deep_analysis(companies, cities, categories, work_modes, employment_t
             comp_df = filtered_df[filtered_df['Company'] == company]
             enriched_data.append({
                 'Company': company,
-                'Work Mode': get_mode(comp_df['Work Mode']) if 'Work Mode' in comp_df else 'N/A',
-                'Employment Type': get_mode(comp_df['Employment Type']) if 'Employment Type' in comp_df else 'N/A',
-                'Career Level': get_mode(comp_df['Career Level']) if 'Career Level' in comp_df else 'N/A',
+                'Work Mode': _get_mode(comp_df['Work Mode']) if 'Work Mode' in comp_df else 'N/A',
+                'Employment Type': _get_mode(comp_df['Employment Type']) if 'Employment Type' in comp_df else 'N/A',
+                'Career Level': _get_mode(comp_df['Career Level']) if 'Career Level' in comp_df else 'N/A',
                 'Avg Exp': round(comp_df['Year Of Exp_Avg'].mean(), 1) if 'Year Of Exp_Avg' in comp_df else 0
             })
         
@@ -133,24 +60,11 @@ def update_deep_analysis(companies, cities, categories, work_modes, employment_t
             top_companies = top_companies.merge(enriched_df, on='Company')
 
         if not top_companies.empty:
-            company_performance_fig = px.bar(
-                top_companies, x='primary_metric', y='Company', title=title, orientation='h', 
-                color='primary_metric', color_continuous_scale=deep_blue_scale
-            )
-            company_performance_fig.update_layout(
-                height=600, font=dict(color='#001F3F'), plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=250, r=100, t=80, b=50), showlegend=False, coloraxis_showscale=False,
-                xaxis=dict(fixedrange=True, showticklabels=False, showgrid=False, title=None),
-                yaxis=dict(fixedrange=True, tickfont=dict(size=17), title=None),
-                dragmode=False, title_font=dict(size=24)
-            )
-            
-            # Prepare Custom Data
-            # Stack columns: [Work Mode, Emp Type, Career Level, Avg Exp, Job Title (count)]
+            # Custom Data: [Work Mode, Emp Type, Career Level, Avg Exp, Job Title (count)]
             custom_data = top_companies[['Work Mode', 'Employment Type', 'Career Level', 'Avg Exp', 'Job Title']].values
-            
-            company_performance_fig.update_traces(
-                texttemplate='%{x:,.0f}', textposition='outside', textfont=dict(size=17, color='#001F3F'),
+            company_performance_fig = deep_bar_figure(
+                top_companies['Company'], top_companies['primary_metric'], theme, title,
+                value_col='primary_metric', label_col='Company', texttemplate='%{x:,.0f}',
                 hovertemplate=(
                     '<span style="font-size: 16px; font-weight: bold;">%{y}</span><br><br>' +
                     f'{metric_name}: <b>%{{x:,.0f}}</b><br>' +
@@ -160,64 +74,37 @@ def update_deep_analysis(companies, cities, categories, work_modes, employment_t
                     'Type: <b>%{customdata[1]}</b><br>' +
                     'Mode: <b>%{customdata[0]}</b><extra></extra>'
                 ),
-                customdata=custom_data,
-                hoverlabel=dict(bgcolor='#001F3F', font_size=16, font_family='Inter', font_color='white', align='left')
+                customdata=custom_data, hover_font_size=16, hover_align='left'
             )
         else:
             company_performance_fig = create_empty_chart(title, theme=theme)
     else:
         company_performance_fig = create_empty_chart('Top Companies', theme=theme)
-    
-    # Apply large fonts to company performance chart
-    if not isinstance(company_performance_fig.data, tuple) or len(company_performance_fig.data) > 0:
-        company_performance_fig = apply_large_fonts_to_chart(company_performance_fig, theme=theme)
-    
-    # CHART 2: Experience Level Demand
-    if 'Year Of Exp_Avg' in filtered_df.columns and not filtered_df.empty:
-        def bucket_experience(years):
-            if pd.isna(years): return 'Not Specified'
-            if years < 1: return '0-1 years'
-            elif years < 3: return '1-3 years'
-            elif years < 5: return '3-5 years'
-            elif years < 7: return '5-7 years'
-            elif years < 10: return '7-10 years'
-            else: return '10+ years'
-        
-        filtered_df['exp_bucket'] = filtered_df['Year Of Exp_Avg'].apply(bucket_experience)
-        exp_counts = filtered_df['exp_bucket'].value_counts().reset_index()
-        exp_counts.columns = ['Experience Level', 'count']
-        bucket_order = ['0-1 years', '1-3 years', '3-5 years', '5-7 years', '7-10 years', '10+ years', 'Not Specified']
-        exp_counts['order'] = exp_counts['Experience Level'].apply(lambda x: bucket_order.index(x) if x in bucket_order else 999)
-        exp_counts = exp_counts.sort_values('order').drop('order', axis=1)
+    return company_performance_fig
+
+def experience_level_chart(filtered_df, theme):
+    """CHART 2: Experience Level Demand (jobs per precomputed experience bucket)"""
+    if 'exp_bucket' in filtered_df.columns and not filtered_df.empty:
+        # Bucket codes are precomputed at load time; counting is a bincount in bucket order
+        exp_counts = bucket_counts(filtered_df['exp_bucket'])
+        exp_counts = exp_counts[exp_counts['count'] > 0].reset_index(drop=True)
         exp_counts['percentage'] = (exp_counts['count'] / exp_counts['count'].sum() * 100).round(1)
         
         if not exp_counts.empty:
-            experience_buckets_fig = px.bar(
-                exp_counts, x='count', y='Experience Level', title='Experience Level Demand', orientation='h', color='count', color_continuous_scale=deep_blue_scale
-            )
-            experience_buckets_fig.update_layout(
-                height=600, font=dict(color='#001F3F'), plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=250, r=100, t=80, b=50), showlegend=False, coloraxis_showscale=False,
-                xaxis=dict(fixedrange=True, showticklabels=False, showgrid=False, title=None),
-                yaxis=dict(fixedrange=True, tickfont=dict(size=17), title=None),
-                dragmode=False, title_font=dict(size=24)
-            )
-            experience_buckets_fig.update_traces(
-                texttemplate='%{x}', textposition='outside', textfont=dict(size=17, color='#001F3F'),
+            experience_buckets_fig = deep_bar_figure(
+                exp_counts['Experience Level'], exp_counts['count'], theme, 'Experience Level Demand',
+                value_col='count', label_col='Experience Level', texttemplate='%{x}',
                 hovertemplate='<b>%{y}</b><br>Jobs: %{x}<br>Percentage: %{customdata}%<extra></extra>',
-                customdata=exp_counts['percentage'].values,
-                hoverlabel=dict(bgcolor='#001F3F', font_size=14, font_family='Inter', font_color='white')
+                customdata=exp_counts['percentage'].values
             )
         else:
             experience_buckets_fig = create_empty_chart('Experience Level Demand', theme=theme)
     else:
         experience_buckets_fig = create_empty_chart('Experience Level Demand', theme=theme)
-    
-    # Apply large fonts to experience chart
-    if not isinstance(experience_buckets_fig.data, tuple) or len(experience_buckets_fig.data) > 0:
-        experience_buckets_fig = apply_large_fonts_to_chart(experience_buckets_fig, theme=theme)
-    
-    # CHART 3: Career Level by Average Years of Experience
+    return experience_buckets_fig
+
+def career_level_experience_chart(filtered_df, theme):
+    """CHART 3: Career Level by Average Years of Experience"""
     if 'Career Level' in filtered_df.columns and 'Year Of Exp_Avg' in filtered_df.columns and not filtered_df.empty:
         career_exp = filtered_df.groupby('Career Level')['Year Of Exp_Avg'].mean().reset_index()
         career_exp.columns = ['Career Level', 'avg_experience']
@@ -227,32 +114,20 @@ def update_deep_analysis(companies, cities, categories, work_modes, employment_t
         career_exp = career_exp.merge(career_counts, on='Career Level').sort_values('avg_experience', ascending=True)
         
         if not career_exp.empty:
-            career_level_fig = px.bar(
-                career_exp, x='avg_experience', y='Career Level', title='Career Level by Average Years of Experience', orientation='h', color='avg_experience', color_continuous_scale=deep_blue_scale
-            )
-            career_level_fig.update_layout(
-                height=600, font=dict(color='#001F3F'), plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=250, r=100, t=80, b=50), showlegend=False, coloraxis_showscale=False,
-                xaxis=dict(fixedrange=True, showticklabels=False, showgrid=False, title=None),
-                yaxis=dict(fixedrange=True, tickfont=dict(size=17), title=None),
-                dragmode=False, title_font=dict(size=24)
-            )
-            career_level_fig.update_traces(
-                texttemplate='%{x:.1f}', textposition='outside', textfont=dict(size=17, color='#001F3F'),
+            career_level_fig = deep_bar_figure(
+                career_exp['Career Level'], career_exp['avg_experience'], theme, 'Career Level by Average Years of Experience',
+                value_col='avg_experience', label_col='Career Level', texttemplate='%{x:.1f}',
                 hovertemplate='<b>%{y}</b><br>Avg Experience: %{x:.1f} years<br>Job Postings: %{customdata}<extra></extra>',
-                customdata=career_exp['job_count'].values,
-                hoverlabel=dict(bgcolor='#001F3F', font_size=14, font_family='Inter', font_color='white')
+                customdata=career_exp['job_count'].values
             )
         else:
             career_level_fig = create_empty_chart('Career Level by Average Years of Experience', theme=theme)
     else:
         career_level_fig = create_empty_chart('Career Level by Average Years of Experience', theme=theme)
-    
-    # Apply large fonts to career level chart
-    if not isinstance(career_level_fig.data, tuple) or len(career_level_fig.data) > 0:
-        career_level_fig = apply_large_fonts_to_chart(career_level_fig, theme=theme)
-    
-    # CHART 4: Education Requirements
+    return career_level_fig
+
+def education_requirements_chart(filtered_df, theme):
+    """CHART 4: Education Requirements (jobs per education level)"""
     if 'education_level' in filtered_df.columns and not filtered_df.empty:
         edu_counts = filtered_df['education_level'].value_counts().reset_index()
         edu_counts.columns = ['Education Level', 'count']
@@ -260,32 +135,21 @@ def update_deep_analysis(companies, cities, categories, work_modes, employment_t
         edu_counts['percentage'] = (edu_counts['count'] / edu_counts['count'].sum() * 100).round(1)
         
         if not edu_counts.empty:
-            education_distribution_fig = px.bar(
-                edu_counts, x='count', y='Education Level', title='Education Requirements', orientation='h', color='count', color_continuous_scale=deep_blue_scale
-            )
-            education_distribution_fig.update_layout(
-                height=600, font=dict(color='#001F3F'), plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=250, r=100, t=80, b=50), showlegend=False, coloraxis_showscale=False,
-                xaxis=dict(fixedrange=True, showticklabels=False, showgrid=False, title=None),
-                yaxis=dict(fixedrange=True, tickfont=dict(size=17), title=None),
-                dragmode=False, title_font=dict(size=24)
-            )
-            education_distribution_fig.update_traces(
-                texttemplate='%{x}', textposition='outside', textfont=dict(size=17, color='#001F3F'),
+            education_distribution_fig = deep_bar_figure(
+                edu_counts['Education Level'], edu_counts['count'], theme, 'Education Requirements',
+                value_col='count', label_col='Education Level', texttemplate='%{x}',
                 hovertemplate='<b>%{y}</b><br>Count: %{x}<br>Percentage: %{customdata}%<extra></extra>',
-                customdata=edu_counts['percentage'].values,
-                hoverlabel=dict(bgcolor='#001F3F', font_size=14, font_family='Inter', font_color='white')
+                customdata=edu_counts['percentage'].values
             )
         else:
             education_distribution_fig = create_empty_chart('Education Requirements', theme=theme)
     else:
         education_distribution_fig = create_empty_chart('Education Requirements', theme=theme)
-    
-    # Apply large fonts to education chart
-    if not isinstance(education_distribution_fig.data, tuple) or len(education_distribution_fig.data) > 0:
-        education_distribution_fig = apply_large_fonts_to_chart(education_distribution_fig, theme=theme)
-    
-    # CHART 5: Company Hiring Intensity
+    return education_distribution_fig
+
+def hiring_intensity_chart(filtered_df, theme):
+    """CHART 5: Company Hiring Intensity (companies with the most applicants per posting)"""
+    has_applicants = 'applicants' in filtered_df.columns
     if 'Company' in filtered_df.columns and not filtered_df.empty and has_applicants:
         company_intensity = filtered_df.groupby('Company').agg({
             'applicants': 'mean',
@@ -296,30 +160,98 @@ def update_deep_analysis(companies, cities, categories, work_modes, employment_t
         top_intensity = company_intensity.nlargest(10, 'avg_applicants').sort_values('avg_applicants', ascending=True)
         
         if not top_intensity.empty:
-            hiring_intensity_fig = px.bar(
-                top_intensity, x='avg_applicants', y='Company', title='Most Competitive Companies (Avg Applicants per Posting)', orientation='h', color='avg_applicants', color_continuous_scale=deep_blue_scale
-            )
-            hiring_intensity_fig.update_layout(
-                height=600, font=dict(color='#001F3F'), plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=250, r=100, t=80, b=50), showlegend=False, coloraxis_showscale=False,
-                xaxis=dict(fixedrange=True, showticklabels=False, showgrid=False, title=None),
-                yaxis=dict(fixedrange=True, tickfont=dict(size=17), title=None),
-                dragmode=False, title_font=dict(size=24)
-            )
-            hiring_intensity_fig.update_traces(
-                texttemplate='%{x:.1f}', textposition='outside', textfont=dict(size=17, color='#001F3F'),
+            hiring_intensity_fig = deep_bar_figure(
+                top_intensity['Company'], top_intensity['avg_applicants'], theme, 'Most Competitive Companies (Avg Applicants per Posting)',
+                value_col='avg_applicants', label_col='Company', texttemplate='%{x:.1f}',
                 hovertemplate='<b>%{y}</b><br>Avg Applicants: %{x:.1f}<br>Total Postings: %{customdata}<extra></extra>',
-                customdata=top_intensity['postings'].values,
-                hoverlabel=dict(bgcolor='#001F3F', font_size=14, font_family='Inter', font_color='white')
+                customdata=top_intensity['postings'].values
             )
         else:
             hiring_intensity_fig = create_empty_chart('Most Competitive Companies (Avg Applicants per Posting)', theme=theme)
     else:
         hiring_intensity_fig = create_empty_chart('Most Competitive Companies (Avg Applicants per Posting)', theme=theme)
+    return hiring_intensity_fig
+
+@app.callback(
+    [Output('top-companies-chart', 'figure'),
+     Output('education-level-chart', 'figure'),
+     Output('skills-cloud', 'figure'),
+     Output('experience-chart', 'figure'),
+     Output('applicants-chart', 'figure'),
+     Output('deep-total-jobs-kpi', 'children'),
+     Output('deep-total-applicants-kpi', 'children'),
+     Output('deep-avg-exp-kpi', 'children'),
+     Output('deep-avg-applicants-kpi', 'children'),
+     Output('deep-top-career-kpi', 'children')],
+    [Input('sidebar-company-filter', 'value'),
+     Input('sidebar-city-filter', 'value'),
+     Input('sidebar-category-filter', 'value'),
+     Input('sidebar-work-mode-filter', 'value'),
+     Input('sidebar-employment-type-filter', 'value'),
+     Input('sidebar-career-level-filter', 'value'),
+     Input('sidebar-education-filter', 'value'),
+     Input('sidebar-date-filter', 'start_date'),
+     Input('sidebar-date-filter', 'end_date'),
+     Input('sidebar-in-city-filter', 'value'),
+     Input('sidebar-avg-exp-filter', 'value'),
+     Input('sidebar-month-filter', 'value'),
+     Input('global-search-bar', 'value'),
+     Input('theme-store', 'data')],
+    prevent_initial_call=False
+)
+@cached_callback('figures')
+def update_deep_analysis(companies, cities, categories, work_modes, employment_types, career_levels, education_levels, start_date, end_date, in_cities, avg_exp_range, months, search_text, theme):
+    filtered_df = df.copy()
+    
+    # Year Of Exp_Avg is coerced to numeric once at load time (data_loader)
+        
+    # Ensure posted is datetime
+    if 'posted' in filtered_df.columns:
+        filtered_df['posted'] = pd.to_datetime(filtered_df['posted'], errors='coerce')
+        
+    # Ensure applicants is numeric
+    if 'applicants' in filtered_df.columns:
+        filtered_df['applicants'] = pd.to_numeric(filtered_df['applicants'], errors='coerce')
+    
+    # Apply filters
+    if companies:
+        filtered_df = filtered_df[filtered_df['Company'].isin(companies)]
+    if cities:
+        filtered_df = filtered_df[filtered_df['City'].isin(cities)]
+    if categories:
+        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
+    if work_modes:
+        filtered_df = filtered_df[filtered_df['Work Mode'].isin(work_modes)]
+    if employment_types:
+        filtered_df = filtered_df[filtered_df['Employment Type'].isin(employment_types)]
+    if career_levels:
+        filtered_df = filtered_df[filtered_df['Career Level'].isin(career_levels)]
+    if education_levels:
+        filtered_df = filtered_df[filtered_df['education_level'].isin(education_levels)]
+    if start_date and end_date and 'posted' in filtered_df.columns:
+        filtered_df = filtered_df[(filtered_df['posted'] >= start_date) & (filtered_df['posted'] <= end_date)]
+    if in_cities and 'In_City' in filtered_df.columns:
+        filtered_df = filtered_df[filtered_df['In_City'].isin(in_cities)]
+    if avg_exp_range and exp_range_index is not None:
+        min_exp, max_exp = avg_exp_range[0], avg_exp_range[1]
+        # Range index lookup; the default range start (0) also keeps jobs without experience data
+        filtered_df = exp_range_index.filter(filtered_df, min_exp, max_exp, include_missing=(min_exp == 0))
+    if months and 'posted' in filtered_df.columns:
+        filtered_df = filtered_df[filtered_df['posted'].dt.month.isin(months)]
     
-    # Apply large fonts to hiring intensity chart
-    if not isinstance(hiring_intensity_fig.data, tuple) or len(hiring_intensity_fig.data) > 0:
-        hiring_intensity_fig = apply_large_fonts_to_chart(hiring_intensity_fig, theme=theme)
+    # Apply search text filter
+    if search_text and search_text.strip():
+        from utils import filter_dataframe_by_search
+        filtered_df = filter_dataframe_by_search(filtered_df, search_text)
+
+    # Charts are independent of each other (optionally built in parallel)
+    figures = build_figures('deep_analysis', {
+        'companies': (company_performance_chart, filtered_df, theme),
+        'education': (education_requirements_chart, filtered_df, theme),
+        'career_level': (career_level_experience_chart, filtered_df, theme),
+        'experience': (experience_level_chart, filtered_df, theme),
+        'hiring_intensity': (hiring_intensity_chart, filtered_df, theme),
+    })
     
     # KPIs
     total_jobs = len(filtered_df)
@@ -330,7 +262,7 @@ def update_deep_analysis(companies, cities, categories, work_modes, employment_t
     
     from utils import format_kpi_value
 
-    return (company_performance_fig, education_distribution_fig, career_level_fig, experience_buckets_fig, hiring_intensity_fig,
+    return (figures['companies'], figures['education'], figures['career_level'], figures['experience'], figures['hiring_intensity'],
             format_kpi_value(total_jobs, theme), 
             format_kpi_value(total_applicants, theme), 
             format_kpi_value(avg_exp, theme), 
@@ -1,13 +1,40 @@
-from dash import Input, Output, State, html, dcc
+from dash import Input, Output, State, html, dcc, callback_context
 import dash
+import numpy as np
+import pandas as pd
 from app_instance import app
-from data_loader import df
+from data_loader import df, filter_facets, exp_range_index, data_version
+from startup_report import timed
+from layouts.sidebar import FACET_FILTERS, SEARCHABLE_FILTERS, filter_options
 from layouts.overview import overview_layout
 from layouts.city_map import city_map_layout
 from layouts.deep_analysis import deep_analysis_layout
 from layouts.time_analysis import time_analysis_layout
 from layouts.skills_analysis import skills_page_layout
 
+# Page layouts only depend on the loaded data, so each is built once per dataset
+# generation (data_version) and reused on every navigation.
+PAGE_LAYOUTS = {
+    '/': overview_layout,
+    '/city-map': city_map_layout,
+    '/deep-analysis': deep_analysis_layout,
+    '/time-analysis': time_analysis_layout,
+    '/skills': skills_page_layout,
+}
+_layout_cache = {}  # (data_version, path) -> layout
+
+
+def page_layout(path):
+    key = (data_version, path)
+    if key not in _layout_cache:
+        with timed(f'build_layout:{path}'):
+            _layout_cache[key] = PAGE_LAYOUTS[path]()
+    return _layout_cache[key]
+
+
+for _path in PAGE_LAYOUTS:
+    page_layout(_path)
+
 # Callbacks for routing
 @app.callback(Output("page-content", "children"), [Input("url", "pathname")])
 def render_page_content(pathname):
@@ -16,16 +43,8 @@ def render_page_content(pathname):
         pathname = '/'
     path = pathname.rstrip('/') or '/'
 
-    if path == "/":
-        return overview_layout()
-    elif path == "/city-map":
-        return city_map_layout()
-    elif path == "/deep-analysis":
-        return deep_analysis_layout()
-    elif path == "/time-analysis":
-        return time_analysis_layout()
-    elif path == "/skills":
-        return skills_page_layout()
+    if path in PAGE_LAYOUTS:
+        return page_layout(path)
     return html.Div(["404 - Page not found"])
 
 # Callback for Sidebar Pagination
@@ -74,6 +93,80 @@ def clear_all_filters(n_clicks):
         return [], [], [], [], [], [], [], None, None, [], [0, max_exp], [], ""
     return dash.no_update
 
+# Cascading filter options: every sidebar dropdown shows how many jobs each value keeps
+# under the other active filters (facet index counts). Runs on any filter change; typing
+# in the searchable Company / In-City dropdowns only refreshes that dropdown's matches.
+_posted = pd.to_datetime(df['posted'], errors='coerce') if 'posted' in df.columns else None
+
+
+def _base_mask(start_date, end_date, avg_exp_range, search_text):
+    """Rows kept by the non-dropdown filters (date range, experience, search), or None for all."""
+    keep = None
+    if start_date and end_date and _posted is not None:
+        keep = ((_posted >= start_date) & (_posted <= end_date)).to_numpy()
+    if avg_exp_range and exp_range_index is not None:
+        lo, hi = avg_exp_range[0], avg_exp_range[1]
+        if not exp_range_index.covers_all(lo, hi, include_missing=(lo == 0)):
+            exp_mask = exp_range_index.mask(lo, hi, include_missing=(lo == 0))
+            keep = exp_mask if keep is None else keep & exp_mask
+    if search_text and search_text.strip():
+        from utils import filter_dataframe_by_search
+        search_mask = np.zeros(len(df), dtype=bool)
+        search_mask[df.index.get_indexer(filter_dataframe_by_search(df, search_text).index)] = True
+        keep = search_mask if keep is None else keep & search_mask
+    return keep
+
+
+# Sidebar filters each page's callbacks apply. Option counts only follow these, and the
+# dropdowns a page ignores are never greyed out there (the City Map has no date, month or
+# In-City filter; only the City Map filters by job status).
+_SHARED_FILTERS = ['sidebar-company-filter', 'sidebar-city-filter', 'sidebar-category-filter',
+                   'sidebar-work-mode-filter', 'sidebar-employment-type-filter',
+                   'sidebar-career-level-filter', 'sidebar-education-filter']
+_ANALYSIS_FILTERS = _SHARED_FILTERS + ['sidebar-in-city-filter', 'sidebar-month-filter', 'sidebar-date-filter']
+PAGE_FILTERS = {
+    '/': _ANALYSIS_FILTERS,
+    '/city-map': _SHARED_FILTERS + ['sidebar-job-status-filter'],
+    '/deep-analysis': _ANALYSIS_FILTERS,
+    '/time-analysis': _ANALYSIS_FILTERS,
+    '/skills': _ANALYSIS_FILTERS,
+}
+
+
+@app.callback(
+    [Output(filter_id, 'options') for filter_id in FACET_FILTERS],
+    [Input(filter_id, 'value') for filter_id in FACET_FILTERS] +
+    [Input(filter_id, 'search_value') for filter_id in SEARCHABLE_FILTERS] +
+    [Input('sidebar-date-filter', 'start_date'),
+     Input('sidebar-date-filter', 'end_date'),
+     Input('sidebar-avg-exp-filter', 'value'),
+     Input('global-search-bar', 'value'),
+     Input('url', 'pathname')]
+)
+def update_filter_options(*args):
+    selected = dict(zip(FACET_FILTERS, args[:len(FACET_FILTERS)]))
+    search_values = dict(zip(SEARCHABLE_FILTERS, args[len(FACET_FILTERS):len(FACET_FILTERS) + len(SEARCHABLE_FILTERS)]))
+    start_date, end_date, avg_exp_range, search_text, pathname = args[len(FACET_FILTERS) + len(SEARCHABLE_FILTERS):]
+    applied = PAGE_FILTERS.get((pathname or '/').rstrip('/') or '/', PAGE_FILTERS['/'])
+
+    triggered = [t['prop_id'] for t in callback_context.triggered] if callback_context.triggered else []
+    refresh = list(FACET_FILTERS)
+    if triggered and all(prop_id.endswith('.search_value') for prop_id in triggered):
+        refresh = [prop_id.rsplit('.', 1)[0] for prop_id in triggered]
+
+    if 'sidebar-date-filter' not in applied:
+        start_date = end_date = None
+    counts = filter_facets.counts(
+        {FACET_FILTERS[filter_id]: values for filter_id, values in selected.items() if filter_id in applied},
+        base_mask=_base_mask(start_date, end_date, avg_exp_range, search_text),
+        names=[FACET_FILTERS[filter_id] for filter_id in refresh if FACET_FILTERS[filter_id] in filter_facets.levels],
+    )
+    return [filter_options(filter_id, counts.get(FACET_FILTERS[filter_id]), selected[filter_id],
+                           search_values.get(filter_id), disable_empty=filter_id in applied)
+            if filter_id in refresh else dash.no_update
+            for filter_id in FACET_FILTERS]
+
+
 # THEME SWITCHER CALLBACK
 @app.callback(
     [Output('theme-store', 'data'),
@@ -1,9 +1,10 @@
 from dash import Input, Output, State, html
-import plotly.express as px
 import pandas as pd
 from app_instance import app
-from data_loader import df
-from utils import get_color_scale, apply_visual_highlighting, apply_chart_styling, apply_large_fonts_to_chart
+from shared_cache import cached_callback
+from data_loader import df, exp_range_index
+from figure_factory import overview_bar_figure, donut_figure
+from parallel_figures import build_figures
 
 @app.callback(
     [Output('total-jobs-kpi', 'children'),
@@ -31,6 +32,7 @@ from utils import get_color_scale, apply_visual_highlighting, apply_chart_stylin
      Input('global-search-bar', 'value'),
      Input('theme-store', 'data')]
 )
+@cached_callback('figures')
 def update_overview(companies, cities, categories, work_modes, employment_types, career_levels, education_levels, start_date, end_date, in_cities, avg_exp_range, months, search_text, theme):
     filtered_df = df.copy()
     
@@ -58,12 +60,10 @@ def update_overview(companies, cities, categories, work_modes, employment_types,
         filtered_df = filtered_df[filtered_df['In_City'].isin(in_cities)]
     
     # Avg Years of Experience filter
-    if avg_exp_range and 'Year Of Exp_Avg' in filtered_df.columns:
+    if avg_exp_range and exp_range_index is not None:
         min_exp, max_exp = avg_exp_range[0], avg_exp_range[1]
-        mask = (filtered_df['Year Of Exp_Avg'] >= min_exp) & (filtered_df['Year Of Exp_Avg'] <= max_exp)
-        if min_exp == 0:
-            mask = mask | filtered_df['Year Of Exp_Avg'].isna()
-        filtered_df = filtered_df[mask]
+        # Range index lookup; the default range start (0) also keeps jobs without experience data
+        filtered_df = exp_range_index.filter(filtered_df, min_exp, max_exp, include_missing=(min_exp == 0))
     
     # Month filter
     if months and 'posted' in filtered_df.columns:
@@ -95,68 +95,28 @@ def update_overview(companies, cities, categories, work_modes, employment_types,
         pct = (remote_hybrid_count / len(filtered_df)) * 100
         remote_hybrid_pct = f"{pct:.1f}%"
     
-    # Charts - Use theme for color scale
-    deep_blue_scale = get_color_scale(theme)
+    # Charts - filled into cached per-theme skeletons (figure_factory)
+    def value_counts(col, top=None):
+        s = filtered_df[col] if col in filtered_df.columns else pd.Series(dtype='object')
+        vc = s.value_counts()
+        return vc.head(top) if top else vc
 
-    # Employment Type chart
-    col = 'Employment Type'
-    s = filtered_df[col] if col in filtered_df.columns else pd.Series(dtype='object')
-    vc = s.value_counts().reset_index()
-    vc.columns = [col, 'count']
-    employment_type_fig = px.bar(vc, x='count', y=col, title='Jobs by Employment Type', orientation='h', color='count', color_continuous_scale=deep_blue_scale, text='count')
-    employment_type_fig.update_layout(
-        yaxis={'categoryorder': 'total ascending', 'title': None},
-        xaxis={'showgrid': False}
-    )
-    apply_visual_highlighting(employment_type_fig, vc[col].tolist(), employment_types, is_pie=False)
-    apply_chart_styling(employment_type_fig, is_horizontal_bar=True, add_margin=True, theme=theme)  # ✅ Pass theme
-    
-    # Work Mode - Donut Chart
-    col = 'Work Mode'
-    s = filtered_df[col] if col in filtered_df.columns else pd.Series(dtype='object')
-    vc = s.value_counts().reset_index()
-    vc.columns = [col, 'count']
-    work_mode_fig = px.pie(vc, values='count', names=col, title='Jobs by Work Mode', hole=0.5, color_discrete_sequence=px.colors.sequential.Blues_r)
-    work_mode_fig.update_traces(textposition='inside', textinfo='percent+label', rotation=-45, textfont=dict(color='white'))
-    apply_visual_highlighting(work_mode_fig, vc[col].tolist(), work_modes, is_pie=True)
-    apply_chart_styling(work_mode_fig, is_horizontal_bar=False, add_margin=False, theme=theme)  # ✅ Pass theme
-    # FORCE WHITE TEXT AGAIN because apply_chart_styling might have overwritten it
-    work_mode_fig.update_traces(textfont=dict(color='white', size=14, weight='bold'))
-    
-    # Career Level
-    col = 'Career Level'
-    s = filtered_df[col] if col in filtered_df.columns else pd.Series(dtype='object')
-    vc = s.value_counts().reset_index()
-    vc.columns = [col, 'count']
-    career_level_fig = px.bar(vc, x='count', y=col, title='Jobs by Career Level', orientation='h', color='count', color_continuous_scale=deep_blue_scale, text='count')
-    career_level_fig.update_layout(
-        yaxis={'categoryorder': 'total ascending', 'title': None},
-        xaxis={'showgrid': False}
-    )
-    apply_visual_highlighting(career_level_fig, vc[col].tolist(), career_levels, is_pie=False)
-    apply_chart_styling(career_level_fig, is_horizontal_bar=True, add_margin=True, theme=theme)  # ✅ Pass theme
-
-    # Top Categories
-    col = 'Category'
-    s = filtered_df[col] if col in filtered_df.columns else pd.Series(dtype='object')
-    vc = s.value_counts().head(10).reset_index()
-    vc.columns = [col, 'count']
-    top_categories_fig = px.bar(vc, x='count', y=col, title='Top 10 Categories', orientation='h', color='count', color_continuous_scale=deep_blue_scale, text='count')
-    top_categories_fig.update_layout(
-        yaxis={'categoryorder': 'total ascending', 'title': None},
-        xaxis={'showgrid': False}
-    )
-    apply_visual_highlighting(top_categories_fig, vc[col].tolist(), categories, is_pie=False)
-    apply_chart_styling(top_categories_fig, is_horizontal_bar=True, add_margin=True, theme=theme)  # ✅ Pass theme
-    
-    # Apply large fonts to all charts - ✅ Pass theme
-    employment_type_fig = apply_large_fonts_to_chart(employment_type_fig, theme=theme)
-    work_mode_fig = apply_large_fonts_to_chart(work_mode_fig, theme=theme)
-    career_level_fig = apply_large_fonts_to_chart(career_level_fig, theme=theme)
-    top_categories_fig = apply_large_fonts_to_chart(top_categories_fig, theme=theme)
+    employment_vc = value_counts('Employment Type')
+    work_mode_vc = value_counts('Work Mode')
+    career_vc = value_counts('Career Level')
+    category_vc = value_counts('Category', top=10)
 
-    # FINAL FORCE: Ensure Donut Chart Text is White and Bold (Overriding large fonts if needed)
-    work_mode_fig.update_traces(textfont=dict(color='white', size=16, weight='bold'), textposition='inside')
+    # Charts are independent of each other (optionally built in parallel)
+    figures = build_figures('overview', {
+        # Employment Type chart
+        'employment_type': (overview_bar_figure, employment_vc.index, employment_vc.values, theme, 'Jobs by Employment Type', 'Employment Type', employment_types),
+        # Work Mode - Donut Chart (white bold labels are part of the skeleton)
+        'work_mode': (donut_figure, work_mode_vc.index, work_mode_vc.values, theme, 'Jobs by Work Mode', 'Work Mode', work_modes),
+        # Career Level
+        'career_level': (overview_bar_figure, career_vc.index, career_vc.values, theme, 'Jobs by Career Level', 'Career Level', career_levels),
+        # Top Categories
+        'top_categories': (overview_bar_figure, category_vc.index, category_vc.values, theme, 'Top 10 Categories', 'Category', categories),
+    })
 
     from utils import format_kpi_value
 
@@ -168,8 +128,8 @@ def update_overview(companies, cities, categories, work_modes, employment_types,
         format_kpi_value(avg_applicants, theme),
         format_kpi_value(remote_hybrid_pct, theme),
         format_kpi_value(latest_date, theme),
-        employment_type_fig,
-        work_mode_fig,
-        career_level_fig,
-        top_categories_fig
+        figures['employment_type'],
+        figures['work_mode'],
+        figures['career_level'],
+        figures['top_categories']
     )
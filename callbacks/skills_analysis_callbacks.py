@@ -2,91 +2,44 @@ from dash import Input, Output, State
 import plotly.express as px
 import pandas as pd
 from app_instance import app
-from data_loader import df, skills_df
+from shared_cache import cached_callback
+from data_loader import df, skills_df, exp_range_index
 from utils import apply_large_fonts_to_chart
+from chart_templates import chart_template
+from parallel_figures import build_figures
 
-@app.callback(
-    [Output('total-skills-kpi', 'children'),
-     Output('top-skill-kpi', 'children'),
-     Output('avg-skills-kpi', 'children'),
-     Output('skills-wordcloud', 'figure'),
-     Output('skills-category-breakdown', 'figure'),
-     Output('top-skills-bar', 'figure'),
-     Output('skills-trend', 'figure'),
-     Output('top-skill-cat-kpi', 'children'),
-     Output('skill-trend-selector', 'options')],
-    [Input('sidebar-company-filter', 'value'),
-     Input('sidebar-city-filter', 'value'),
-     Input('sidebar-category-filter', 'value'),
-     Input('sidebar-work-mode-filter', 'value'),
-     Input('sidebar-employment-type-filter', 'value'),
-     Input('sidebar-career-level-filter', 'value'),
-     Input('sidebar-education-filter', 'value'),
-     Input('sidebar-date-filter', 'start_date'),
-     Input('sidebar-date-filter', 'end_date'),
-     Input('sidebar-in-city-filter', 'value'),
-     Input('sidebar-avg-exp-filter', 'value'),
-     Input('sidebar-month-filter', 'value'),
-     Input('global-search-bar', 'value'),
-     Input('theme-store', 'data'),
-     Input('skill-trend-selector', 'value')]
-)
-def update_skills_analysis(companies, cities, categories, work_modes, employment_types, career_levels, education_levels, start_date, end_date, in_cities, avg_exp_range, months, search_text, theme, selected_trend_skills):
-    filtered_df = df.copy()
-    
-    # Apply all filters
-    if companies:
-        filtered_df = filtered_df[filtered_df['Company'].isin(companies)]
-    if cities:
-        filtered_df = filtered_df[filtered_df['City'].isin(cities)]
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    if work_modes:
-        filtered_df = filtered_df[filtered_df['Work Mode'].isin(work_modes)]
-    if employment_types:
-        filtered_df = filtered_df[filtered_df['Employment Type'].isin(employment_types)]
-    if career_levels:
-        filtered_df = filtered_df[filtered_df['Career Level'].isin(career_levels)]
-    if education_levels:
-        filtered_df = filtered_df[filtered_df['education_level'].isin(education_levels)]
-    if start_date and end_date and 'posted' in filtered_df.columns:
-        filtered_df['posted'] = pd.to_datetime(filtered_df['posted'], errors='coerce')
-        filtered_df = filtered_df[(filtered_df['posted'] >= start_date) & (filtered_df['posted'] <= end_date)]
-    if in_cities and 'In_City' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['In_City'].isin(in_cities)]
-    if avg_exp_range and 'Year Of Exp_Avg' in filtered_df.columns:
-        min_exp, max_exp = avg_exp_range[0], avg_exp_range[1]
-        mask = (filtered_df['Year Of Exp_Avg'] >= min_exp) & (filtered_df['Year Of Exp_Avg'] <= max_exp)
-        if min_exp == 0:
-            mask = mask | filtered_df['Year Of Exp_Avg'].isna()
-        filtered_df = filtered_df[mask]
-    if months and 'posted' in filtered_df.columns:
-        filtered_df['posted'] = pd.to_datetime(filtered_df['posted'], errors='coerce')
-        filtered_df = filtered_df[filtered_df['posted'].dt.month.isin(months)]
-    if search_text and search_text.strip():
-        from utils import filter_dataframe_by_search
-        filtered_df = filter_dataframe_by_search(filtered_df, search_text)
-    
-    # Merge with skills data
-    if not skills_df.empty and 'Job Title' in filtered_df.columns:
-        # Get job titles from filtered dataset
-        filtered_job_titles = filtered_df['Job Title'].unique().tolist()
-        # Filter skills_df to only include skills for jobs in filtered dataset
-        filtered_skills = skills_df[skills_df['Job Title'].isin(filtered_job_titles)].copy()
-        
-        # Collect all skills
-        all_skills = filtered_skills['Skills'].dropna().tolist() if 'Skills' in filtered_skills.columns else []
-    else:
-        all_skills = []
-    
-    # Calculate KPIs
-    unique_skills = len(set(all_skills)) if all_skills else 0
-    top_skill = pd.Series(all_skills).value_counts().index[0] if all_skills else "N/A"
-    avg_skills_per_job = round(len(all_skills) / len(filtered_df), 1) if len(filtered_df) > 0 else 0
-    
-    # Calculate Top Skill Category (Proxy using Job Category for now as Skill Category isn't in skills_df)
-    top_skill_cat = filtered_df['Category'].value_counts().index[0] if 'Category' in filtered_df.columns and not filtered_df.empty else "N/A"
-    
+def _style_skills_figure(fig, theme):
+    """Apply dark theme to a Skills page figure"""
+    font_color = '#ffffff' if theme == 'dark' else '#001F3F'
+    fig.update_layout(
+        dragmode=False,
+        template=chart_template(theme),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color=font_color, family='Inter'),
+        title_font=dict(size=28, color=font_color), # Reduced from 40 for better fit
+        xaxis_title=None,
+        yaxis_title=None,
+        coloraxis_showscale=False,
+        xaxis=dict(showgrid=False, showline=False, zeroline=False, showticklabels=True, tickfont=dict(size=18, color=font_color)),
+        yaxis=dict(showgrid=False, showline=False, zeroline=False, showticklabels=True, tickfont=dict(size=18, color=font_color)),
+        hoverlabel=dict(
+            bgcolor='#001F3F',
+            font_size=13,
+            font_family='Inter',
+            font_color='white'
+        )
+    )
+    return fig
+
+def _style_skills_bar(fig, theme):
+    """Bar charts: outside labels and room for long category/skill names"""
+    font_color = '#ffffff' if theme == 'dark' else '#001F3F'
+    fig.update_traces(textposition='outside', textfont=dict(size=18, color=font_color))
+    fig.update_layout(margin=dict(l=150)) # Add left margin for labels
+    return fig
+
+def skills_treemap_chart(all_skills, theme):
     # Skills Word Cloud (Treemap - Dark Mode Optimized)
     if all_skills:
         skill_counts = pd.Series(all_skills).value_counts().head(30).reset_index()
@@ -115,7 +68,13 @@ def update_skills_analysis(companies, cities, categories, work_modes, employment
         )
     else:
         wordcloud_fig = px.treemap(pd.DataFrame({'skill': [], 'count': []}), path=['skill'], values='count', title='Top 30 Skills (Treemap)')
-    
+
+    _style_skills_figure(wordcloud_fig, theme)
+    wordcloud_fig.update_traces(hovertemplate='<span style="color:white; font-family:Inter;"><b>%{label}</b><br>Count: %{value}</span><extra></extra>')
+    # Large fonts skipped for the treemap to preserve white text styling
+    return wordcloud_fig
+
+def skills_category_chart(filtered_df, all_skills, theme):
     # Skills by Category Breakdown (Horizontal Bar Chart)
     # USER REQUEST: Use Category from Jobs.xlsx ONLY.
     if not skills_df.empty and all_skills:
@@ -168,7 +127,11 @@ def update_skills_analysis(companies, cities, categories, work_modes, employment
             )
     else:
         category_breakdown_fig = px.bar(pd.DataFrame({'Category': [], 'count': []}), x='count', y='Category', orientation='h', title='Skills Demand by Category (Empty)')
-    
+
+    _style_skills_bar(_style_skills_figure(category_breakdown_fig, theme), theme)
+    return apply_large_fonts_to_chart(category_breakdown_fig, theme=theme)
+
+def top_skills_chart(all_skills, theme):
     # Top 15 Skills Bar Chart (Existing - keep style consistent)
     if all_skills:
         top_skills = pd.Series(all_skills).value_counts().head(15).reset_index()
@@ -186,14 +149,12 @@ def update_skills_analysis(companies, cities, categories, work_modes, employment
         )
     else:
         top_skills_fig = px.bar(pd.DataFrame({'skill': [], 'count': []}), x='count', y='skill', orientation='h', title='Top 15 Most Demanded Skills')
-    
+
+    _style_skills_bar(_style_skills_figure(top_skills_fig, theme), theme)
+    return apply_large_fonts_to_chart(top_skills_fig, theme=theme)
+
+def skills_trend_chart(filtered_df, all_skills, selected_trend_skills, theme):
     # Skills Trend Over Time (Interactive)
-    trend_options = []
-    if all_skills:
-        # Populate options from Top 50 skills to avoid overload
-        top_50_skills = pd.Series(all_skills).value_counts().head(50).index.tolist()
-        trend_options = [{'label': s, 'value': s} for s in top_50_skills]
-    
     if not filtered_df.empty and 'posted' in filtered_df.columns and not skills_df.empty:
         # 1. Merge filtered jobs with skills to get (Date, Skill) tuples
         # Optimization: Filter skills_df first
@@ -226,48 +187,108 @@ def update_skills_analysis(companies, cities, categories, work_modes, employment
             skills_trend_fig = px.line(pd.DataFrame({'Month': [], 'count': [], 'Skills': []}), x='Month', y='count', title='Skills Trend Over Time')
     else:
         skills_trend_fig = px.line(pd.DataFrame({'Month': [], 'count': [], 'Skills': []}), x='Month', y='count', title='Skills Trend Over Time')
+
+    _style_skills_figure(skills_trend_fig, theme)
+    return apply_large_fonts_to_chart(skills_trend_fig, theme=theme)
+
+@app.callback(
+    [Output('total-skills-kpi', 'children'),
+     Output('top-skill-kpi', 'children'),
+     Output('avg-skills-kpi', 'children'),
+     Output('skills-wordcloud', 'figure'),
+     Output('skills-category-breakdown', 'figure'),
+     Output('top-skills-bar', 'figure'),
+     Output('skills-trend', 'figure'),
+     Output('top-skill-cat-kpi', 'children'),
+     Output('skill-trend-selector', 'options')],
+    [Input('sidebar-company-filter', 'value'),
+     Input('sidebar-city-filter', 'value'),
+     Input('sidebar-category-filter', 'value'),
+     Input('sidebar-work-mode-filter', 'value'),
+     Input('sidebar-employment-type-filter', 'value'),
+     Input('sidebar-career-level-filter', 'value'),
+     Input('sidebar-education-filter', 'value'),
+     Input('sidebar-date-filter', 'start_date'),
+     Input('sidebar-date-filter', 'end_date'),
+     Input('sidebar-in-city-filter', 'value'),
+     Input('sidebar-avg-exp-filter', 'value'),
+     Input('sidebar-month-filter', 'value'),
+     Input('global-search-bar', 'value'),
+     Input('theme-store', 'data'),
+     Input('skill-trend-selector', 'value')]
+)
+@cached_callback('figures')
+def update_skills_analysis(companies, cities, categories, work_modes, employment_types, career_levels, education_levels, start_date, end_date, in_cities, avg_exp_range, months, search_text, theme, selected_trend_skills):
+    filtered_df = df.copy()
     
-    # Apply dark theme to all figures
-    font_color = '#ffffff' if theme == 'dark' else '#001F3F'
+    # Apply all filters
+    if companies:
+        filtered_df = filtered_df[filtered_df['Company'].isin(companies)]
+    if cities:
+        filtered_df = filtered_df[filtered_df['City'].isin(cities)]
+    if categories:
+        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
+    if work_modes:
+        filtered_df = filtered_df[filtered_df['Work Mode'].isin(work_modes)]
+    if employment_types:
+        filtered_df = filtered_df[filtered_df['Employment Type'].isin(employment_types)]
+    if career_levels:
+        filtered_df = filtered_df[filtered_df['Career Level'].isin(career_levels)]
+    if education_levels:
+        filtered_df = filtered_df[filtered_df['education_level'].isin(education_levels)]
+    if start_date and end_date and 'posted' in filtered_df.columns:
+        filtered_df['posted'] = pd.to_datetime(filtered_df['posted'], errors='coerce')
+        filtered_df = filtered_df[(filtered_df['posted'] >= start_date) & (filtered_df['posted'] <= end_date)]
+    if in_cities and 'In_City' in filtered_df.columns:
+        filtered_df = filtered_df[filtered_df['In_City'].isin(in_cities)]
+    if avg_exp_range and exp_range_index is not None:
+        min_exp, max_exp = avg_exp_range[0], avg_exp_range[1]
+        # Range index lookup; the default range start (0) also keeps jobs without experience data
+        filtered_df = exp_range_index.filter(filtered_df, min_exp, max_exp, include_missing=(min_exp == 0))
+    if months and 'posted' in filtered_df.columns:
+        filtered_df['posted'] = pd.to_datetime(filtered_df['posted'], errors='coerce')
+        filtered_df = filtered_df[filtered_df['posted'].dt.month.isin(months)]
+    if search_text and search_text.strip():
+        from utils import filter_dataframe_by_search
+        filtered_df = filter_dataframe_by_search(filtered_df, search_text)
     
-    for fig in [wordcloud_fig, category_breakdown_fig, top_skills_fig, skills_trend_fig]:
-        fig.update_layout(
-            dragmode=False,
-            template='plotly',
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(color=font_color, family='Inter'),
-            title_font=dict(size=28, color=font_color), # Reduced from 40 for better fit
-            xaxis_title=None,
-            yaxis_title=None,
-            coloraxis_showscale=False,
-            xaxis=dict(showgrid=False, showline=False, zeroline=False, showticklabels=True, tickfont=dict(size=18, color=font_color)),
-            yaxis=dict(showgrid=False, showline=False, zeroline=False, showticklabels=True, tickfont=dict(size=18, color=font_color)),
-            hoverlabel=dict(
-                bgcolor='#001F3F',
-                font_size=13,
-                font_family='Inter',
-                font_color='white'
-            )
-        )
+    # Merge with skills data
+    if not skills_df.empty and 'Job Title' in filtered_df.columns:
+        # Get job titles from filtered dataset
+        filtered_job_titles = filtered_df['Job Title'].unique().tolist()
+        # Filter skills_df to only include skills for jobs in filtered dataset
+        filtered_skills = skills_df[skills_df['Job Title'].isin(filtered_job_titles)].copy()
         
-        # Specific Adjustments
-        if fig == top_skills_fig or fig == category_breakdown_fig:
-            fig.update_traces(textposition='outside', textfont=dict(size=18, color=font_color))
-            fig.update_layout(margin=dict(l=150)) # Add left margin for labels
-            
-        if fig == wordcloud_fig:
-             fig.update_traces(hovertemplate='<span style="color:white; font-family:Inter;"><b>%{label}</b><br>Count: %{value}</span><extra></extra>')
-
-    # Apply large fonts
-    # Apply large fonts
-    # skipped wordcloud_fig to preserve white text styling
-    category_breakdown_fig = apply_large_fonts_to_chart(category_breakdown_fig, theme=theme)
-    top_skills_fig = apply_large_fonts_to_chart(top_skills_fig, theme=theme)
-    skills_trend_fig = apply_large_fonts_to_chart(skills_trend_fig, theme=theme)
+        # Collect all skills
+        all_skills = filtered_skills['Skills'].dropna().tolist() if 'Skills' in filtered_skills.columns else []
+    else:
+        all_skills = []
+    
+    # Calculate KPIs
+    unique_skills = len(set(all_skills)) if all_skills else 0
+    top_skill = pd.Series(all_skills).value_counts().index[0] if all_skills else "N/A"
+    avg_skills_per_job = round(len(all_skills) / len(filtered_df), 1) if len(filtered_df) > 0 else 0
+    
+    # Calculate Top Skill Category (Proxy using Job Category for now as Skill Category isn't in skills_df)
+    top_skill_cat = filtered_df['Category'].value_counts().index[0] if 'Category' in filtered_df.columns and not filtered_df.empty else "N/A"
+    
+    # Skills Trend Over Time (Interactive)
+    trend_options = []
+    if all_skills:
+        # Populate options from Top 50 skills to avoid overload
+        top_50_skills = pd.Series(all_skills).value_counts().head(50).index.tolist()
+        trend_options = [{'label': s, 'value': s} for s in top_50_skills]
+    
+    # Charts are independent of each other (optionally built in parallel)
+    figures = build_figures('skills_analysis', {
+        'treemap': (skills_treemap_chart, all_skills, theme),
+        'category_breakdown': (skills_category_chart, filtered_df, all_skills, theme),
+        'top_skills': (top_skills_chart, all_skills, theme),
+        'trend': (skills_trend_chart, filtered_df, all_skills, selected_trend_skills, theme),
+    })
     
     from utils import format_kpi_value
-    return format_kpi_value(unique_skills, theme), format_kpi_value(top_skill, theme), format_kpi_value(avg_skills_per_job, theme), wordcloud_fig, category_breakdown_fig, top_skills_fig, skills_trend_fig, format_kpi_value(top_skill_cat, theme), trend_options
+    return format_kpi_value(unique_skills, theme), format_kpi_value(top_skill, theme), format_kpi_value(avg_skills_per_job, theme), figures['treemap'], figures['category_breakdown'], figures['top_skills'], figures['trend'], format_kpi_value(top_skill_cat, theme), trend_options
 
 @app.callback(
     Output('global-search-bar', 'value', allow_duplicate=True),
@@ -2,8 +2,10 @@ from dash import Input, Output, State
 import plotly.express as px
 import pandas as pd
 from app_instance import app
-from data_loader import df
+from shared_cache import cached_callback
+from data_loader import df, exp_range_index, time_cube
 from utils import get_color_scale, apply_large_fonts_to_chart
+from chart_templates import chart_template
 
 @app.callback(
     [Output('time-jobs-kpi', 'children'),
@@ -28,75 +30,66 @@ from utils import get_color_scale, apply_large_fonts_to_chart
      Input('global-search-bar', 'value'),
      Input('theme-store', 'data')]
 )
+@cached_callback('figures')
 def update_time_analysis(companies, cities, categories, work_modes, employment_types, career_levels, education_levels, start_date, end_date, in_cities, avg_exp_range, months, search_text, theme):
     try:
-        filtered_df = df.copy()
-        
-        if companies:
-            filtered_df = filtered_df[filtered_df['Company'].isin(companies)]
-        if cities:
-            filtered_df = filtered_df[filtered_df['City'].isin(cities)]
-        if categories:
-            filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-        if work_modes:
-            filtered_df = filtered_df[filtered_df['Work Mode'].isin(work_modes)]
-        if employment_types:
-            filtered_df = filtered_df[filtered_df['Employment Type'].isin(employment_types)]
-        if career_levels:
-            filtered_df = filtered_df[filtered_df['Career Level'].isin(career_levels)]
-        if education_levels:
-            filtered_df = filtered_df[filtered_df['education_level'].isin(education_levels)]
-        
-        # In-City filter
-        if in_cities and 'In_City' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['In_City'].isin(in_cities)]
-        
-        # Avg Years of Experience filter
-        if avg_exp_range and 'Year Of Exp_Avg' in filtered_df.columns:
-            min_exp, max_exp = avg_exp_range[0], avg_exp_range[1]
-            mask = (filtered_df['Year Of Exp_Avg'] >= min_exp) & (filtered_df['Year Of Exp_Avg'] <= max_exp)
-            if min_exp == 0:
-                mask = mask | filtered_df['Year Of Exp_Avg'].isna()
-            filtered_df = filtered_df[mask]
-        
-        # Month filter (applied before date range to avoid conflicts)
-        if months and 'posted' in filtered_df.columns:
-            filtered_df['posted'] = pd.to_datetime(filtered_df['posted'], errors='coerce')
-            filtered_df = filtered_df[filtered_df['posted'].dt.month.isin(months)]
-        
-        # Apply search text filter
-        if search_text and search_text.strip():
-            from utils import filter_dataframe_by_search
-            filtered_df = filter_dataframe_by_search(filtered_df, search_text)
-        
-        # Ensure posted is datetime before filtering by date range
-        if 'posted' in filtered_df.columns:
-            filtered_df['posted'] = pd.to_datetime(filtered_df['posted'], errors='coerce')
-        
-        if start_date and end_date:
-            filtered_df = filtered_df[(filtered_df['posted'] >= start_date) & (filtered_df['posted'] <= end_date)]
+        # Low-cardinality filters are answered straight from the time cube; the
+        # remaining ones (and a date range narrower than the data) narrow rows first.
+        cube_filters = {
+            'Work Mode': work_modes,
+            'Employment Type': employment_types,
+            'Career Level': career_levels,
+            'education_level': education_levels,
+        }
+        has_date_range = bool(start_date and end_date)
+        exp_filtered = bool(avg_exp_range and exp_range_index is not None and
+                            not exp_range_index.covers_all(avg_exp_range[0], avg_exp_range[1], include_missing=(avg_exp_range[0] == 0)))
+        needs_rows = bool(companies or cities or categories or in_cities or exp_filtered or
+                          (search_text and search_text.strip()) or
+                          (has_date_range and not time_cube.covers_dates(start_date, end_date)))
+
+        positions = None
+        if needs_rows:
+            filtered_df = df
+            if companies:
+                filtered_df = filtered_df[filtered_df['Company'].isin(companies)]
+            if cities:
+                filtered_df = filtered_df[filtered_df['City'].isin(cities)]
+            if categories:
+                filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
             
-        # Prepare time data
-        if 'posted' in filtered_df.columns and not filtered_df['posted'].dropna().empty:
-            # Format as "Month Year" for clear X-axis labels (e.g., "January 2025")
-            filtered_df['Month'] = filtered_df['posted'].dt.strftime('%B %Y')
-            # Create a sort key to ensure chronological order, not alphabetical
-            filtered_df['Month_Sort'] = filtered_df['posted'].dt.to_period('M')
-            filtered_df['Day'] = filtered_df['posted'].dt.day_name()
-        else:
-            filtered_df['Month'] = pd.Series(dtype='object')
-            filtered_df['Month_Sort'] = pd.Series(dtype='object')
-            filtered_df['Day'] = pd.Series(dtype='object')
+            # In-City filter
+            if in_cities and 'In_City' in filtered_df.columns:
+                filtered_df = filtered_df[filtered_df['In_City'].isin(in_cities)]
+            
+            # Avg Years of Experience filter
+            if exp_filtered:
+                min_exp, max_exp = avg_exp_range[0], avg_exp_range[1]
+                # Range index lookup; the default range start (0) also keeps jobs without experience data
+                filtered_df = exp_range_index.filter(filtered_df, min_exp, max_exp, include_missing=(min_exp == 0))
+            
+            # Apply search text filter
+            if search_text and search_text.strip():
+                from utils import filter_dataframe_by_search
+                filtered_df = filter_dataframe_by_search(filtered_df, search_text)
+            
+            if has_date_range and 'posted' in filtered_df.columns:
+                filtered_df = filtered_df[(filtered_df['posted'] >= start_date) & (filtered_df['posted'] <= end_date)]
+
+            positions = df.index.get_indexer(filtered_df.index)
+
+        # Month filter and the date range drop undated jobs, as dt.month.isin / comparisons did
+        selection = time_cube.select(cube_filters, positions=positions, months=months, dated_only=has_date_range)
+        month_df = selection.monthly()
+        month_day_df = selection.month_weekday()
     except Exception as e:
         print(f"Error in update_time_analysis: {e}")
-        filtered_df = pd.DataFrame()
-        filtered_df['Month'] = pd.Series(dtype='object')
-        filtered_df['Day'] = pd.Series(dtype='object')
+        selection = None
+        month_df = pd.DataFrame({'Month': [], 'Month_Sort': [], 'count': [], 'applicants': []})
+        month_day_df = pd.DataFrame({'Month': [], 'Month_Sort': [], 'Day': [], 'count': []})
     
-    # Month-Day line chart
-    if not filtered_df['Month'].dropna().empty:
-        # Sort by Month_Sort
-        month_day_df = filtered_df.groupby(['Month', 'Month_Sort', 'Day']).size().reset_index(name='count').sort_values('Month_Sort')
+    # Month-Day line chart (chronological, weekdays Monday..Sunday)
+    if not month_day_df.empty:
         month_day_fig = px.line(month_day_df, x='Month', y='count', color='Day', title='Jobs by Month and Day')
     else:
         month_day_fig = px.line(pd.DataFrame({'Month': [], 'count': [], 'Day': []}), x='Month', y='count', color='Day', title='Jobs by Month and Day')
@@ -104,19 +97,15 @@ def update_time_analysis(companies, cities, categories, work_modes, employment_t
     # Month bar chart
     deep_blue_scale = get_color_scale(theme)
 
-    if not filtered_df['Month'].dropna().empty:
-        # Group by Month and sort
-        month_df = filtered_df.groupby(['Month', 'Month_Sort']).size().reset_index(name='count').sort_values('Month_Sort')
-        
+    if not month_df.empty:
         month_bar_fig = px.bar(month_df, x='Month', y='count', title='Jobs by Month', color='count', color_continuous_scale=deep_blue_scale, text='count')
-        # Ensure only ONE bar per month (achieved by groupby Month)
+        # Ensure only ONE bar per month (one row per month key in the cube reduction)
     else:
         month_bar_fig = px.bar(pd.DataFrame({'Month': [], 'count': []}), x='Month', y='count', title='Jobs by Month')
     
     # Applicants trend
-    # Applicants trend
-    if 'applicants' in filtered_df.columns and not filtered_df['Month'].dropna().empty:
-        applicants_trend = filtered_df.groupby(['Month', 'Month_Sort'])['applicants'].mean().reset_index().sort_values('Month_Sort')
+    if time_cube.has_applicants and not month_df.empty:
+        applicants_trend = month_df[['Month', 'Month_Sort', 'applicants']]
         applicants_trend_fig = px.line(applicants_trend, x='Month', y='applicants', title='Average Applicants Trend', markers=True)
     else:
         applicants_trend_fig = px.line(pd.DataFrame({'Month': [], 'applicants': []}), x='Month', y='applicants', title='Average Applicants Trend', markers=True)
@@ -127,7 +116,7 @@ def update_time_analysis(companies, cities, categories, work_modes, employment_t
     for fig in [month_day_fig, month_bar_fig, applicants_trend_fig]:
         fig.update_layout(
             dragmode=False,
-            template='plotly',
+            template=chart_template(theme),
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)',
             font=dict(color=font_color, family='Inter'),
@@ -166,33 +155,21 @@ def update_time_analysis(companies, cities, categories, work_modes, employment_t
             fig.update_traces(hovertemplate='<span style="color:white; font-family:Inter;"><b>%{x}</b><br>Count: %{y}</span><extra></extra>')
     
     # Calculate KPIs for Time Analysis
-    total_jobs_period = len(filtered_df)
+    total_jobs_period = selection.total_jobs if selection is not None else 0
     
-    # MoM Growth
+    # MoM Growth: latest month vs. the calendar month before it (year-aware)
     mom_growth = "0%"
-    if not filtered_df.empty and 'posted' in filtered_df.columns:
-        try:
-            current_month = filtered_df['posted'].max().month
-            prev_month = current_month - 1 if current_month > 1 else 12
-            current_count = len(filtered_df[filtered_df['posted'].dt.month == current_month])
-            prev_count = len(filtered_df[filtered_df['posted'].dt.month == prev_month])
-            if prev_count > 0:
-                growth = ((current_count - prev_count) / prev_count) * 100
-                mom_growth = f"{growth:+.1f}%"
-            else:
-                mom_growth = "N/A"
-        except:
-            mom_growth = "N/A"
+    if total_jobs_period:
+        growth = selection.mom_growth()
+        mom_growth = f"{growth:+.1f}%" if growth is not None else "N/A"
             
     # Avg Applicants Trend (Last 30 days)
     avg_applicants_trend = "0"
-    if 'applicants' in filtered_df.columns:
-        avg_applicants_trend = f"{filtered_df['applicants'].mean():.1f}"
+    if selection is not None and time_cube.has_applicants:
+        avg_applicants_trend = f"{selection.avg_applicants:.1f}"
         
     # Peak Posting Day
-    peak_day = "N/A"
-    if 'Day' in filtered_df.columns and not filtered_df['Day'].dropna().empty:
-        peak_day = filtered_df['Day'].value_counts().index[0]
+    peak_day = selection.peak_day() if selection is not None else "N/A"
 
     # FORCE X-AXIS VISIBILITY (Override any default hiding)
     # Ensure Month Bar Chart uses Categorical Axis to prevent date grouping issues
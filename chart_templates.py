@@ -0,0 +1,95 @@
+"""
+Compact Plotly templates for the dashboard charts.
+
+Every figure embeds its template in the JSON sent to the browser. The stock
+'plotly' template (~7 KB) describes geo, polar, ternary, 3D scenes and two
+dozen trace types the dashboard never draws, so each chart response carried
+several copies of it. These templates keep only the defaults our bar, pie,
+line and treemap charts inherit, plus the theme styling shared by
+apply_chart_styling/apply_large_fonts_to_chart (transparent backgrounds,
+Inter fonts in the theme text color).
+
+Importing this module registers 'ecm_light' / 'ecm_dark' and makes the light
+one the default for Plotly Express and go.Figure.
+"""
+import copy
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+TEMPLATE_NAMES = {'light': 'ecm_light', 'dark': 'ecm_dark'}
+
+# Same text colors as the styling helpers in utils
+TEXT_COLORS = {'light': '#001F3F', 'dark': '#ffffff'}
+
+# Cartesian axis defaults of the stock template (the charts rely on these for ticks/zero lines)
+_AXIS_DEFAULTS = {
+    'automargin': True,
+    'gridcolor': 'white',
+    'linecolor': 'white',
+    'ticks': '',
+    'title': {'standoff': 15},
+    'zerolinecolor': 'white',
+    'zerolinewidth': 2,
+}
+
+_PATTERN_DEFAULTS = {'fillmode': 'overlay', 'size': 10, 'solidity': 0.2}
+
+
+def _build_template(theme):
+    stock = pio.templates['plotly'].layout
+    text_color = TEXT_COLORS[theme]
+    return go.layout.Template(
+        data={
+            'bar': [go.Bar(
+                error_x={'color': '#2a3f5f'}, error_y={'color': '#2a3f5f'},
+                marker={'line': {'color': '#E5ECF6', 'width': 0.5}, 'pattern': _PATTERN_DEFAULTS},
+            )],
+            'pie': [go.Pie(automargin=True)],
+            'scatter': [go.Scatter(fillpattern=_PATTERN_DEFAULTS)],
+        },
+        layout={
+            'autotypenumbers': 'strict',
+            'colorway': list(stock.colorway),
+            'colorscale': {'sequential': copy.deepcopy(stock.colorscale.sequential)},
+            'coloraxis': {'colorbar': {'outlinewidth': 0, 'ticks': ''}},
+            'font': {'color': text_color, 'family': 'Inter'},
+            'title': {'x': 0.05, 'font': {'color': text_color, 'family': 'Inter'}},
+            'hovermode': 'closest',
+            'hoverlabel': {'align': 'left'},
+            'paper_bgcolor': 'rgba(0,0,0,0)',
+            'plot_bgcolor': 'rgba(0,0,0,0)',
+            'xaxis': _AXIS_DEFAULTS,
+            'yaxis': _AXIS_DEFAULTS,
+            'annotationdefaults': {'arrowcolor': '#2a3f5f', 'arrowhead': 0, 'arrowwidth': 1},
+        },
+    )
+
+
+def chart_template(theme):
+    """Registered template name for a theme ('light' / 'dark')."""
+    return TEMPLATE_NAMES['dark' if theme == 'dark' else 'light']
+
+
+def strip_template_defaults(layout, template_layout):
+    """
+    Drop explicit layout values that equal the template's value at the same path.
+    Plotly falls back to the template for missing values, so the rendered figure
+    is unchanged while the JSON gets smaller. Returns a new dict.
+    """
+    stripped = {}
+    for key, value in layout.items():
+        if key == 'template' or key not in template_layout:
+            stripped[key] = value
+        elif isinstance(value, dict) and isinstance(template_layout[key], dict):
+            nested = strip_template_defaults(value, template_layout[key])
+            if nested:
+                stripped[key] = nested
+        elif value != template_layout[key]:
+            stripped[key] = value
+    return stripped
+
+
+for _theme, _name in TEMPLATE_NAMES.items():
+    pio.templates[_name] = _build_template(_theme)
+pio.templates.default = TEMPLATE_NAMES['light']
@@ -0,0 +1,200 @@
+"""
+Load-time indexes over the jobs dataframe.
+
+Built once by data_loader so the page callbacks can answer common filters
+with array lookups instead of re-scanning columns on every call.
+"""
+import bisect
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Experience buckets used by the Deep Analysis "Experience Level Demand" chart.
+# Bins are left-closed: [0, 1) -> '0-1 years', [1, 3) -> '1-3 years', ...
+EXP_BUCKET_EDGES = [-np.inf, 1, 3, 5, 7, 10, np.inf]
+EXP_BUCKET_LABELS = ['0-1 years', '1-3 years', '3-5 years', '5-7 years', '7-10 years', '10+ years']
+EXP_NOT_SPECIFIED = 'Not Specified'
+EXP_BUCKET_ORDER = EXP_BUCKET_LABELS + [EXP_NOT_SPECIFIED]
+
+
+def bucket_experience(years):
+    """
+    Vectorized experience bucketing.
+    Returns an ordered categorical whose codes follow EXP_BUCKET_ORDER,
+    with missing values mapped to 'Not Specified'.
+    """
+    values = pd.to_numeric(pd.Series(years), errors='coerce')
+    buckets = pd.cut(values, bins=EXP_BUCKET_EDGES, labels=EXP_BUCKET_LABELS, right=False)
+    return buckets.cat.add_categories(EXP_NOT_SPECIFIED).fillna(EXP_NOT_SPECIFIED)
+
+
+def bucket_counts(buckets):
+    """Count rows per experience bucket via the categorical codes (in bucket order)."""
+    codes = np.asarray(buckets.cat.codes, dtype=np.int64)
+    counts = np.bincount(codes[codes >= 0], minlength=len(EXP_BUCKET_ORDER))
+    return pd.DataFrame({'Experience Level': EXP_BUCKET_ORDER, 'count': counts})
+
+
+class RangeFilterIndex:
+    """
+    Sorted-value index for numeric range filters (e.g. the avg-exp slider).
+
+    A [lo, hi] query is two binary searches into the sorted values; the
+    resulting row masks are memoized per index (slider values are small integers).
+    """
+
+    MASK_CACHE_SIZE = 128
+
+    def __init__(self, values, index):
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+        self.index = index
+        self._missing = np.isnan(values)
+        valid_positions = np.flatnonzero(~self._missing)
+        order = np.argsort(values[valid_positions], kind='stable')
+        self._positions = valid_positions[order]
+        self._sorted = values[self._positions]
+        self.min = float(self._sorted[0]) if len(self._sorted) else None
+        self.max = float(self._sorted[-1]) if len(self._sorted) else None
+        self._masks = {}  # (lo, hi, include_missing) -> mask, oldest first
+        self._masks_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Pickled into the data snapshot (data_loader.build_derived): without memoized masks or the lock
+        state = self.__dict__.copy()
+        state['_masks'] = {}
+        del state['_masks_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_masks', {})
+        self._masks_lock = threading.Lock()
+
+    def positions(self, lo, hi, include_missing=False):
+        """Row positions with lo <= value <= hi (plus missing values if requested)."""
+        start = np.searchsorted(self._sorted, lo, side='left')
+        end = np.searchsorted(self._sorted, hi, side='right')
+        positions = self._positions[start:end]
+        if include_missing:
+            positions = np.concatenate([positions, np.flatnonzero(self._missing)])
+        return positions
+
+    def covers_all(self, lo, hi, include_missing=False):
+        """True when the range keeps every row, so the filter can be skipped."""
+        if self._missing.any() and not include_missing:
+            return False
+        return self.min is None or (lo <= self.min and hi >= self.max)
+
+    def mask(self, lo, hi, include_missing=False):
+        """Boolean mask aligned with the indexed dataframe (read-only, memoized)."""
+        key = (float(lo), float(hi), bool(include_missing))
+        keep = self._masks.get(key)
+        if keep is None:
+            keep = np.zeros(len(self.index), dtype=bool)
+            keep[self.positions(lo, hi, include_missing)] = True
+            keep.setflags(write=False)
+            with self._masks_lock:
+                if len(self._masks) >= self.MASK_CACHE_SIZE:
+                    self._masks.pop(next(iter(self._masks)))
+                self._masks[key] = keep
+        return keep
+
+    def filter(self, frame, lo, hi, include_missing=False):
+        """Apply the range filter to `frame`, any row subset of the indexed dataframe."""
+        if self.covers_all(lo, hi, include_missing):
+            return frame
+        keep = self.mask(lo, hi, include_missing)
+        if frame.index is self.index or frame.index.equals(self.index):
+            return frame[keep]
+        return frame[keep[self.index.get_indexer(frame.index)]]
+
+
+class PrefixOptionIndex:
+    """
+    Dropdown options for high-cardinality columns (Company, In_City), searched server-side.
+
+    Every word start of a value is a key ('sol' finds 'Ultimate Solutions Egypt'),
+    kept sorted so a search is two binary searches; matches are ranked by job count.
+    """
+
+    def __init__(self, values, top_k=50):
+        counts = pd.Series(values).dropna().astype(str).value_counts()
+        counts = counts[counts.index.str.strip() != '']
+        self.values = counts.index.tolist()  # most jobs first
+        self.counts = counts.to_numpy()
+        self.top_k = top_k
+        keys = []
+        for rank, value in enumerate(self.values):
+            lower = value.lower()
+            for pos, char in enumerate(lower):
+                if char.isalnum() and (pos == 0 or not lower[pos - 1].isalnum()):
+                    keys.append((lower[pos:], rank))
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._ranks = np.array([rank for _, rank in keys], dtype=np.int64)
+
+    def matches(self, text):
+        """Ranks (positions in self.values) of the values with a word starting with `text`, most jobs first."""
+        prefix = (text or '').strip().lower()
+        if not prefix:
+            return np.arange(len(self.values))
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + '\U0010ffff', lo=start)
+        return np.unique(self._ranks[start:end])  # unique() sorts: lowest rank = most jobs
+
+    def search(self, text, k=None):
+        """Top-k values matching `text` (all values when empty), most jobs first."""
+        return [self.values[rank] for rank in self.matches(text)[:k or self.top_k]]
+
+    def options(self, text=None, selected=None, k=None):
+        """Dropdown options for a search, keeping the selected values so they stay displayed."""
+        matches = self.search(text, k)
+        selected = [value for value in (selected or []) if value not in matches]
+        return [{'label': value, 'value': value} for value in selected + matches]
+
+
+class FacetIndex:
+    """
+    Live per-value job counts for the sidebar filters (faceted search).
+
+    Each faceted column is stored once as int codes (missing values get a
+    trailing code no selection matches). A selection becomes a lookup-table mask
+    over the codes, and a column's counts are one bincount over the rows kept by
+    every *other* active filter, so options can be recomputed on each change.
+    """
+
+    def __init__(self, columns):
+        """columns: {name: (values per row, levels in display order)}"""
+        self.levels = {}
+        self.codes = {}
+        self.positions = {}
+        for name, (values, levels) in columns.items():
+            levels = list(levels)
+            codes = pd.Categorical(pd.Series(values).to_numpy(), categories=levels).codes.astype(np.int64)
+            self.codes[name] = np.where(codes < 0, len(levels), codes)
+            self.levels[name] = levels
+            self.positions[name] = {value: i for i, value in enumerate(levels)}
+
+    def mask(self, name, selected):
+        """Rows whose `name` value is one of `selected`."""
+        lookup = np.zeros(len(self.levels[name]) + 1, dtype=bool)
+        lookup[[self.positions[name][v] for v in selected if v in self.positions[name]]] = True
+        return lookup[self.codes[name]]
+
+    def counts(self, selections, base_mask=None, names=None):
+        """
+        {name: job count per level} for each column in `names` (default all), counting the rows
+        kept by `base_mask` (filters that are not facets) and every selection except its own.
+        """
+        masks = {name: self.mask(name, values) for name, values in selections.items()
+                 if values and name in self.codes}
+        result = {}
+        for name in names or self.codes:
+            keep = base_mask
+            for other, other_mask in masks.items():
+                if other != name:
+                    keep = other_mask if keep is None else keep & other_mask
+            codes = self.codes[name] if keep is None else self.codes[name][keep]
+            result[name] = np.bincount(codes, minlength=len(self.levels[name]) + 1)[:-1]
+        return result
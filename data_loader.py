@@ -1,14 +1,19 @@
 import pandas as pd
 import numpy as np
 import os
-import re
-import json
+import hashlib
 import time
-import requests
-from datetime import datetime, timedelta
 
 import sys
 
+from data_index import bucket_experience, RangeFilterIndex, PrefixOptionIndex, FacetIndex
+from time_cube import TimeSeriesCube
+from dataset_snapshot import load_snapshot, write_snapshot, load_derived
+from startup_report import record, timed
+from gazetteer import egypt_gazetteer, spread_points
+from geocoder import read_geocode_cache, GEOCODE_CACHE_PATH
+from relative_dates import parse_relative_dates, scrape_timestamp
+
 def load_real_data():
     """Load job data from Excel and normalize columns."""
     # path to your file; use relative path for portability
@@ -40,27 +45,9 @@ def load_real_data():
             parsed = pd.to_datetime(orig_posted, errors='coerce')
             rel_mask = parsed.isna() & orig_posted.notna()
 
-            def _parse_relative(s: str):
-                if not isinstance(s, str) or not s.strip():
-                    return pd.NaT
-                m = re.search(r"(\d+)\s*(day|days|week|weeks|month|months|year|years)", s, flags=re.IGNORECASE)
-                if not m:
-                    return pd.NaT
-                n = int(m.group(1))
-                unit = m.group(2).lower()
-                if 'day' in unit:
-                    days = n
-                elif 'week' in unit:
-                    days = n * 7
-                elif 'month' in unit:
-                    days = n * 30
-                else:
-                    days = n * 365
-                return datetime.now() - timedelta(days=days)
-
             if rel_mask.any():
-                parsed_rel = orig_posted[rel_mask].apply(_parse_relative)
-                parsed.loc[rel_mask] = parsed_rel
+                # "N days ago" values, relative to when Jobs.xlsx was scraped (SCRAPED_AT or the file time)
+                parsed.loc[rel_mask] = parse_relative_dates(orig_posted[rel_mask], scrape_timestamp(path))
 
             df['posted'] = parsed
 
@@ -109,404 +96,58 @@ def load_real_data():
     elif 'Location' in df.columns:
         df = df[df['Location'].astype(str).str.contains('Egypt', case=False, na=False)]
     
-    # Helper: detect latitude/longitude column name variants
-    def _detect_latlon(df_local: pd.DataFrame):
-        lat_aliases = ['latitude', 'lat', 'Latitude', 'LAT', 'Lat']
-        lon_aliases = ['longitude', 'lon', 'lng', 'Longitude', 'LON', 'Lng']
-        lat_col = next((c for c in df_local.columns if c in lat_aliases or c.lower() in [a.lower() for a in lat_aliases]), None)
-        lon_col = next((c for c in df_local.columns if c in lon_aliases or c.lower() in [a.lower() for a in lon_aliases]), None)
-        return lat_col, lon_col
-
-    # Simple JSON cache helpers for geocoding
-    cache_path = os.path.join(os.path.dirname(__file__), 'geocode_cache.json')
-
-    def _load_cache(path):
-        if os.path.exists(path):
-            try:
-                with open(path, 'r', encoding='utf-8') as fh:
-                    return json.load(fh)
-            except Exception:
-                return {}
-        return {}
-
-    def _save_cache(path, cache):
-        try:
-            with open(path, 'w', encoding='utf-8') as fh:
-                json.dump(cache, fh, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
-
-    def _geocode_city(name: str, cache: dict, cache_path_local: str, pause: float = 1.0):
-        if not isinstance(name, str) or not name.strip():
-            return None
-        key = name.strip()
-        if key in cache:
-            return cache[key]
-        try:
-            params = {'q': name, 'format': 'json', 'limit': 1}
-            headers = {'User-Agent': 'JobsDashboard/1.0 (contact@example.com)'}
-            resp = requests.get('https://nominatim.openstreetmap.org/search', params=params, headers=headers, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data:
-                    lat = float(data[0].get('lat'))
-                    lon = float(data[0].get('lon'))
-                    cache[key] = {'lat': lat, 'lon': lon}
-                    _save_cache(cache_path_local, cache)
-                    time.sleep(pause)
-                    return cache[key]
-        except Exception:
-            pass
-        return None
-
-    # Hardcoded coordinates for major Egyptian cities
-    egypt_cities_coords = {
-        'Cairo': {'lat': 30.0444, 'lon': 31.2357},
-        'Giza': {'lat': 30.0131, 'lon': 31.2089},
-        'Alexandria': {'lat': 31.2001, 'lon': 29.9187},
-        'New Cairo': {'lat': 30.0074, 'lon': 31.4913},
-        'Nasr City': {'lat': 30.0561, 'lon': 31.3301},
-        '6th of October': {'lat': 29.9742, 'lon': 30.9582},
-        'Maadi': {'lat': 29.9602, 'lon': 31.2569},
-        'Sheikh Zayed': {'lat': 30.0444, 'lon': 30.9833},
-        'Sharm El Sheikh': {'lat': 27.9158, 'lon': 34.3299},
-        'Hurghada': {'lat': 27.2579, 'lon': 33.8116},
-        'Luxor': {'lat': 25.6872, 'lon': 32.6396},
-        'Aswan': {'lat': 24.0889, 'lon': 32.8998},
-        'Mansoura': {'lat': 31.0409, 'lon': 31.3785},
-        'Tanta': {'lat': 30.7865, 'lon': 31.0004},
-        'Port Said': {'lat': 31.2653, 'lon': 32.3019},
-        'Suez': {'lat': 29.9668, 'lon': 32.5498},
-        'Ismailia': {'lat': 30.5965, 'lon': 32.2715},
-        'Damietta': {'lat': 31.4175, 'lon': 31.8144},
-        'Zagazig': {'lat': 30.5765, 'lon': 31.5041},
-        'Fayoum': {'lat': 29.3084, 'lon': 30.8428},
-        'Minya': {'lat': 28.1099, 'lon': 30.7503},
-        'Assiut': {'lat': 27.1783, 'lon': 31.1859},
-        'Sohag': {'lat': 26.5590, 'lon': 31.6957},
-        'Qena': {'lat': 26.1551, 'lon': 32.7160},
-        'Beni Suef': {'lat': 29.0661, 'lon': 31.0994},
-        'Matruh': {'lat': 31.3543, 'lon': 27.2373},
-        'Kafr El Sheikh': {'lat': 31.1107, 'lon': 30.9388},
-        'Banha': {'lat': 30.4660, 'lon': 31.1858},
-        'Damanhur': {'lat': 31.0424, 'lon': 30.4635},
-        'Obour City': {'lat': 30.2233, 'lon': 31.4756},
-        'Helwan': {'lat': 29.8414, 'lon': 31.3008},
-        'Mokattam': {'lat': 30.0220, 'lon': 31.3060},
-        'Heliopolis': {'lat': 30.0890, 'lon': 31.3284},
-        'Sheraton': {'lat': 30.1066, 'lon': 31.3688},
-        'Dokki': {'lat': 30.0385, 'lon': 31.2123},
-        'Mohandessin': {'lat': 30.0511, 'lon': 31.2045},
-        'Agouza': {'lat': 30.0538, 'lon': 31.2148},
-        'Zamalek': {'lat': 30.0609, 'lon': 31.2197},
-        'Downtown': {'lat': 30.0444, 'lon': 31.2357},
-        'Garden City': {'lat': 30.0362, 'lon': 31.2316},
-        'Katameya': {'lat': 29.9926, 'lon': 31.4055},
-        'Rehab City': {'lat': 30.0630, 'lon': 31.4950},
-        'Madinaty': {'lat': 30.0850, 'lon': 31.6300},
-        'Shorouk City': {'lat': 30.1290, 'lon': 31.6090},
-        'Badr City': {'lat': 30.1420, 'lon': 31.7400},
-        '10th of Ramadan': {'lat': 30.3000, 'lon': 31.7333},
-        'Sadat City': {'lat': 30.3833, 'lon': 30.5167},
-        'Borg El Arab': {'lat': 30.9167, 'lon': 29.5333},
-        'Ain Sokhna': {'lat': 29.6000, 'lon': 32.3167},
-        'North Coast': {'lat': 30.9500, 'lon': 28.8500},
-        'Siwa Oasis': {'lat': 29.2032, 'lon': 25.5195},
-        'Marsa Alam': {'lat': 25.0676, 'lon': 34.8790},
-        'Dahab': {'lat': 28.5096, 'lon': 34.5136},
-        'Nuweiba': {'lat': 29.0333, 'lon': 34.6667},
-        'Taba': {'lat': 29.4925, 'lon': 34.8957},
-        'Saint Catherine': {'lat': 28.5559, 'lon': 33.9760},
-        'El Tor': {'lat': 28.2333, 'lon': 33.6167},
-        'Ras Sudr': {'lat': 29.5833, 'lon': 32.7000},
-        'Qalyub': {'lat': 30.1785, 'lon': 31.2067},
-        'Khanka': {'lat': 30.2111, 'lon': 31.3686},
-        'Shubra El Kheima': {'lat': 30.1286, 'lon': 31.2422}
-    }
-
-    lat_col, lon_col = _detect_latlon(df)
-
-    # 1. First try to map from hardcoded dictionary
-    df['temp_lat'] = np.nan
-    df['temp_lon'] = np.nan
-
-    if 'In_City' in df.columns:
-         df['temp_lat'] = df['In_City'].map(lambda x: egypt_cities_coords.get(str(x).strip(), {}).get('lat'))
-         df['temp_lon'] = df['In_City'].map(lambda x: egypt_cities_coords.get(str(x).strip(), {}).get('lon'))
+    if 'Latitude' not in df.columns: df['Latitude'] = np.nan
+    if 'Longitude' not in df.columns: df['Longitude'] = np.nan
+    df['Latitude'] = pd.to_numeric(df['Latitude'], errors='coerce')
+    df['Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
 
+    # 1. Offline gazetteer: In_City (district, city) then City (governorate), one merge pass
     if 'City' in df.columns:
-        mask_missing = df['temp_lat'].isna()
-        df.loc[mask_missing, 'temp_lat'] = df.loc[mask_missing, 'City'].map(lambda x: egypt_cities_coords.get(str(x).strip(), {}).get('lat'))
-        df.loc[mask_missing, 'temp_lon'] = df.loc[mask_missing, 'City'].map(lambda x: egypt_cities_coords.get(str(x).strip(), {}).get('lon'))
-
-        if 'Latitude' not in df.columns: df['Latitude'] = np.nan
-        if 'Longitude' not in df.columns: df['Longitude'] = np.nan
-
-        df['Latitude'] = df['Latitude'].fillna(df['temp_lat'])
-        df['Longitude'] = df['Longitude'].fillna(df['temp_lon'])
-        
-        df.drop(columns=['temp_lat', 'temp_lon'], inplace=True)
-
-    # Add small jitter
-    if 'Latitude' in df.columns and 'Longitude' in df.columns:
-        df['Latitude'] = df['Latitude'] + np.random.uniform(-0.005, 0.005, size=len(df))
-        df['Longitude'] = df['Longitude'] + np.random.uniform(-0.005, 0.005, size=len(df))
-
-    # 2. If still missing, use cached geocoding results
-    if 'City' in df.columns:
-        cache = _load_cache(cache_path)
-        do_geocode = os.environ.get('AUTO_GEOCODE', '').lower() in ('1', 'true', 'yes')
-        
-        missing_coords_mask = df['Latitude'].isna() | df['Longitude'].isna()
-        missing_cities = df.loc[missing_coords_mask, 'City'].dropna().unique().tolist()
-        
-        if do_geocode and missing_cities:
-            for city in missing_cities:
-                if city in cache: continue
-                try:
-                    _geocode_city(city, cache, cache_path)
-                except Exception: pass
-            cache = _load_cache(cache_path)
-
-    if 'City' not in df.columns:
-        if 'location_2' in df.columns:
-            df['City'] = df['location_2'].str.split(',').str[0].str.strip()
-        elif 'Location' in df.columns:
-            df['City'] = df['Location'].str.split(',').str[0].str.strip()
-    else:
-        if 'location_2' in df.columns:
-             df['City'] = df['City'].fillna(df['location_2'].str.split(',').str[0].str.strip())
-
-    # Create job_status
-    if 'job_status' not in df.columns:
-        if 'open_positions' in df.columns:
-            df['job_status'] = df['open_positions'].apply(lambda x: 'Open' if x > 0 else 'Closed')
-        else:
-            df['job_status'] = 'Open'
-            
-    # Clean Link column
-    if 'Link' in df.columns:
-        df['Link'] = df['Link'].fillna('#').astype(str)
-    else:
-        df['Link'] = '#'
-    
-    # Normalize City column
-    if 'City' in df.columns:
-        df['City'] = df['City'].astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
-            
-    # Ensure In_City exists
-    if 'In_City' not in df.columns and 'Location' in df.columns:
-        df['In_City'] = df['Location'].str.split(',').str[0].str.strip()
-
-    # Filter for Egypt only
-    if 'Location_2' in df.columns:
-        df = df[df['Location_2'].astype(str).str.contains('Egypt', case=False, na=False)]
-    elif 'Location' in df.columns:
-        df = df[df['Location'].astype(str).str.contains('Egypt', case=False, na=False)]
-    
-    # Helper: detect latitude/longitude column name variants
-    def _detect_latlon(df_local: pd.DataFrame):
-        lat_aliases = ['latitude', 'lat', 'Latitude', 'LAT', 'Lat']
-        lon_aliases = ['longitude', 'lon', 'lng', 'Longitude', 'LON', 'Lng']
-        lat_col = next((c for c in df_local.columns if c in lat_aliases or c.lower() in [a.lower() for a in lat_aliases]), None)
-        lon_col = next((c for c in df_local.columns if c in lon_aliases or c.lower() in [a.lower() for a in lon_aliases]), None)
-        return lat_col, lon_col
-
-    # Simple JSON cache helpers for geocoding
-    cache_path = os.path.join(os.path.dirname(__file__), 'geocode_cache.json')
-
-    def _load_cache(path):
-        if os.path.exists(path):
-            try:
-                with open(path, 'r', encoding='utf-8') as fh:
-                    return json.load(fh)
-            except Exception:
-                return {}
-        return {}
-
-    def _save_cache(path, cache):
-        try:
-            with open(path, 'w', encoding='utf-8') as fh:
-                json.dump(cache, fh, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
-
-    def _geocode_city(name: str, cache: dict, cache_path_local: str, pause: float = 1.0):
-        if not isinstance(name, str) or not name.strip():
-            return None
-        key = name.strip()
-        if key in cache:
-            return cache[key]
-        try:
-            params = {'q': name, 'format': 'json', 'limit': 1}
-            headers = {'User-Agent': 'JobsDashboard/1.0 (contact@example.com)'}
-            resp = requests.get('https://nominatim.openstreetmap.org/search', params=params, headers=headers, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data:
-                    lat = float(data[0].get('lat'))
-                    lon = float(data[0].get('lon'))
-                    cache[key] = {'lat': lat, 'lon': lon}
-                    _save_cache(cache_path_local, cache)
-                    time.sleep(pause)
-                    return cache[key]
-        except Exception:
-            pass
-        return None
-
-    # Hardcoded coordinates for major Egyptian cities
-    egypt_cities_coords = {
-        'Cairo': {'lat': 30.0444, 'lon': 31.2357},
-        'Giza': {'lat': 30.0131, 'lon': 31.2089},
-        'Alexandria': {'lat': 31.2001, 'lon': 29.9187},
-        'New Cairo': {'lat': 30.0074, 'lon': 31.4913},
-        'Nasr City': {'lat': 30.0561, 'lon': 31.3301},
-        '6th of October': {'lat': 29.9742, 'lon': 30.9582},
-        'Maadi': {'lat': 29.9602, 'lon': 31.2569},
-        'Sheikh Zayed': {'lat': 30.0444, 'lon': 30.9833},
-        'Sharm El Sheikh': {'lat': 27.9158, 'lon': 34.3299},
-        'Hurghada': {'lat': 27.2579, 'lon': 33.8116},
-        'Luxor': {'lat': 25.6872, 'lon': 32.6396},
-        'Aswan': {'lat': 24.0889, 'lon': 32.8998},
-        'Mansoura': {'lat': 31.0409, 'lon': 31.3785},
-        'Tanta': {'lat': 30.7865, 'lon': 31.0004},
-        'Port Said': {'lat': 31.2653, 'lon': 32.3019},
-        'Suez': {'lat': 29.9668, 'lon': 32.5498},
-        'Ismailia': {'lat': 30.5965, 'lon': 32.2715},
-        'Damietta': {'lat': 31.4175, 'lon': 31.8144},
-        'Zagazig': {'lat': 30.5765, 'lon': 31.5041},
-        'Fayoum': {'lat': 29.3084, 'lon': 30.8428},
-        'Minya': {'lat': 28.1099, 'lon': 30.7503},
-        'Assiut': {'lat': 27.1783, 'lon': 31.1859},
-        'Sohag': {'lat': 26.5590, 'lon': 31.6957},
-        'Qena': {'lat': 26.1551, 'lon': 32.7160},
-        'Beni Suef': {'lat': 29.0661, 'lon': 31.0994},
-        'Matruh': {'lat': 31.3543, 'lon': 27.2373},
-        'Kafr El Sheikh': {'lat': 31.1107, 'lon': 30.9388},
-        'Banha': {'lat': 30.4660, 'lon': 31.1858},
-        'Damanhur': {'lat': 31.0424, 'lon': 30.4635},
-        'Obour City': {'lat': 30.2233, 'lon': 31.4756},
-        'Helwan': {'lat': 29.8414, 'lon': 31.3008},
-        'Mokattam': {'lat': 30.0220, 'lon': 31.3060},
-        'Heliopolis': {'lat': 30.0890, 'lon': 31.3284},
-        'Sheraton': {'lat': 30.1066, 'lon': 31.3688},
-        'Dokki': {'lat': 30.0385, 'lon': 31.2123},
-        'Mohandessin': {'lat': 30.0511, 'lon': 31.2045},
-        'Agouza': {'lat': 30.0538, 'lon': 31.2148},
-        'Zamalek': {'lat': 30.0609, 'lon': 31.2197},
-        'Downtown': {'lat': 30.0444, 'lon': 31.2357},
-        'Garden City': {'lat': 30.0362, 'lon': 31.2316},
-        'Katameya': {'lat': 29.9926, 'lon': 31.4055},
-        'Rehab City': {'lat': 30.0630, 'lon': 31.4950},
-        'Madinaty': {'lat': 30.0850, 'lon': 31.6300},
-        'Shorouk City': {'lat': 30.1290, 'lon': 31.6090},
-        'Badr City': {'lat': 30.1420, 'lon': 31.7400},
-        '10th of Ramadan': {'lat': 30.3000, 'lon': 31.7333},
-        'Sadat City': {'lat': 30.3833, 'lon': 30.5167},
-        'Borg El Arab': {'lat': 30.9167, 'lon': 29.5333},
-        'Ain Sokhna': {'lat': 29.6000, 'lon': 32.3167},
-        'North Coast': {'lat': 30.9500, 'lon': 28.8500},
-        'Siwa Oasis': {'lat': 29.2032, 'lon': 25.5195},
-        'Marsa Alam': {'lat': 25.0676, 'lon': 34.8790},
-        'Dahab': {'lat': 28.5096, 'lon': 34.5136},
-        'Nuweiba': {'lat': 29.0333, 'lon': 34.6667},
-        'Taba': {'lat': 29.4925, 'lon': 34.8957},
-        'Saint Catherine': {'lat': 28.5559, 'lon': 33.9760},
-        'El Tor': {'lat': 28.2333, 'lon': 33.6167},
-        'Ras Sudr': {'lat': 29.5833, 'lon': 32.7000},
-        'Qalyub': {'lat': 30.1785, 'lon': 31.2067},
-        'Khanka': {'lat': 30.2111, 'lon': 31.3686},
-        'Shubra El Kheima': {'lat': 30.1286, 'lon': 31.2422}
-    }
-
-    lat_col, lon_col = _detect_latlon(df)
-
-    # 1. First try to map from hardcoded dictionary
-    df['temp_lat'] = np.nan
-    df['temp_lon'] = np.nan
-
-    if 'In_City' in df.columns:
-         df['temp_lat'] = df['In_City'].map(lambda x: egypt_cities_coords.get(str(x).strip(), {}).get('lat'))
-         df['temp_lon'] = df['In_City'].map(lambda x: egypt_cities_coords.get(str(x).strip(), {}).get('lon'))
-
-    if 'City' in df.columns:
-        mask_missing = df['temp_lat'].isna()
-        df.loc[mask_missing, 'temp_lat'] = df.loc[mask_missing, 'City'].map(lambda x: egypt_cities_coords.get(str(x).strip(), {}).get('lat'))
-        df.loc[mask_missing, 'temp_lon'] = df.loc[mask_missing, 'City'].map(lambda x: egypt_cities_coords.get(str(x).strip(), {}).get('lon'))
-
-        if 'Latitude' not in df.columns: df['Latitude'] = np.nan
-        if 'Longitude' not in df.columns: df['Longitude'] = np.nan
-
-        df['Latitude'] = df['Latitude'].fillna(df['temp_lat'])
-        df['Longitude'] = df['Longitude'].fillna(df['temp_lon'])
-        
-        df.drop(columns=['temp_lat', 'temp_lon'], inplace=True)
-
-    # Add small jitter
-    if 'Latitude' in df.columns and 'Longitude' in df.columns:
-        df['Latitude'] = df['Latitude'] + np.random.uniform(-0.005, 0.005, size=len(df))
-        df['Longitude'] = df['Longitude'] + np.random.uniform(-0.005, 0.005, size=len(df))
-
-    # 2. If still missing, use cached geocoding results
-    if 'City' in df.columns:
-        cache = _load_cache(cache_path)
-        do_geocode = os.environ.get('AUTO_GEOCODE', '').lower() in ('1', 'true', 'yes')
-        
-        missing_coords_mask = df['Latitude'].isna() | df['Longitude'].isna()
-        missing_cities = df.loc[missing_coords_mask, 'City'].dropna().unique().tolist()
-        
-        if do_geocode and missing_cities:
-            for city in missing_cities:
-                if city in cache: continue
-                try:
-                    _geocode_city(city, cache, cache_path)
-                except Exception: pass
-            cache = _load_cache(cache_path)
-
+        with timed('gazetteer'):
+            in_city = df['In_City'] if 'In_City' in df.columns else pd.Series('', index=df.index)
+            located = egypt_gazetteer().resolve(in_city, df['City'])
+            located.index = df.index
+        df['Latitude'] = df['Latitude'].fillna(located['lat'])
+        df['Longitude'] = df['Longitude'].fillna(located['lon'])
+        kinds = located['kind'].fillna('unresolved').value_counts()
+        fuzzy = located['match'].str.endswith('_fuzzy', na=False).sum()
+        print("[+] Gazetteer: " + ", ".join(f"{n:,} {kind}" for kind, n in kinds.items()) + f" ({fuzzy:,} by fuzzy match)")
+
+    # 2. If still missing, use the places geocoded offline by geocoder.py (the app only reads its cache)
+    missing_coords_mask = df['Latitude'].isna() | df['Longitude'].isna()
+    if 'City' in df.columns and missing_coords_mask.any():
+        cache = read_geocode_cache()
         if cache:
-            def get_lat_from_cache(city):
-                return cache.get(city, {}).get('lat')
-            def get_lon_from_cache(city):
-                return cache.get(city, {}).get('lon')
-                
-            df.loc[missing_coords_mask, 'Latitude'] = df.loc[missing_coords_mask, 'City'].apply(get_lat_from_cache)
-            df.loc[missing_coords_mask, 'Longitude'] = df.loc[missing_coords_mask, 'City'].apply(get_lon_from_cache)
+            cached = df.loc[missing_coords_mask, 'City'].map(cache)
+            df.loc[missing_coords_mask, 'Latitude'] = cached.str[0]
+            df.loc[missing_coords_mask, 'Longitude'] = cached.str[1]
+
+    # Spread co-located jobs around their place, the same way in every worker and restart
+    # (offsets derived from the job's Link / title / company, see gazetteer.spread_points)
+    job_keys = df[[c for c in ('Link', 'Job Title', 'Company') if c in df.columns]].astype(str)
+    layout = os.environ.get('COORD_LAYOUT', 'jitter')
+    df['Latitude'], df['Longitude'] = spread_points(df['Latitude'], df['Longitude'], job_keys, 0.005, layout)
 
     # 3. CRITICAL FALLBACK: Force Numeric & Fill Missing
     # Ensure columns are float. Coerce errors (empty strings, junk) to NaN so we can fill them.
-    if 'Latitude' in df.columns:
-        df['Latitude'] = pd.to_numeric(df['Latitude'], errors='coerce')
-    if 'Longitude' in df.columns:
-        df['Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
+    df['Latitude'] = pd.to_numeric(df['Latitude'], errors='coerce')
+    df['Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
         
     # Fill NaN with Cairo + Small Jitter (to prevent perfect overlap)
-    if 'Latitude' in df.columns and 'Longitude' in df.columns:
-        missing_mask = df['Latitude'].isna() | df['Longitude'].isna()
-        n_missing = missing_mask.sum()
-        if n_missing > 0:
-            # Assign Cairo coords with jitter to missing entries
-            df.loc[missing_mask, 'Latitude'] = 30.0444 + np.random.uniform(-0.02, 0.02, size=n_missing)
-            df.loc[missing_mask, 'Longitude'] = 31.2357 + np.random.uniform(-0.02, 0.02, size=n_missing)
+    missing_mask = df['Latitude'].isna() | df['Longitude'].isna()
+    n_missing = missing_mask.sum()
+    if n_missing > 0:
+        # Assign Cairo coords with jitter to missing entries
+        print(f"[!] {n_missing:,} jobs without coordinates placed in Cairo (python geocoder.py geocodes them)")
+        cairo_lat, cairo_lon = spread_points(np.full(n_missing, 30.0444), np.full(n_missing, 31.2357),
+                                             job_keys[missing_mask], 0.02, layout)
+        df.loc[missing_mask, 'Latitude'] = cairo_lat.to_numpy()
+        df.loc[missing_mask, 'Longitude'] = cairo_lon.to_numpy()
 
     return df
 
-# Load dataframe once
-try:
-    df = load_real_data()
-    print(f"[+] Loaded {len(df)} jobs")
-except Exception as e:
-    print(f"[!] Could not load data: {e}")
-    # Create empty DataFrame with expected columns to prevent app crash
-    df = pd.DataFrame(columns=[
-        'Job Title', 'Company', 'Location', 'City', 'In_City', 'location_2',
-        'Employment Type', 'Work Mode', 'Career Level', 'Category', 
-        'Category 2', 'Category 3', 'Skills', 'Skill_List', 'education_level',
-        'Year Of Exp', 'How Long Ago', 'posted', 'applicants', 'open_positions',
-        'job_status', 'Link', 'Latitude', 'Longitude', 'Year Of Exp_Avg'
-    ])
-    
-# Load Skills Data
-try:
+def load_skills_data():
+    """Load the unpivoted Skills table (one row per job title / skill)."""
     if getattr(sys, 'frozen', False):
         base_dir = sys._MEIPASS
     else:
@@ -520,6 +161,138 @@ try:
     else:
         print(f"[!] Skills file not found at {skills_path}")
         skills_df = pd.DataFrame(columns=['Job Title', 'Skills', 'Category'])
-except Exception as e:
-    print(f"[!] Error loading skills data: {e}")
-    skills_df = pd.DataFrame(columns=['Job Title', 'Skills', 'Category'])
+    return skills_df
+
+def load_from_sources():
+    """Jobs + Skills dataframes from the Excel sources, with the load-time derived columns."""
+    try:
+        df = load_real_data()
+        print(f"[+] Loaded {len(df)} jobs")
+    except Exception as e:
+        print(f"[!] Could not load data: {e}")
+        # Create empty DataFrame with expected columns to prevent app crash
+        df = pd.DataFrame(columns=[
+            'Job Title', 'Company', 'Location', 'City', 'In_City', 'location_2',
+            'Employment Type', 'Work Mode', 'Career Level', 'Category', 
+            'Category 2', 'Category 3', 'Skills', 'Skill_List', 'education_level',
+            'Year Of Exp', 'How Long Ago', 'posted', 'applicants', 'open_positions',
+            'job_status', 'Link', 'Latitude', 'Longitude', 'Year Of Exp_Avg'
+        ])
+
+    # Precompute experience bucket codes once at load time
+    if 'Year Of Exp_Avg' in df.columns:
+        df['Year Of Exp_Avg'] = pd.to_numeric(df['Year Of Exp_Avg'], errors='coerce')
+        df['exp_bucket'] = bucket_experience(df['Year Of Exp_Avg'])
+
+    # Load Skills Data
+    try:
+        skills_df = load_skills_data()
+    except Exception as e:
+        print(f"[!] Error loading skills data: {e}")
+        skills_df = pd.DataFrame(columns=['Job Title', 'Skills', 'Category'])
+    return df, skills_df
+
+# Live option counts for the sidebar dropdowns (levels in the order the sidebar lists them)
+def _facet_columns(frame, company_options, in_city_options):
+    columns = {'Company': company_options.values, 'In_City': in_city_options.values}
+    if 'City' in frame.columns:
+        columns['City'] = sorted(frame['City'].dropna().unique().tolist())
+    for col in ['Category', 'Work Mode', 'Employment Type', 'Career Level', 'education_level', 'job_status']:
+        if col in frame.columns:
+            columns[col] = frame[col].dropna().unique().tolist()
+    facets = {col: (frame[col], levels) for col, levels in columns.items() if col in frame.columns}
+    if 'posted' in frame.columns:
+        facets['month'] = (pd.to_datetime(frame['posted'], errors='coerce').dt.month.astype('Int64'), range(1, 13))
+    return facets
+
+# Dataset generation used in shared cache keys (see shared_cache): workers that loaded the
+# same data agree on it, and reloading new data stops old cache entries from matching.
+# Relative "N days ago" dates are anchored to load time, so they are hashed at day resolution.
+def _dataset_fingerprint(*frames):
+    digest = hashlib.md5()
+    for frame in frames:
+        frame = frame.copy()
+        for col in frame.select_dtypes(include='datetime').columns:
+            frame[col] = frame[col].dt.floor('D')
+        digest.update(str(len(frame)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+    return digest.hexdigest()[:12]
+
+# Code the derived objects are built by: saved ones are rebuilt when it changes. The frozen
+# desktop app has no sources to hash and trusts its bundled artifact (build_data_artifact.py).
+DERIVED_MODULES = ['data_loader.py', 'data_index.py', 'time_cube.py']
+
+def _code_stamp():
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.md5()
+    for name in DERIVED_MODULES:
+        path = os.path.join(root, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()[:12]
+
+def build_derived(df, skills_df):
+    """Load-time indexes and cubes over the jobs dataframe, saved with the data snapshot."""
+    derived = {'code_stamp': _code_stamp()}
+    # Avg-exp range index
+    derived['exp_range_index'] = RangeFilterIndex(df['Year Of Exp_Avg'], df.index) if 'Year Of Exp_Avg' in df.columns else None
+    # Searchable sidebar options for the high-cardinality dropdowns (top matches by job count)
+    derived['company_options'] = PrefixOptionIndex(df['Company'] if 'Company' in df.columns else [])
+    derived['in_city_options'] = PrefixOptionIndex(df['In_City'] if 'In_City' in df.columns else [])
+    with timed('build_filter_facets'):
+        derived['filter_facets'] = FacetIndex(_facet_columns(df, derived['company_options'], derived['in_city_options']))
+    # Day x dimension job/applicant cube for the Time Analysis page
+    with timed('build_time_cube'):
+        derived['time_cube'] = TimeSeriesCube(df)
+    with timed('dataset_fingerprint'):
+        derived['data_version'] = _dataset_fingerprint(df, skills_df)
+    return derived
+
+# Load dataframes once - from the memory-mapped snapshot (see dataset_snapshot) when it is
+# up to date with the Excel files, so gunicorn workers share one physical copy of the data.
+# DATA_SNAPSHOT=0 disables it, DATA_SNAPSHOT_DIR moves it.
+DATA_DIR = sys._MEIPASS if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_SOURCES = [os.path.join(DATA_DIR, 'Jobs.xlsx'), os.path.join(DATA_DIR, 'Skills_Cleaned_UnPivot.xlsx'),
+                    os.path.join(DATA_DIR, 'egypt_gazetteer.csv'), GEOCODE_CACHE_PATH,
+                    # the normalization code: coordinates and columns change with it
+                    os.path.join(DATA_DIR, 'data_loader.py'), os.path.join(DATA_DIR, 'gazetteer.py')]
+SNAPSHOT_DIR = os.environ.get('DATA_SNAPSHOT_DIR', os.path.join(DATA_DIR, 'data_snapshot'))
+USE_SNAPSHOT = os.environ.get('DATA_SNAPSHOT', '1').lower() not in ('0', 'false', 'no')
+
+load_start = time.perf_counter()
+snapshot = load_snapshot(SNAPSHOT_DIR, SNAPSHOT_SOURCES) if USE_SNAPSHOT else None
+if snapshot is None:
+    df, skills_df = load_from_sources()
+    if USE_SNAPSHOT and len(df):
+        try:
+            write_snapshot(SNAPSHOT_DIR, {'jobs': df, 'skills': skills_df}, SNAPSHOT_SOURCES,
+                           derived=build_derived(df, skills_df))
+            # Re-open it so this process (and every forked worker) uses the mapped copy
+            snapshot = load_snapshot(SNAPSHOT_DIR)
+            print(f"[+] Wrote data snapshot to {SNAPSHOT_DIR}")
+        except Exception as e:
+            print(f"[!] Could not write data snapshot: {e}")
+if snapshot is not None:
+    df, skills_df = snapshot['jobs'], snapshot['skills']
+    print(f"[+] Loaded {len(df)} jobs, {len(skills_df)} skills rows from data snapshot")
+record('load_data' if snapshot is None else 'load_data (snapshot)', (time.perf_counter() - load_start) * 1000)
+
+# Indexes and cubes: mapped from the snapshot when saved with it by the same code, else built
+derived = None
+if snapshot is not None:
+    with timed('load_derived'):
+        derived = load_derived(SNAPSHOT_DIR)
+    code_stamp = _code_stamp()
+    if derived is not None and code_stamp is not None and derived.get('code_stamp') != code_stamp:
+        derived = None
+if derived is None:
+    derived = build_derived(df, skills_df)
+
+exp_range_index = derived['exp_range_index']
+company_options = derived['company_options']
+in_city_options = derived['in_city_options']
+filter_facets = derived['filter_facets']
+time_cube = derived['time_cube']
+data_version = derived['data_version']
@@ -0,0 +1,216 @@
+"""
+Immutable, memory-mapped dataset snapshot shared by all gunicorn workers.
+
+With preload_app the workers inherit the loaded dataframes from the master,
+but pandas object/str columns hold one Python object per cell and every
+refcount or GC pass over them writes to the page it lives on, so each worker
+ends up with a private copy (copy-on-write defeated). The snapshot stores the
+loaded Jobs/Skills dataframes as plain numpy files:
+
+    <snapshot>/meta.json            tables, column kinds and the source files it was built from
+                                    (or 'pinned' for generated datasets, which never go stale)
+    <snapshot>/<table>/<i>.npy      numeric / bool / datetime column values
+    <snapshot>/<table>/<i>.codes.npy  str/object/category columns: int32 codes (-1 = missing)
+    <snapshot>/<table>/<i>.values.json  their distinct values, in code order
+    <snapshot>/derived.pkl          optional load-time indexes / cubes built from the tables (pickled)
+    <snapshot>/derived.bin          their numpy buffers, memory-mapped on load
+
+Numeric columns and all codes are memory-mapped read-only, so every worker
+shares the same physical pages through the page cache. String columns are
+rebuilt from their distinct values only: the Python objects are proportional
+to the number of distinct values (e.g. 3 work modes), not to the row count.
+
+Columns are read-only numpy arrays: code that wants to modify data must work
+on a copy (the callbacks already start from df.copy() / filtered slices).
+"""
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+
+
+def _source_stamp(paths):
+    """{file name: [size, mtime_ns]} of the source files a snapshot was built from."""
+    stamp = {}
+    for path in paths:
+        if os.path.exists(path):
+            st = os.stat(path)
+            stamp[os.path.basename(path)] = [st.st_size, st.st_mtime_ns]
+    return stamp
+
+
+def _column_kind(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        return 'str'
+    if series.dtype == object:
+        return 'object'
+    return 'array'
+
+
+def _write_table(frame, table_dir):
+    os.makedirs(table_dir)
+    columns = []
+    for i, name in enumerate(frame.columns):
+        series = frame[name]
+        kind = _column_kind(series)
+        entry = {'name': name, 'kind': kind}
+        if kind == 'array':
+            np.save(os.path.join(table_dir, f'{i}.npy'), series.to_numpy())
+        else:
+            if kind == 'category':
+                codes = series.cat.codes.to_numpy()
+                values = series.cat.categories.tolist()
+                entry['ordered'] = bool(series.cat.ordered)
+            else:
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                values = list(uniques)
+            np.save(os.path.join(table_dir, f'{i}.codes.npy'), codes.astype(np.int32))
+            with open(os.path.join(table_dir, f'{i}.values.json'), 'w', encoding='utf-8') as fh:
+                json.dump(values, fh, ensure_ascii=False, default=str)
+        columns.append(entry)
+
+    index = frame.index
+    if isinstance(index, pd.RangeIndex):
+        index_meta = {'kind': 'range', 'start': index.start, 'stop': index.stop, 'step': index.step}
+    else:
+        np.save(os.path.join(table_dir, 'index.npy'), index.to_numpy())
+        index_meta = {'kind': 'array'}
+    return {'columns': columns, 'index': index_meta, 'rows': len(frame)}
+
+
+def _write_derived(objects, path):
+    """Pickle with protocol 5 so array buffers go out-of-band, into one aligned file that can be mapped."""
+    buffers = []
+    payload = pickle.dumps(objects, protocol=5, buffer_callback=buffers.append)
+    spans = []
+    with open(os.path.join(path, 'derived.bin'), 'wb') as fh:
+        for buffer in buffers:
+            raw = buffer.raw()
+            fh.write(b'\0' * (-fh.tell() % 64))
+            spans.append((fh.tell(), raw.nbytes))
+            fh.write(raw)
+    with open(os.path.join(path, 'derived.pkl'), 'wb') as fh:
+        pickle.dump({'spans': spans, 'payload': payload}, fh, protocol=5)
+
+
+def write_snapshot(path, tables, sources=(), pinned=None, derived=None):
+    """
+    Write {table name: DataFrame} to a snapshot directory.
+    Built next to the target and swapped in with a rename, so workers never see a half-written snapshot.
+    pinned: description (dict) of a generated dataset; pinned snapshots are loaded whatever the
+    source files, e.g. DATA_SNAPSHOT_DIR=bench_data/jobs_100000 for scale tests.
+    derived: optional picklable objects built from the tables (indexes, cubes), see load_derived.
+    """
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    meta = {'version': SNAPSHOT_VERSION, 'sources': _source_stamp(sources), 'tables': {}}
+    if pinned is not None:
+        meta['pinned'] = pinned
+    for name, frame in tables.items():
+        meta['tables'][name] = _write_table(frame, os.path.join(tmp_path, name))
+    if derived is not None:
+        _write_derived(derived, tmp_path)
+    with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as fh:
+        json.dump(meta, fh, ensure_ascii=False, indent=2)
+
+    old_path = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def _read_table(table_dir, table_meta):
+    data = {}
+    for i, entry in enumerate(table_meta['columns']):
+        kind = entry['kind']
+        if kind == 'array':
+            data[entry['name']] = np.load(os.path.join(table_dir, f'{i}.npy'), mmap_mode='r')
+            continue
+        codes = np.load(os.path.join(table_dir, f'{i}.codes.npy'), mmap_mode='r')
+        with open(os.path.join(table_dir, f'{i}.values.json'), encoding='utf-8') as fh:
+            values = json.load(fh)
+        if kind == 'category':
+            data[entry['name']] = pd.Categorical.from_codes(codes, categories=values, ordered=entry.get('ordered', False))
+        else:
+            # Code -1 (missing) picks the trailing NaN
+            lookup = np.array(values + [np.nan], dtype=object)
+            column = lookup[codes]
+            data[entry['name']] = pd.array(column, dtype='str') if kind == 'str' else column
+
+    index_meta = table_meta['index']
+    if index_meta['kind'] == 'range':
+        index = pd.RangeIndex(index_meta['start'], index_meta['stop'], index_meta['step'])
+    else:
+        index = pd.Index(np.load(os.path.join(table_dir, 'index.npy'), allow_pickle=True))
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def load_snapshot(path, sources=None):
+    """
+    {table name: DataFrame} backed by the snapshot's memory-mapped arrays, or None when
+    the snapshot is missing, from another format version, or older than its source files
+    (unless it is pinned).
+    """
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, encoding='utf-8') as fh:
+            meta = json.load(fh)
+        if meta.get('version') != SNAPSHOT_VERSION:
+            return None
+        if sources is not None and not meta.get('pinned') and meta.get('sources') != _source_stamp(sources):
+            return None
+        return {name: _read_table(os.path.join(path, name), table_meta)
+                for name, table_meta in meta['tables'].items()}
+    except Exception as e:
+        print(f"[!] Could not read data snapshot {path}: {e}")
+        return None
+
+
+def load_derived(path):
+    """
+    The `derived` objects saved with the snapshot, or None when there are none. Their numpy
+    arrays are read-only views of the memory-mapped derived.bin, shared like the table columns.
+    """
+    pickle_path = os.path.join(path, 'derived.pkl')
+    if not os.path.exists(pickle_path):
+        return None
+    try:
+        with open(pickle_path, 'rb') as fh:
+            saved = pickle.load(fh)
+        blob_path = os.path.join(path, 'derived.bin')
+        blob = np.memmap(blob_path, mode='r') if os.path.getsize(blob_path) else np.empty(0, dtype=np.uint8)
+        return pickle.loads(saved['payload'], buffers=[blob[start:start + size] for start, size in saved['spans']])
+    except Exception as e:
+        print(f"[!] Could not read derived data from {path}: {e}")
+        return None
+
+
+def process_memory(pid='self'):
+    """
+    RSS / PSS / shared / private memory (MB) of a process from /proc/<pid>/smaps_rollup.
+    PSS splits shared pages between the processes mapping them, so summing it over the
+    gunicorn workers gives their real combined footprint. Empty dict where unavailable.
+    """
+    fields = {'Rss': 'rss_mb', 'Pss': 'pss_mb', 'Shared_Clean': 'shared_clean_mb', 'Shared_Dirty': 'shared_dirty_mb',
+              'Private_Clean': 'private_clean_mb', 'Private_Dirty': 'private_dirty_mb'}
+    usage = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as fh:
+            for line in fh:
+                key, _, rest = line.partition(':')
+                if key in fields:
+                    usage[fields[key]] = round(int(rest.split()[0]) / 1024, 1)
+    except (OSError, ValueError):
+        return {}
+    return usage
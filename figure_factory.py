@@ -0,0 +1,184 @@
+"""
+Low-overhead figure construction for the page callbacks.
+
+Plotly Express plus the styling helpers in utils (apply_chart_styling,
+apply_large_fonts_to_chart, ...) validate every property through several
+update_layout/update_traces passes on each call. The result only depends on
+the theme and a few static chart options, so each skeleton is built ONCE
+through that same path (cached per theme/options) and afterwards the factory
+only fills in the data arrays, returning plain figure dicts that Dash
+serializes directly.
+
+The *_reference builders are the original Plotly Express code paths; they
+produce the skeletons and are what benchmark_figures.py compares against.
+Skeletons are shared between calls and must be treated as read-only.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from chart_templates import strip_template_defaults
+from utils import (get_color_scale, apply_visual_highlighting, apply_chart_styling,
+                   apply_large_fonts_to_chart, HIGHLIGHT_COLOR, DIMMED_COLOR)
+
+# Placeholder rows used to build skeletons (every data array is replaced on fill)
+_PLACEHOLDER_LABELS = ['-']
+_PLACEHOLDER_VALUES = [1]
+
+
+def _tolist(values):
+    if values is None:
+        return []
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy()
+    if isinstance(values, np.ndarray):
+        return values.tolist()
+    return list(values)
+
+
+def _skeleton(fig, trace_keys):
+    """Split a reference figure into (trace template without data keys, layout)."""
+    figure = fig.to_dict()
+    trace = {k: v for k, v in figure['data'][0].items() if k not in trace_keys}
+    # Values the (compact) template already provides don't need repeating per response
+    layout = strip_template_defaults(figure['layout'], figure['layout']['template']['layout'])
+    return trace, layout
+
+
+def _highlight(labels, selected_items):
+    """Marker colors / outline lists for selected items (see utils.apply_visual_highlighting)."""
+    colors = [HIGHLIGHT_COLOR if label in selected_items else DIMMED_COLOR for label in labels]
+    line = {'width': [3 if label in selected_items else 0 for label in labels]}
+    # Plotly rejects 'transparent' outline colors after setting the widths, so the
+    # validated figure only carries outline colors when every item is selected
+    if all(label in selected_items for label in labels):
+        line['color'] = ['#FFFFFF'] * len(labels)
+    return colors, line
+
+
+# ---------------------------------------------------------------------------
+# Deep Analysis horizontal bars
+# ---------------------------------------------------------------------------
+def deep_bar_reference(labels, values, theme, title, value_col, label_col, texttemplate, hovertemplate,
+                       customdata=None, hover_font_size=14, hover_align=None):
+    """Original Deep Analysis bar path: px.bar + inline styling + apply_large_fonts_to_chart."""
+    frame = pd.DataFrame({label_col: labels, value_col: values})
+    fig = px.bar(
+        frame, x=value_col, y=label_col, title=title, orientation='h', color=value_col,
+        color_continuous_scale=get_color_scale(theme)
+    )
+    fig.update_layout(
+        height=600, font=dict(color='#001F3F'), plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=250, r=100, t=80, b=50), showlegend=False, coloraxis_showscale=False,
+        xaxis=dict(fixedrange=True, showticklabels=False, showgrid=False, title=None),
+        yaxis=dict(fixedrange=True, tickfont=dict(size=17), title=None),
+        dragmode=False, title_font=dict(size=24)
+    )
+    hoverlabel = dict(bgcolor='#001F3F', font_size=hover_font_size, font_family='Inter', font_color='white')
+    if hover_align:
+        hoverlabel['align'] = hover_align
+    fig.update_traces(
+        texttemplate=texttemplate, textposition='outside', textfont=dict(size=17, color='#001F3F'),
+        hovertemplate=hovertemplate, customdata=customdata, hoverlabel=hoverlabel
+    )
+    return apply_large_fonts_to_chart(fig, theme=theme)
+
+
+@lru_cache(maxsize=None)
+def _deep_bar_skeleton(theme, title, value_col, label_col, texttemplate, hovertemplate, hover_font_size, hover_align):
+    fig = deep_bar_reference(
+        _PLACEHOLDER_LABELS, _PLACEHOLDER_VALUES, theme, title, value_col, label_col, texttemplate, hovertemplate,
+        customdata=[0], hover_font_size=hover_font_size, hover_align=hover_align
+    )
+    return _skeleton(fig, ('x', 'y', 'customdata'))
+
+
+def deep_bar_figure(labels, values, theme, title, value_col, label_col, texttemplate, hovertemplate,
+                    customdata=None, hover_font_size=14, hover_align=None):
+    """Figure dict equivalent to deep_bar_reference, filled from a cached skeleton."""
+    trace, layout = _deep_bar_skeleton(theme, title, value_col, label_col, texttemplate, hovertemplate,
+                                       hover_font_size, hover_align)
+    values = _tolist(values)
+    trace = dict(trace, x=values, y=_tolist(labels), marker=dict(trace['marker'], color=values))
+    if customdata is not None:
+        trace['customdata'] = _tolist(customdata)
+    return {'data': [trace], 'layout': dict(layout)}
+
+
+# ---------------------------------------------------------------------------
+# Overview horizontal bars (value counts with selection highlighting)
+# ---------------------------------------------------------------------------
+def overview_bar_reference(labels, values, theme, title, label_col, selected_items=None):
+    """Original Overview bar path: px.bar + highlighting + apply_chart_styling + apply_large_fonts_to_chart."""
+    vc = pd.DataFrame({label_col: labels, 'count': values})
+    fig = px.bar(vc, x='count', y=label_col, title=title, orientation='h', color='count',
+                 color_continuous_scale=get_color_scale(theme), text='count')
+    fig.update_layout(
+        yaxis={'categoryorder': 'total ascending', 'title': None},
+        xaxis={'showgrid': False}
+    )
+    apply_visual_highlighting(fig, vc[label_col].tolist(), selected_items, is_pie=False)
+    apply_chart_styling(fig, is_horizontal_bar=True, add_margin=True, theme=theme)
+    return apply_large_fonts_to_chart(fig, theme=theme)
+
+
+@lru_cache(maxsize=None)
+def _overview_bar_skeleton(theme, title, label_col):
+    fig = overview_bar_reference(_PLACEHOLDER_LABELS, _PLACEHOLDER_VALUES, theme, title, label_col)
+    trace, layout = _skeleton(fig, ('x', 'y', 'text'))
+    # The x-range is data dependent (25% label headroom), re-added on fill
+    layout['xaxis'] = {k: v for k, v in layout['xaxis'].items() if k != 'range'}
+    return trace, layout
+
+
+def overview_bar_figure(labels, values, theme, title, label_col, selected_items=None):
+    """Figure dict equivalent to overview_bar_reference, filled from a cached skeleton."""
+    trace, layout = _overview_bar_skeleton(theme, title, label_col)
+    labels = _tolist(labels)
+    values = _tolist(values)
+    marker = dict(trace['marker'], color=values)
+    if selected_items:
+        marker['color'], marker['line'] = _highlight(labels, selected_items)
+    trace = dict(trace, x=values, y=labels, text=[float(v) for v in values], marker=marker)
+
+    layout = dict(layout)
+    max_val = max(values) if values else 0
+    if max_val > 0:
+        layout['xaxis'] = dict(layout['xaxis'], range=[0, max_val * 1.25])
+    return {'data': [trace], 'layout': layout}
+
+
+# ---------------------------------------------------------------------------
+# Overview donut
+# ---------------------------------------------------------------------------
+def donut_reference(labels, values, theme, title, label_col, selected_items=None):
+    """Original Work Mode donut path: px.pie + highlighting + styling + forced white labels."""
+    vc = pd.DataFrame({label_col: labels, 'count': values})
+    fig = px.pie(vc, values='count', names=label_col, title=title, hole=0.5,
+                 color_discrete_sequence=px.colors.sequential.Blues_r)
+    fig.update_traces(textposition='inside', textinfo='percent+label', rotation=-45, textfont=dict(color='white'))
+    apply_visual_highlighting(fig, vc[label_col].tolist(), selected_items, is_pie=True)
+    apply_chart_styling(fig, is_horizontal_bar=False, add_margin=False, theme=theme)
+    fig.update_traces(textfont=dict(color='white', size=14, weight='bold'))
+    fig = apply_large_fonts_to_chart(fig, theme=theme)
+    fig.update_traces(textfont=dict(color='white', size=16, weight='bold'), textposition='inside')
+    return fig
+
+
+@lru_cache(maxsize=None)
+def _donut_skeleton(theme, title, label_col):
+    fig = donut_reference(_PLACEHOLDER_LABELS, _PLACEHOLDER_VALUES, theme, title, label_col)
+    return _skeleton(fig, ('labels', 'values', 'marker'))
+
+
+def donut_figure(labels, values, theme, title, label_col, selected_items=None):
+    """Figure dict equivalent to donut_reference, filled from a cached skeleton."""
+    trace, layout = _donut_skeleton(theme, title, label_col)
+    labels = _tolist(labels)
+    trace = dict(trace, labels=labels, values=_tolist(values))
+    if selected_items:
+        colors, line = _highlight(labels, selected_items)
+        trace['marker'] = {'colors': colors, 'line': line}
+    return {'data': [trace], 'layout': dict(layout)}
@@ -3,10 +3,9 @@ Flask route to serve full interactive map
 Access via: /full-map
 """
 from flask import Response
-from app_instance import server, cache
-from data_loader import df
-import folium
-from folium.plugins import FastMarkerCluster
+from app_instance import server
+from data_loader import df, data_version
+from shared_cache import cache_key, cached_value
 import pandas as pd
 
 @server.route('/full-map')
@@ -21,16 +20,19 @@ def full_map():
     work_modes = request.args.getlist('work_mode')
     search = request.args.get('search', '')
     
-    # Create cache key based on filters
-    import hashlib
-    filter_key = f"{cities}_{companies}_{categories}_{work_modes}_{search}"
-    cache_key = hashlib.md5(filter_key.encode()).hexdigest()
-    
-    # Check cache
-    cached_full_map = cache.get(f'full_map_{cache_key}')
-    if cached_full_map:
-        return Response(cached_full_map, mimetype='text/html')
+    # Create cache key based on filters (shared by all workers)
+    full_map_key = cache_key('full_map', data_version, cities, companies, categories, work_modes, search)
     
+    # Concurrent requests for the same filters wait for one render
+    html = cached_value(full_map_key, lambda: render_full_map(cities, companies, categories, work_modes, search))
+    return Response(html, mimetype='text/html')
+
+def render_full_map(cities, companies, categories, work_modes, search):
+    """Render the standalone Folium map HTML for the given filters"""
+    # Imported on first use: folium is the slowest import in the app and only this route
+    # and the interactive map mode need it
+    import folium
+    from folium.plugins import FastMarkerCluster
     # Generate full map with all jobs
     m = folium.Map(
         location=[26.8, 30.8],
@@ -123,9 +125,4 @@ def full_map():
     ).add_to(m)
     
     # Generate HTML
-    html = m.get_root().render()
-    
-    # Cache for 10 minutes
-    cache.set('full_map_html', html, timeout=600)
-    
-    return Response(html, mimetype='text/html')
+    return m.get_root().render()
@@ -0,0 +1,155 @@
+"""
+Offline Egyptian gazetteer: coordinates for job locations without network access.
+
+egypt_gazetteer.csv lists governorates, cities and districts once each, with
+their governorate, coordinates and '|'-separated spelling variants (Wuzzuf
+transliterations such as 'Bourj Alarab' or 'Sharm Alsheikh', Arabic-style
+'El'/'Al' forms, older English names). Every name and alias becomes a
+normalized key, so case, accents, punctuation, 'El'/'Al' articles and a
+trailing 'City' don't matter.
+
+Gazetteer.resolve() geocodes In_City / City pairs in one pass over their
+distinct combinations, using merges against the key table:
+
+    1. In_City as a district of the job's governorate (the resolved City),
+       or as a city / governorate anywhere ('10th of Ramadan' listed under Cairo)
+    2. otherwise City itself (governorate or city coordinates)
+
+Keys with no exact match fall back to the closest key (difflib) above a
+similarity cutoff. District names are only trusted within their governorate:
+'Downtown' under Kafr El Sheikh resolves to Kafr El Sheikh, not Cairo.
+"""
+import difflib
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+GAZETTEER_PATH = os.path.join(
+    sys._MEIPASS if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__)),
+    'egypt_gazetteer.csv')
+FUZZY_CUTOFF = 0.85
+
+# Preferred kind when a key names several places (e.g. 'Giza' the governorate and district)
+KIND_ORDER = {'district': 0, 'city': 1, 'governorate': 2}
+
+
+def normalize_place(values):
+    """Lookup keys for place names: ASCII, lower case, punctuation, 'el'/'al' and 'city'/'governorate' dropped."""
+    keys = pd.Series(values, dtype=object).fillna('').astype(str)
+    keys = keys.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii').str.lower()
+    keys = keys.str.replace(r'[^a-z0-9]+', ' ', regex=True)
+    keys = keys.str.replace(r'\b(?:el|al|city|governorate)\b', ' ', regex=True)
+    return keys.str.split().str.join(' ')
+
+
+class Gazetteer:
+    """Normalized key table over the gazetteer file, with a vectorized resolver."""
+
+    def __init__(self, path=GAZETTEER_PATH, fuzzy_cutoff=FUZZY_CUTOFF):
+        places = pd.read_csv(path, keep_default_na=False)
+        places['names'] = (places['name'] + '|' + places['aliases']).str.split('|')
+        keys = places.explode('names')
+        keys = keys[keys['names'].str.strip() != '']
+        keys = keys.assign(key=normalize_place(keys['names']).to_numpy(),
+                           kind_rank=keys['kind'].map(KIND_ORDER).to_numpy())
+        keys = keys[keys['key'] != ''].sort_values(['key', 'kind_rank'], kind='stable')
+        self.places = places.drop(columns='names')
+        self.keys = keys.drop_duplicates(['key', 'governorate'])[
+            ['key', 'name', 'kind', 'kind_rank', 'governorate', 'lat', 'lon']].reset_index(drop=True)
+        self._key_list = self.keys['key'].unique().tolist()
+        self._key_set = set(self._key_list)
+        self.fuzzy_cutoff = fuzzy_cutoff
+
+    def match_keys(self, values):
+        """Gazetteer key for each value: its normalized form when known, else the closest key (or None)."""
+        keys = normalize_place(values)
+        matched = {}
+        for key in pd.unique(keys):
+            if key in self._key_set or not key:
+                matched[key] = key or None
+            else:
+                close = difflib.get_close_matches(key, self._key_list, n=1, cutoff=self.fuzzy_cutoff)
+                matched[key] = close[0] if close else None
+        return keys.map(matched), keys
+
+    def resolve(self, in_city, city):
+        """
+        DataFrame aligned with the inputs: lat, lon, place (gazetteer name), kind (the
+        place's: district, city or governorate) and match (the column it came from:
+        'in_city', 'city', with a '_fuzzy' suffix for spelling fallbacks, or None).
+        """
+        pairs = pd.DataFrame({'in_city': pd.Series(in_city, dtype=object).reset_index(drop=True),
+                              'city': pd.Series(city, dtype=object).reset_index(drop=True)}).fillna('')
+        combos = pairs.drop_duplicates().reset_index(drop=True)
+
+        # City: governorate or city coordinates, and the governorate the In_City must belong to
+        city_key, city_norm = self.match_keys(combos['city'])
+        combos['city_key'] = city_key.to_numpy()
+        city_fuzzy = (city_key != city_norm).to_numpy()
+        city_hits = (combos.reset_index().merge(self.keys[self.keys['kind'] != 'district'],
+                                                left_on='city_key', right_on='key')
+                     .sort_values(['index', 'kind_rank'], ascending=[True, False], kind='stable')
+                     .drop_duplicates('index').set_index('index'))
+        combos['governorate'] = city_hits['governorate']
+
+        # In_City: same-governorate places first, other governorates only for cities / governorates
+        in_city_key, in_city_norm = self.match_keys(combos['in_city'])
+        combos['in_city_key'] = in_city_key.to_numpy()
+        in_city_fuzzy = (in_city_key != in_city_norm).to_numpy()
+        candidates = combos.reset_index().merge(self.keys, left_on='in_city_key', right_on='key',
+                                                suffixes=('', '_place'))
+        candidates['same'] = candidates['governorate_place'] == candidates['governorate']
+        candidates = candidates[candidates['same'] | (candidates['kind'] != 'district')]
+        in_city_hits = (candidates.sort_values(['index', 'same', 'kind_rank'], ascending=[True, False, True], kind='stable')
+                        .drop_duplicates('index').set_index('index'))
+
+        resolved = pd.DataFrame(index=combos.index, columns=['lat', 'lon', 'place', 'kind', 'match'], dtype=object)
+        for hits, fuzzy, source in ((city_hits, city_fuzzy, 'city'), (in_city_hits, in_city_fuzzy, 'in_city')):
+            rows = hits.index.to_numpy()
+            resolved.loc[rows, ['lat', 'lon', 'place', 'kind']] = hits[['lat', 'lon', 'name', 'kind']].to_numpy()
+            resolved.loc[rows, 'match'] = np.where(fuzzy[rows], f'{source}_fuzzy', source)
+        resolved[['lat', 'lon']] = resolved[['lat', 'lon']].astype(float)
+
+        out = pairs.merge(pd.concat([combos[['in_city', 'city']], resolved], axis=1),
+                          on=['in_city', 'city'], how='left')
+        return out[['lat', 'lon', 'place', 'kind', 'match']]
+
+
+def spread_points(lat, lon, keys, radius, layout='jitter'):
+    """
+    Offsets co-located points deterministically from a stable per-job key, so every
+    worker and restart places a job at the same spot (shareable map caches and ETags).
+
+    'jitter': uniform in +-radius from a hash of the key.
+    'spiral': jobs at the same coordinates on a sunflower spiral of the given radius,
+              ordered by key hash (an even spread without overlapping markers).
+    """
+    index = lat.index if isinstance(lat, pd.Series) else None
+    lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+    # SipHash with pandas' fixed key: the same on every machine and process
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(keys).reset_index(drop=True), index=False).to_numpy()
+    if layout == 'spiral':
+        points = pd.DataFrame({'lat': lat.round(5), 'lon': lon.round(5), 'hash': hashes})
+        order = points.sort_values(['lat', 'lon', 'hash'], kind='stable')
+        rank = order.groupby(['lat', 'lon'], dropna=False).cumcount().reindex(points.index).to_numpy()
+        size = points.groupby(['lat', 'lon'], dropna=False)['hash'].transform('size').to_numpy()
+        distance = radius * np.sqrt(rank / size)
+        angle = rank * np.pi * (3 - np.sqrt(5))  # golden angle
+        lat, lon = lat + distance * np.sin(angle), lon + distance * np.cos(angle)
+    else:
+        lat = lat + radius * (2 * (hashes & 0xFFFFFFFF) / 2 ** 32 - 1)
+        lon = lon + radius * (2 * (hashes >> np.uint64(32)) / 2 ** 32 - 1)
+    return pd.Series(lat, index=index), pd.Series(lon, index=index)
+
+
+_gazetteer = None
+
+
+def egypt_gazetteer():
+    """The bundled gazetteer, read once."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
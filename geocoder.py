@@ -0,0 +1,253 @@
+"""
+Batch Geocoder
+Geocodes the places the offline gazetteer (egypt_gazetteer.csv) can't resolve,
+ahead of time, into a SQLite cache that data_loader reads at startup. The app
+itself never calls a geocoding service.
+
+Requests go through an asyncio client (requests sessions on worker threads,
+at most --concurrency in flight) paced by a token bucket, so slow responses
+overlap without exceeding the service's rate limit (Nominatim: 1 request/s).
+Every result is committed as it arrives with a single upsert, so an
+interrupted run keeps what it fetched and the app never reads a half-written
+cache. Places the service doesn't know are cached as misses and retried after
+--retry-misses days; transient failures (timeouts, 429, 5xx) are not cached.
+
+Run:
+    python geocoder.py                       # places in the data the gazetteer can't resolve
+    python geocoder.py --all                 # every distinct City
+    python geocoder.py "Siwa" "Abu Simbel"   # specific places
+    python geocoder.py --import-json geocode_cache.json   # carry over the old JSON cache
+
+Local stand-in for Nominatim (answers from the gazetteer, optional latency):
+    python geocoder.py --serve 8765 --delay-ms 300
+    python geocoder.py --all --url http://127.0.0.1:8765/search --rate 20 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+GEOCODE_CACHE_PATH = os.environ.get('GEOCODE_CACHE_PATH', os.path.join(ROOT, 'geocode_cache.sqlite'))
+NOMINATIM_URL = 'https://nominatim.openstreetmap.org/search'
+USER_AGENT = 'JobsDashboard/1.0 (contact@example.com)'
+
+
+class GeocodeCache:
+    """place -> coordinates (or a cached miss) in a SQLite file."""
+
+    def __init__(self, path=GEOCODE_CACHE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS places (
+                place TEXT PRIMARY KEY,
+                lat REAL,
+                lon REAL,
+                found INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+
+    def put(self, place, lat=None, lon=None, source='nominatim'):
+        """Record a hit (lat/lon) or a miss (None) for place, replacing any earlier result."""
+        self.conn.execute(
+            "INSERT INTO places (place, lat, lon, found, source, updated) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(place) DO UPDATE SET lat = excluded.lat, lon = excluded.lon, found = excluded.found, "
+            "source = excluded.source, updated = excluded.updated",
+            (place, lat, lon, int(lat is not None), source, time.time())
+        )
+
+    def pending(self, places, retry_misses_days=30):
+        """The places without a result yet, or with a miss older than retry_misses_days."""
+        cutoff = time.time() - retry_misses_days * 86400
+        done = {place for place, found, updated in self.conn.execute("SELECT place, found, updated FROM places")
+                if found or updated > cutoff}
+        return [place for place in places if place not in done]
+
+    def close(self):
+        self.conn.close()
+
+
+def read_geocode_cache(path=GEOCODE_CACHE_PATH):
+    """{place: (lat, lon)} of the cached hits, read-only ({} when there is no cache yet)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True, timeout=10)
+        try:
+            return {place: (lat, lon) for place, lat, lon in
+                    conn.execute("SELECT place, lat, lon FROM places WHERE found = 1")}
+        finally:
+            conn.close()
+    except sqlite3.Error as exc:
+        print(f"[!] Could not read geocode cache {path}: {exc}")
+        return {}
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, in bursts of at most `capacity`."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def geocode_places(places, cache, url=NOMINATIM_URL, rate=1.0, burst=1, concurrency=4, timeout=10):
+    """Geocode places into cache; returns {'found': n, 'missing': n, 'failed': n}."""
+    import requests
+
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    bucket = TokenBucket(rate, burst)
+    slots = asyncio.Semaphore(concurrency)
+    counts = {'found': 0, 'missing': 0, 'failed': 0}
+
+    async def geocode(place):
+        async with slots:
+            await bucket.acquire()
+            params = {'q': f'{place}, Egypt', 'format': 'json', 'limit': 1, 'countrycodes': 'eg'}
+            try:
+                resp = await asyncio.to_thread(session.get, url, params=params, timeout=timeout)
+                resp.raise_for_status()
+                results = resp.json()
+            except (requests.RequestException, ValueError) as exc:
+                counts['failed'] += 1
+                print(f"[!] {place}: {exc}")
+                return
+        if results:
+            cache.put(place, float(results[0]['lat']), float(results[0]['lon']))
+            counts['found'] += 1
+        else:
+            cache.put(place)
+            counts['missing'] += 1
+
+    try:
+        await asyncio.gather(*(geocode(place) for place in places))
+    finally:
+        session.close()
+    return counts
+
+
+def unresolved_places(include_all=False):
+    """Distinct City values of the loaded data the gazetteer can't place (all of them with include_all)."""
+    os.environ['WARMUP'] = '0'
+    import pandas as pd
+    from data_loader import df
+    from gazetteer import egypt_gazetteer
+
+    if 'City' not in df.columns:
+        return []
+    cities = df['City'].astype(str)
+    if not include_all:
+        in_city = df['In_City'] if 'In_City' in df.columns else pd.Series('', index=df.index)
+        located = egypt_gazetteer().resolve(in_city, cities)
+        cities = cities[located['match'].isna().to_numpy()]
+    return sorted(place for place in cities.str.strip().unique() if place and place.lower() != 'nan')
+
+
+def import_json(cache, path):
+    """Copy the hits of an old geocode_cache.json ({place: {'lat', 'lon'}}) into the SQLite cache."""
+    with open(path, 'r', encoding='utf-8') as fh:
+        entries = json.load(fh)
+    for place, coords in entries.items():
+        if coords and coords.get('lat') is not None:
+            cache.put(place, float(coords['lat']), float(coords['lon']), source='json')
+    return len(entries)
+
+
+def stand_in_server(port=8765, delay_ms=0):
+    """A local Nominatim /search look-alike answering from the gazetteer (started in a thread)."""
+    from gazetteer import egypt_gazetteer
+
+    gazetteer = egypt_gazetteer()
+    places = gazetteer.keys.drop_duplicates('key').set_index('key')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+            place = query[:-len(', Egypt')] if query.endswith(', Egypt') else query
+            time.sleep(delay_ms / 1000)
+            key = gazetteer.match_keys([place])[0].iloc[0]
+            results = []
+            if key is not None:
+                row = places.loc[key]
+                results.append({'lat': str(row['lat']), 'lon': str(row['lon']), 'display_name': row['name']})
+            body = json.dumps(results).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+parser.add_argument('places', nargs='*', help='places to geocode (default: the ones the gazetteer cannot resolve)')
+parser.add_argument('--all', action='store_true', help='geocode every distinct City in the data')
+parser.add_argument('--cache', default=GEOCODE_CACHE_PATH, help='SQLite cache file (GEOCODE_CACHE_PATH)')
+parser.add_argument('--url', default=NOMINATIM_URL, help='search endpoint (Nominatim API)')
+parser.add_argument('--rate', type=float, default=1.0, help='requests per second')
+parser.add_argument('--burst', type=int, default=1, help='requests allowed back to back')
+parser.add_argument('--concurrency', type=int, default=4, help='requests in flight')
+parser.add_argument('--retry-misses', type=float, default=30, help='days before places not found are retried')
+parser.add_argument('--force', action='store_true', help='geocode places that are already cached')
+parser.add_argument('--import-json', metavar='PATH', help='import an old geocode_cache.json and exit')
+parser.add_argument('--serve', type=int, metavar='PORT', help='run the local stand-in server')
+parser.add_argument('--delay-ms', type=float, default=0, help='stand-in server latency per request')
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+
+    if args.serve:
+        server = stand_in_server(args.serve, args.delay_ms)
+        print(f"[+] Stand-in geocoder on http://127.0.0.1:{args.serve}/search (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        sys.exit(0)
+
+    cache = GeocodeCache(args.cache)
+    if args.import_json:
+        print(f"[+] Imported {import_json(cache, args.import_json)} entries from {args.import_json} into {args.cache}")
+        sys.exit(0)
+
+    places = args.places or unresolved_places(args.all)
+    todo = places if args.force else cache.pending(places, args.retry_misses)
+    print(f"[+] {len(places)} places, {len(todo)} to geocode at {args.rate:g}/s via {args.url}")
+    start = time.perf_counter()
+    counts = asyncio.run(geocode_places(todo, cache, args.url, args.rate, args.burst, args.concurrency)) if todo else {}
+    cache.close()
+    print(f"[+] {counts.get('found', 0)} found, {counts.get('missing', 0)} not found (cached as misses), "
+          f"{counts.get('failed', 0)} failed in {time.perf_counter() - start:.1f}s -> {args.cache}")
@@ -1,4 +1,5 @@
 # Gunicorn configuration for production deployment
+import gc
 import multiprocessing
 import os
 
@@ -7,8 +8,17 @@ bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
 backlog = 2048
 
 # Worker processes
-workers = 1  # Only 1 worker for 256MB RAM (was 2)
-worker_class = 'sync'
+# Only 1 worker for 256MB RAM (fly.toml memory_mb). The memory-mapped snapshot shares the numeric
+# columns, but string columns are rebuilt as objects in every process, so each extra worker costs
+# ~150 MB under load. Raise GUNICORN_WORKERS only on a bigger VM, once /memory shows it fits.
+workers = int(os.getenv('GUNICORN_WORKERS', '1'))
+# Threaded workers: a slow render (e.g. /full-map) no longer blocks every other session.
+# The dataframes and indexes are read-only and cache fills are serialized per key
+# (shared_cache.cached_value), but each busy thread holds its own filtered copies and figures:
+# 2 threads fit the 256MB budget (worker peak RSS 250 MB vs 268 MB with 4, same throughput).
+# GUNICORN_WORKER_CLASS=sync restores one request per worker.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '2'))
 worker_connections = 1000
 timeout = 120
 keepalive = 5
@@ -38,3 +48,28 @@ tmp_upload_dir = None
 # SSL (if needed)
 keyfile = None
 certfile = None
+
+
+# Server hooks
+def pre_fork(server, worker):
+    # Move everything the master loaded into the permanent GC generation: collections in the
+    # workers then never touch (and un-share) those objects' pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # FIGURE_EXECUTOR=process: fork the figure pool while this worker is still single-threaded
+    # (forking after the gthread request threads start can deadlock the children)
+    from parallel_figures import start_executor
+    start_executor()
+
+
+def post_worker_init(worker):
+    from dataset_snapshot import process_memory
+    from warmup import start_warmup
+    # Warm the default dashboard state in the background (GET /ready reports when done)
+    start_warmup()
+    usage = process_memory()
+    if usage:
+        worker.log.info(f"[+] Worker {worker.pid} memory: RSS {usage['rss_mb']} MB, PSS {usage['pss_mb']} MB, "
+                        f"private {usage['private_clean_mb'] + usage['private_dirty_mb']:.1f} MB")
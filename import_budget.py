@@ -0,0 +1,89 @@
+"""
+Import-time budget report (an in-app `python -X importtime`).
+
+With IMPORT_TIMES=1, index.py installs an import hook before loading anything
+else. Every module imported from then on is timed, both cumulative (with the
+imports it triggers) and self (without them). Once the app is assembled, the
+slowest imports are printed, and modules over the per-module budget are
+flagged. The app's own top-level imports are also recorded as `import:<module>`
+phases in the startup report (GET /ready).
+
+    IMPORT_TIMES=1 python index.py
+    IMPORT_TIMES=1 IMPORT_BUDGET_MS=50 python -c "import index"
+
+Heavy, rarely used dependencies (folium for the interactive and full-page
+maps) are imported where they are used, so they stay out of this report.
+"""
+import builtins
+import importlib.util
+import os
+import sys
+import time
+
+from startup_report import record
+
+IMPORT_TIMES_ENABLED = os.environ.get('IMPORT_TIMES', '0').lower() in ('1', 'true', 'yes')
+IMPORT_BUDGET_MS = float(os.environ.get('IMPORT_BUDGET_MS', '100'))
+
+_timings = {}  # module -> (cumulative ms, self ms, nesting depth), in import order
+_nested = []  # per import in progress: ms spent in the imports it triggered
+_original_import = None
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    module = name
+    if level:
+        try:
+            module = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+        except (ImportError, ValueError):
+            pass
+    if module in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    start = time.perf_counter()
+    _nested.append(0.0)
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        nested = _nested.pop()
+        if _nested:
+            _nested[-1] += elapsed
+        _timings.setdefault(module, (elapsed, elapsed - nested, len(_nested)))
+
+
+def install():
+    """Start timing imports (no-op unless IMPORT_TIMES is set)."""
+    global _original_import
+    if IMPORT_TIMES_ENABLED and _original_import is None:
+        _original_import = builtins.__import__
+        builtins.__import__ = _timed_import
+
+
+def uninstall():
+    global _original_import
+    if _original_import is not None:
+        builtins.__import__ = _original_import
+        _original_import = None
+
+
+def finish(top=20):
+    """Stop timing, record the top-level imports in the startup report and print the slowest."""
+    if _original_import is None:
+        return
+    uninstall()
+    for module, (cumulative, _, depth) in _timings.items():
+        if depth == 0:
+            record(f'import:{module}', cumulative)
+    print_report(top)
+
+
+def print_report(top=20):
+    total = sum(cumulative for cumulative, _, depth in _timings.values() if depth == 0)
+    print(f"[+] Import times: {len(_timings)} modules, {total:.0f} ms "
+          f"(budget {IMPORT_BUDGET_MS:.0f} ms per module)")
+    print(f"    {'cumulative':>10}  {'self':>8}  module")
+    slowest = sorted(_timings.items(), key=lambda item: -item[1][0])[:top]
+    for module, (cumulative, own, depth) in slowest:
+        flag = '[!]' if cumulative > IMPORT_BUDGET_MS else '   '
+        print(f"{flag} {cumulative:>8.1f}ms  {own:>6.1f}ms  {'  ' * depth}{module}")
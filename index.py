@@ -1,7 +1,12 @@
+# Optional import-time report (IMPORT_TIMES=1): the hook must be in place before anything loads
+import import_budget
+import_budget.install()
+
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 from app_instance import app, server
 from layouts.sidebar import create_sidebar
+from startup_report import timed
 
 # Import callbacks to register them
 import callbacks.general_callbacks
@@ -16,8 +21,16 @@ import callbacks.clientside_callbacks
 
 # Import Flask routes
 import full_map_route
+import status_routes
+
+# Per-callback timing / payload / cache metrics (GET /metrics), after every callback is registered
+from instrumentation import instrument_app
+instrument_app(app)
 
 # Define the app layout
+with timed('build_layout:sidebar'):
+    sidebar = create_sidebar()
+
 app.layout = html.Div([
     dcc.Location(id='url', refresh=False),
     dcc.Store(id='theme-store', data='light', storage_type='local'),
@@ -80,14 +93,18 @@ app.layout = html.Div([
         html.Div(id='sidebar-backdrop', className='sidebar-backdrop'),
         
         # Left Filter Sidebar
-        create_sidebar(),
+        sidebar,
         
         # Page Content
         html.Div(id='page-content', className='content-container')
     ])
 ])
 
+import_budget.finish()
+
 if __name__ == '__main__':
+    from warmup import start_warmup
+    start_warmup()
     # new Dash versions use app.run()
     try:
         app.run(debug=True, host='127.0.0.1', port=8050)
@@ -0,0 +1,274 @@
+"""
+Per-callback latency, payload and cache instrumentation.
+
+instrument_app(app) wraps every server-side Dash callback registered in
+app.callback_map (call it after all callback modules are imported) and times
+the Flask routes in INSTRUMENTED_ROUTES. For each callback / route it records:
+
+    duration        histogram of execution time (callback body, or whole request for routes)
+    payload bytes   histogram of the JSON/HTML response size
+    input values    histogram of the number of selected values per input
+                    (list length; 0 for empty/None, 1 for scalars)
+    cache lookups   shared cache hits / misses made while it ran (shared_cache.cached_value)
+    errors          exceptions raised
+
+GET /metrics serves them in the Prometheus text format together with the shared
+cache and single-flight counters. Metrics are kept per worker process; with
+several gunicorn workers each scrape sees the worker that answered (the cache
+counters come from the shared cache and cover all workers).
+
+_dash-update-component responses also carry a Server-Timing header, e.g.
+    Server-Timing: callback;dur=512.3;desc="update_overview", cache;desc="hits=1 misses=0", total;dur=530.1
+so the browser devtools show where the time went.
+
+Callbacks can also be profiled on demand with cProfile, see profiling.py, and
+requests slower than SLOW_REQUEST_MS are logged for replay, see slow_requests.py.
+"""
+import functools
+import threading
+import time
+
+from flask import Response, g, request
+
+import profiling
+import slow_requests
+from profiling import profiler
+from shared_cache import cache_lookups
+
+# Flask routes timed like callbacks: path -> metric label
+INSTRUMENTED_ROUTES = {'/full-map': 'full_map'}
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PAYLOAD_BUCKETS = (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 20_000_000)
+CARDINALITY_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Thread-safe in-process histograms and counters keyed by (metric name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            histograms = {key: (h.buckets, list(h.counts), h.sum, h.count) for key, h in self.histograms.items()}
+            return histograms, dict(self.counters)
+
+
+metrics = Metrics()
+
+HELP = {
+    'ecm_callback_duration_seconds': ('histogram', 'Dash callback / route execution time'),
+    'ecm_callback_payload_bytes': ('histogram', 'Response payload size'),
+    'ecm_callback_input_values': ('histogram', 'Number of selected values per callback input'),
+    'ecm_callback_cache_lookups_total': ('counter', 'Shared cache lookups made by a callback / route'),
+    'ecm_callback_errors_total': ('counter', 'Exceptions raised by a callback / route'),
+    'ecm_cache_requests_total': ('counter', 'Shared cache lookups per namespace (all workers)'),
+    'ecm_cache_entries': ('gauge', 'Entries stored per cache namespace'),
+    'ecm_cache_bytes': ('gauge', 'Bytes stored per cache namespace'),
+    'ecm_singleflight_total': ('counter', 'Single-flight events per namespace in this worker'),
+    'ecm_process_memory_bytes': ('gauge', 'Memory of this worker process'),
+}
+
+
+def input_cardinality(value):
+    if value is None or value == '' or value == []:
+        return 0
+    if isinstance(value, (list, tuple)):
+        return len(value)
+    return 1
+
+
+def _start_lookups():
+    return cache_lookups.set({'hits': 0, 'misses': 0})
+
+
+def _finish_lookups(label, token):
+    lookups = cache_lookups.get()
+    cache_lookups.reset(token)
+    for counter, result in (('hits', 'hit'), ('misses', 'miss')):
+        if lookups[counter]:
+            metrics.inc('ecm_callback_cache_lookups_total', {'callback': label, 'result': result}, lookups[counter])
+    return lookups
+
+
+def _instrument_callback(func, label, input_names):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for name, value in zip(input_names, args):
+            metrics.observe('ecm_callback_input_values', {'callback': label, 'input': name}, input_cardinality(value), CARDINALITY_BUCKETS)
+        token = _start_lookups()
+        start = time.perf_counter()
+        try:
+            return profiler.call(label, input_names, func, args, kwargs)
+        except Exception:
+            metrics.inc('ecm_callback_errors_total', {'callback': label})
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            lookups = _finish_lookups(label, token)
+            metrics.observe('ecm_callback_duration_seconds', {'callback': label}, duration, DURATION_BUCKETS)
+            # Picked up by after_request for the payload size and Server-Timing header
+            g.ecm_callback = (label, duration, lookups)
+    return wrapper
+
+
+def _before_request():
+    g.ecm_request_start = time.perf_counter()
+    label = INSTRUMENTED_ROUTES.get(request.path)
+    if label:
+        g.ecm_route = (label, _start_lookups())
+
+
+def _payload_size(response):
+    if response.direct_passthrough:
+        return None
+    return response.content_length if response.content_length is not None else len(response.get_data())
+
+
+def _after_request(response):
+    start = g.pop('ecm_request_start', None)
+    total = time.perf_counter() - start if start is not None else None
+
+    route = g.pop('ecm_route', None)
+    if route:
+        label, token = route
+        _finish_lookups(label, token)
+        if response.status_code >= 500:
+            metrics.inc('ecm_callback_errors_total', {'callback': label})
+        if total is not None:
+            metrics.observe('ecm_callback_duration_seconds', {'callback': label}, total, DURATION_BUCKETS)
+        size = _payload_size(response)
+        if size is not None:
+            metrics.observe('ecm_callback_payload_bytes', {'callback': label}, size, PAYLOAD_BUCKETS)
+
+    callback = g.pop('ecm_callback', None)
+    is_update = request.path.endswith('_dash-update-component')
+    if total is not None and (route or is_update) and slow_requests.is_slow(total * 1000):
+        slow_requests.record(route[0] if route else (callback[0] if callback else None), total * 1000,
+                             callback[1] * 1000 if callback else None, response.status_code, request.method,
+                             request.path, request.query_string.decode('latin-1'), request.get_data())
+
+    if callback and is_update:
+        label, duration, lookups = callback
+        size = _payload_size(response)
+        if size is not None:
+            metrics.observe('ecm_callback_payload_bytes', {'callback': label}, size, PAYLOAD_BUCKETS)
+        timing = [f'callback;dur={duration * 1000:.1f};desc="{label}"',
+                  f'cache;desc="hits={lookups["hits"]} misses={lookups["misses"]}"']
+        if total is not None:
+            timing.append(f'total;dur={total * 1000:.1f}')
+        response.headers['Server-Timing'] = ', '.join(timing)
+    return response
+
+
+def _labels(labels):
+    return ','.join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels)
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format."""
+    from app_instance import cache
+    from singleflight import flights
+    from dataset_snapshot import process_memory
+
+    histograms, counters = metrics.snapshot()
+
+    # Shared cache / single-flight / memory figures, as counters and gauges
+    gauges = {}
+    backend = cache.cache
+    for namespace, stats in (backend.stats() if hasattr(backend, 'stats') else {}).items():
+        counters[('ecm_cache_requests_total', (('namespace', namespace), ('result', 'hit')))] = stats.get('hits', 0)
+        counters[('ecm_cache_requests_total', (('namespace', namespace), ('result', 'miss')))] = stats.get('misses', 0)
+        gauges[('ecm_cache_entries', (('namespace', namespace),))] = stats.get('entries', 0)
+        gauges[('ecm_cache_bytes', (('namespace', namespace),))] = stats.get('bytes', 0) or 0
+    for namespace, stats in flights.stats().items():
+        for event in ('leaders', 'computed', 'coalesced', 'cross_worker_waits'):
+            counters[('ecm_singleflight_total', (('event', event), ('namespace', namespace)))] = stats[event]
+    for kind, mb in process_memory().items():
+        gauges[('ecm_process_memory_bytes', (('kind', kind[:-3]),))] = int(mb * 1024 * 1024)
+
+    by_name = {}
+    for (name, labels), value in histograms.items():
+        by_name.setdefault(name, []).append((labels, value))
+    for (name, labels), value in list(counters.items()) + list(gauges.items()):
+        by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(by_name):
+        kind, help_text = HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(by_name[name]):
+            if kind == 'histogram':
+                buckets, counts, total, count = value
+                for bound, bucket_count in zip(buckets, counts):
+                    lines.append(f'{name}_bucket{{{_labels(labels + (("le", _number(bound)),))}}} {bucket_count}')
+                lines.append(f'{name}_bucket{{{_labels(labels + (("le", "+Inf"),))}}} {count}')
+                lines.append(f'{name}_sum{{{_labels(labels)}}} {total:.6f}')
+                lines.append(f'{name}_count{{{_labels(labels)}}} {count}')
+            else:
+                lines.append(f'{name}{{{_labels(labels)}}} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def instrument_app(app):
+    """Wrap every server-side callback and register the request hooks and /metrics route (once)."""
+    if getattr(app, '_ecm_instrumented', False):
+        return
+    app._ecm_instrumented = True
+
+    for spec in app.callback_map.values():
+        func = spec.get('callback')
+        if func is None:
+            continue
+        input_names = [f"{item['id']}.{item['property']}" for item in spec['inputs'] + spec['state']]
+        spec['callback'] = _instrument_callback(func, func.__name__, input_names)
+
+    server = app.server
+    server.before_request(_before_request)
+    server.after_request(_after_request)
+    profiling.install(server)
+
+    @server.route('/metrics')
+    def prometheus_metrics():
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+    print(f"[+] Instrumented {sum(1 for s in app.callback_map.values() if s.get('callback'))} callbacks, "
+          f"routes: {', '.join(INSTRUMENTED_ROUTES)}")
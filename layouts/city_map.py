@@ -1,37 +1,7 @@
 from dash import html, dcc, dash_table
 import dash_bootstrap_components as dbc
-from data_loader import df
-from datetime import datetime
-import pandas as pd
 
 def city_map_layout():
-    # safe option lists
-    companies = df['Company'].dropna().unique().tolist() if 'Company' in df.columns else []
-    categories = df['Category'].dropna().unique().tolist() if 'Category' in df.columns else []
-    # compute posted range if present (coerce to datetime to avoid mixed-type issues)
-    posted_series = pd.to_datetime(df['posted'], errors='coerce') if 'posted' in df.columns else pd.Series(dtype='datetime64[ns]')
-    has_posted = posted_series.notna().any()
-    if has_posted:
-        min_dt = posted_series.min()
-        max_dt = posted_series.max()
-        # ensure we have Timestamp objects
-        try:
-            min_ts = int(pd.Timestamp(min_dt).timestamp())
-            max_ts = int(pd.Timestamp(max_dt).timestamp())
-        except Exception:
-            # fallback to now if weird values
-            min_ts = int(datetime.now().timestamp()) - 7 * 24 * 3600
-            max_ts = int(datetime.now().timestamp())
-        val = [min_ts, max_ts]
-        marks = {min_ts: pd.Timestamp(min_dt).strftime('%Y-%m-%d'), max_ts: pd.Timestamp(max_dt).strftime('%Y-%m-%d')}
-    else:
-        # fallback to relative simple slider until posted becomes available
-        now_ts = int(datetime.now().timestamp())
-        min_ts = now_ts - 7 * 24 * 3600
-        max_ts = now_ts
-        val = [min_ts, max_ts]
-        marks = {min_ts: 'Start', max_ts: 'End'}
-
     return html.Div([
         html.H1([
             html.Span("Egypt", style={'color': '#111'}), 
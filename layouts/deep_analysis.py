@@ -1,14 +1,7 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-from data_loader import df
 
 def deep_analysis_layout():
-    # safe option lists
-    categories = df['Category'].dropna().unique().tolist() if 'Category' in df.columns else []
-    companies = df['Company'].dropna().unique().tolist() if 'Company' in df.columns else []
-    career_levels = df['Career Level'].dropna().unique().tolist() if 'Career Level' in df.columns else []
-    education_levels = df['education_level'].dropna().unique().tolist() if 'education_level' in df.columns else []
-
     return html.Div([
         html.H1("Deep Analysis", className='gradient-text', style={'textAlign': 'center', 'marginBottom': 30}),
         
@@ -1,18 +1,7 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-from data_loader import df
-from datetime import datetime
-import pandas as pd
 
 def overview_layout():
-    # Build safe option lists from df
-    companies = df['Company'].dropna().unique().tolist() if 'Company' in df.columns else []
-    cities = df['City'].dropna().unique().tolist() if 'City' in df.columns else []
-    categories = df['Category'].dropna().unique().tolist() if 'Category' in df.columns else []
-    work_modes = df['Work Mode'].dropna().unique().tolist() if 'Work Mode' in df.columns else []
-    employment_types = df['Employment Type'].dropna().unique().tolist() if 'Employment Type' in df.columns else []
-    education_levels = df['education_level'].dropna().unique().tolist() if 'education_level' in df.columns else []
-
     return html.Div([
         html.H1('Overview', className='gradient-text', style={'textAlign': 'center', 'marginBottom': 20}),
 
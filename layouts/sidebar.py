@@ -1,8 +1,60 @@
+import calendar
+
+import numpy as np
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-from data_loader import df
+from data_loader import df, company_options, in_city_options, filter_facets
+
+# Sidebar dropdowns whose options show live job counts (data_loader.filter_facets), by faceted column.
+# The counts follow the other filters the current page applies (general_callbacks.update_filter_options).
+FACET_FILTERS = {
+    'sidebar-company-filter': 'Company',
+    'sidebar-city-filter': 'City',
+    'sidebar-category-filter': 'Category',
+    'sidebar-work-mode-filter': 'Work Mode',
+    'sidebar-job-status-filter': 'job_status',
+    'sidebar-employment-type-filter': 'Employment Type',
+    'sidebar-career-level-filter': 'Career Level',
+    'sidebar-education-filter': 'education_level',
+    'sidebar-in-city-filter': 'In_City',
+    'sidebar-month-filter': 'month',
+}
+# Too many values to list: only the top prefix matches of the typed text are sent
+SEARCHABLE_FILTERS = {'sidebar-company-filter': company_options, 'sidebar-in-city-filter': in_city_options}
+
+
+def filter_options(filter_id, counts, selected=None, search_value=None, disable_empty=True):
+    """
+    Dropdown options labelled with their job counts. Options without jobs under the
+    current filters are greyed out, or left out of the searchable dropdowns, which list
+    the top matches by count instead. Selected values are always kept selectable.
+    disable_empty=False keeps every option available (a filter the current page ignores).
+    """
+    column = FACET_FILTERS[filter_id]
+    if column not in filter_facets.levels:
+        return []
+    levels = filter_facets.levels[column]
+    positions = filter_facets.positions[column]
+    selected = [value for value in (selected or []) if value in positions]
+    searchable = SEARCHABLE_FILTERS.get(filter_id)
+    if searchable is not None:
+        ranks = searchable.matches(search_value)  # ranks are level positions
+        if disable_empty:
+            ranks = ranks[counts[ranks] > 0]
+        ranks = ranks[np.argsort(-counts[ranks], kind='stable')][:searchable.top_k]
+        shown = [positions[value] for value in selected]
+        shown += [rank for rank in ranks.tolist() if rank not in shown]
+    else:
+        shown = range(len(levels))
+    label = (lambda value: calendar.month_name[value]) if column == 'month' else str
+    return [{'label': f"{label(levels[i])} ({counts[i]:,})", 'value': levels[i],
+             'disabled': disable_empty and bool(counts[i] == 0) and levels[i] not in selected}
+            for i in shown]
+
 
 def create_sidebar():
+    counts = filter_facets.counts({})
+    options = lambda filter_id: filter_options(filter_id, counts.get(FACET_FILTERS[filter_id]))
     return html.Div([
         html.H4("🔍 Filters"),
         
@@ -16,9 +68,10 @@ def create_sidebar():
                 html.Label("Company"),
                 dcc.Dropdown(
                     id='sidebar-company-filter',
-                    options=[{'label': c, 'value': c} for c in df['Company'].dropna().unique().tolist()] if 'Company' in df.columns else [],
+                    # Top companies only; typing searches all of them server-side (general_callbacks)
+                    options=options('sidebar-company-filter'),
                     multi=True,
-                    placeholder='Select Companies'
+                    placeholder='Search Companies'
                 )
             ], className='filter-group'),
             
@@ -27,7 +80,7 @@ def create_sidebar():
                 html.Label("City"),
                 dcc.Dropdown(
                     id='sidebar-city-filter',
-                    options=[{'label': c, 'value': c} for c in sorted(df['City'].dropna().unique().tolist())] if 'City' in df.columns else [],
+                    options=options('sidebar-city-filter'),
                     multi=True,
                     placeholder='Select Cities'
                 )
@@ -38,7 +91,7 @@ def create_sidebar():
                 html.Label("Category"),
                 dcc.Dropdown(
                     id='sidebar-category-filter',
-                    options=[{'label': c, 'value': c} for c in df['Category'].dropna().unique().tolist()] if 'Category' in df.columns else [],
+                    options=options('sidebar-category-filter'),
                     multi=True,
                     placeholder='Select Categories'
                 )
@@ -49,7 +102,7 @@ def create_sidebar():
                 html.Label("Work Mode"),
                 dcc.Dropdown(
                     id='sidebar-work-mode-filter',
-                    options=[{'label': w, 'value': w} for w in df['Work Mode'].dropna().unique().tolist()] if 'Work Mode' in df.columns else [],
+                    options=options('sidebar-work-mode-filter'),
                     multi=True,
                     placeholder='Select Work Mode'
                 )
@@ -60,7 +113,7 @@ def create_sidebar():
                 html.Label("Job Status"),
                 dcc.Dropdown(
                     id='sidebar-job-status-filter',
-                    options=[{'label': s, 'value': s} for s in df['job_status'].dropna().unique().tolist()] if 'job_status' in df.columns else [],
+                    options=options('sidebar-job-status-filter'),
                     multi=True,
                     value=['Open'], # Default to 'Open' per user request
                     placeholder='Select Job Status'
@@ -98,7 +151,7 @@ def create_sidebar():
                 html.Label("Employment Type"),
                 dcc.Dropdown(
                     id='sidebar-employment-type-filter',
-                    options=[{'label': e, 'value': e} for e in df['Employment Type'].dropna().unique().tolist()] if 'Employment Type' in df.columns else [],
+                    options=options('sidebar-employment-type-filter'),
                     multi=True,
                     placeholder='Select Employment Type'
                 )
@@ -109,7 +162,7 @@ def create_sidebar():
                 html.Label("Career Level"),
                 dcc.Dropdown(
                     id='sidebar-career-level-filter',
-                    options=[{'label': c, 'value': c} for c in df['Career Level'].dropna().unique().tolist()] if 'Career Level' in df.columns else [],
+                    options=options('sidebar-career-level-filter'),
                     multi=True,
                     placeholder='Select Career Level'
                 )
@@ -120,7 +173,7 @@ def create_sidebar():
                 html.Label("Education"),
                 dcc.Dropdown(
                     id='sidebar-education-filter',
-                    options=[{'label': e, 'value': e} for e in df['education_level'].dropna().unique().tolist()] if 'education_level' in df.columns else [],
+                    options=options('sidebar-education-filter'),
                     multi=True,
                     placeholder='Select Education'
                 )
@@ -131,9 +184,9 @@ def create_sidebar():
                 html.Label("Location within City"),
                 dcc.Dropdown(
                     id='sidebar-in-city-filter',
-                    options=[{'label': loc, 'value': loc} for loc in sorted(df['In_City'].dropna().unique().tolist())] if 'In_City' in df.columns and not df.empty else [],
+                    options=options('sidebar-in-city-filter'),
                     multi=True,
-                    placeholder='Select Locations'
+                    placeholder='Search Locations'
                 )
             ], className='filter-group'),
             
@@ -155,20 +208,7 @@ def create_sidebar():
                 html.Label("Month"),
                 dcc.Dropdown(
                     id='sidebar-month-filter',
-                    options=[
-                        {'label': 'January', 'value': 1},
-                        {'label': 'February', 'value': 2},
-                        {'label': 'March', 'value': 3},
-                        {'label': 'April', 'value': 4},
-                        {'label': 'May', 'value': 5},
-                        {'label': 'June', 'value': 6},
-                        {'label': 'July', 'value': 7},
-                        {'label': 'August', 'value': 8},
-                        {'label': 'September', 'value': 9},
-                        {'label': 'October', 'value': 10},
-                        {'label': 'November', 'value': 11},
-                        {'label': 'December', 'value': 12}
-                    ],
+                    options=options('sidebar-month-filter'),
                     multi=True,
                     placeholder='Select Months'
                 )
@@ -1,15 +1,7 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-from data_loader import df
-import pandas as pd
 
 def time_analysis_layout():
-    # safe option lists and posted range
-    companies = df['Company'].dropna().unique().tolist() if 'Company' in df.columns else []
-    categories = df['Category'].dropna().unique().tolist() if 'Category' in df.columns else []
-    posted_series = pd.to_datetime(df['posted'], errors='coerce') if 'posted' in df.columns else pd.Series(dtype='datetime64[ns]')
-    has_posted = posted_series.notna().any()
-
     return html.Div([
         html.H1("Time Analysis", className='gradient-text', style={'textAlign': 'center', 'marginBottom': 30}),
         
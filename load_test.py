@@ -0,0 +1,415 @@
+"""
+Dashboard Load Test
+Locust-style load test that drives real Dash callback traffic: every simulated
+user behaves like a browser session. It loads the layout and the dependency
+graph, renders a page and fires the callbacks the Dash renderer would fire, then
+repeatedly (with think time between actions) changes sidebar filters, searches,
+pages through the jobs table, clicks Next/Previous job, toggles the theme,
+switches pages and opens /full-map.
+
+Sessions keep the props the layouts and callback responses set and fire every
+server-side callback whose inputs changed, so chains follow naturally
+(theme toggle -> page callback, Next -> navigate_table -> update_city_map).
+
+Reports throughput, p50/p95/p99 latency and error rate per callback / route,
+for one or several user counts (to find how many users a VM can serve).
+
+Start the server under the profile to measure, e.g.
+    gunicorn -c gunicorn_config.py index:server                                # gthread
+    GUNICORN_WORKER_CLASS=sync gunicorn -c gunicorn_config.py index:server    # sync
+Run: python load_test.py [url] [users] [seconds]
+         [--users 5,10,20] [--spawn-rate 2] [--think 1,3] [--json results.json]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+parser = argparse.ArgumentParser(description='Dash callback load test')
+parser.add_argument('url', nargs='?', default='http://localhost:8080')
+parser.add_argument('sessions', nargs='?', type=int, default=8, help='concurrent users')
+parser.add_argument('duration', nargs='?', type=float, default=30, help='seconds per stage')
+parser.add_argument('--users', help='comma-separated user counts, one stage each (overrides sessions)')
+parser.add_argument('--spawn-rate', type=float, default=2.0, help='users started per second')
+parser.add_argument('--think', default='1,3', help='min,max seconds between a user\'s actions (0 = none)')
+parser.add_argument('--json', help='write per-stage results to this file')
+parser.add_argument('--seed', type=int, default=0)
+
+# Callbacks are named by their first output (id.property, or just id)
+CALLBACK_NAMES = {
+    'page-content': 'render_page_content',
+    'total-jobs-kpi': 'update_overview',
+    'city-total-jobs-kpi': 'update_city_map',
+    'top-companies-chart': 'update_deep_analysis',
+    'time-jobs-kpi': 'update_time_analysis',
+    'total-skills-kpi': 'update_skills_analysis',
+    'theme-store': 'toggle_theme',
+    'jobs-table': 'navigate_table',
+    'filter-page-1': 'toggle_filter_pages',
+    'sidebar-company-filter.value': 'clear_all_filters',
+    'sidebar-company-filter.options': 'update_filter_options',
+}
+
+PAGE_PATHS = ['/', '/city-map', '/deep-analysis', '/time-analysis', '/skills']
+
+# Sidebar filter changes a user picks from (input id -> value)
+FILTER_CHANGES = [
+    {'sidebar-work-mode-filter': ['Remote']},
+    {'sidebar-work-mode-filter': ['Hybrid', 'On-site']},
+    {'sidebar-category-filter': ['IT/Software Development']},
+    {'sidebar-city-filter': ['Cairo']},
+    {'sidebar-city-filter': ['Giza', 'Alexandria']},
+    {'sidebar-avg-exp-filter': [2, 5]},
+    {'sidebar-company-filter': None, 'sidebar-city-filter': None, 'sidebar-category-filter': None,
+     'sidebar-work-mode-filter': None},
+]
+SEARCH_TERMS = ['python', 'sales', 'accountant', 'engineer', 'marketing', '']
+
+# (action, weight): what a user does next
+ACTIONS = [
+    ('change_filter', 4),
+    ('search', 2),
+    ('switch_page', 2),
+    ('table_page', 2),
+    ('next_prev', 2),
+    ('toggle_theme', 1),
+    ('full_map', 1),
+]
+
+# Response props not kept in the session (large and never sent back)
+SKIPPED_PROPS = {'figure', 'tooltip_data'}
+MAX_CHAIN = 4
+
+
+def post(url, path, payload):
+    request = urllib.request.Request(url + path, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return response.status, response.read()
+
+
+def get(url, path):
+    with urllib.request.urlopen(url + path, timeout=120) as response:
+        return response.status, response.read()
+
+
+def parse_outputs(output):
+    """'..a.children...b.figure..' -> [{'id': 'a', 'property': 'children'}, ...]"""
+    parts = output[2:-2].split('...') if output.startswith('..') else [output]
+    outputs = []
+    for part in parts:
+        component_id, prop = part.rsplit('.', 1)
+        outputs.append({'id': component_id, 'property': prop})
+    return outputs
+
+
+def collect_props(node, props):
+    """{(id, prop): value} of every component with a string id in a serialized layout tree."""
+    if isinstance(node, list):
+        for child in node:
+            collect_props(child, props)
+    elif isinstance(node, dict):
+        if 'type' in node and 'props' in node:
+            component_props = node['props']
+            component_id = component_props.get('id')
+            for prop, value in component_props.items():
+                if isinstance(component_id, str) and prop != 'children':
+                    props[(component_id, prop)] = value
+                if isinstance(value, (dict, list)):
+                    collect_props(value, props)
+    return props
+
+
+class Callbacks:
+    """The app's server-side callbacks, from /_dash-dependencies (fetched once per test run)."""
+
+    def __init__(self, deps):
+        self.callbacks = []
+        for dep in deps:
+            if dep.get('clientside_function'):
+                continue
+            outputs = parse_outputs(dep['output'])
+            items = outputs + dep['inputs'] + dep['state']
+            if any(item['id'].startswith('{') for item in items):  # pattern-matching ids
+                continue
+            first = outputs[0]['id']
+            prop_id = f"{first}.{outputs[0]['property'].split('@')[0]}"
+            name = CALLBACK_NAMES.get(prop_id, CALLBACK_NAMES.get(first, prop_id))
+            self.callbacks.append({'name': name, 'dep': dep, 'outputs': outputs,
+                                   'initial': not dep.get('prevent_initial_call')})
+
+    def triggered_by(self, changed):
+        return [cb for cb in self.callbacks
+                if any((item['id'], item['property']) in changed for item in cb['dep']['inputs'])]
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []  # (name, ms, ok, bytes)
+
+    def add(self, name, ms, ok, size=0):
+        with self.lock:
+            self.samples.append((name, ms, ok, size))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+class Session:
+    """One simulated browser: its component props, current page and the callbacks it fires."""
+
+    def __init__(self, url, callbacks, results, rng):
+        self.url = url
+        self.callbacks = callbacks
+        self.results = results
+        self.rng = rng
+        self.layout_props = {}
+        self.page_props = {}
+
+    # -- state ---------------------------------------------------------------
+    def value(self, component_id, prop):
+        key = (component_id, prop)
+        return self.page_props.get(key, self.layout_props.get(key))
+
+    def mounted(self, component_id):
+        return any(key[0] == component_id for key in self.page_props) or \
+            any(key[0] == component_id for key in self.layout_props)
+
+    def set(self, component_id, prop, value):
+        target = self.page_props if any(key[0] == component_id for key in self.page_props) else self.layout_props
+        target[(component_id, prop)] = value
+
+    # -- requests ------------------------------------------------------------
+    def timed(self, name, call):
+        start = time.perf_counter()
+        try:
+            status, body = call()
+            ok = status in (200, 204)
+        except urllib.error.HTTPError as e:
+            status, body, ok = e.code, b'', e.code == 204
+        except (urllib.error.URLError, OSError):
+            status, body, ok = None, b'', False
+        self.results.add(name, (time.perf_counter() - start) * 1000, ok, len(body))
+        return status, body
+
+    def fire(self, callback, changed, depth=0):
+        """POST one callback like the renderer, apply its response, then fire what it triggered."""
+        dep = callback['dep']
+        with_value = lambda item: dict(item, value=self.value(item['id'], item['property']))
+        payload = {
+            'output': dep['output'],
+            'outputs': callback['outputs'] if len(callback['outputs']) > 1 else callback['outputs'][0],
+            'inputs': [with_value(item) for item in dep['inputs']],
+            'state': [with_value(item) for item in dep['state']],
+            'changedPropIds': [f'{cid}.{prop}' for cid, prop in changed],
+        }
+        status, body = self.timed(callback['name'], lambda: post(self.url, '/_dash-update-component', payload))
+        if status != 200 or not body:
+            return
+        try:
+            response = json.loads(body).get('response', {})
+        except ValueError:
+            return
+
+        updated = set()
+        for component_id, props in response.items():
+            for prop, value in props.items():
+                if component_id == 'page-content' and prop == 'children':
+                    # New page mounted: its components replace the previous page's
+                    self.page_props = collect_props(value, {})
+                    updated.add(('page-content', 'children'))
+                    self.fire_initial(depth)
+                elif prop not in SKIPPED_PROPS and prop != 'children':
+                    self.set(component_id, prop, value)
+                    updated.add((component_id, prop))
+        if updated and depth < MAX_CHAIN:
+            self.dispatch(updated, depth + 1)
+
+    def dispatch(self, changed, depth=0):
+        """Fire every mounted callback with one of the changed props as input."""
+        for callback in self.callbacks.triggered_by(changed):
+            if all(self.mounted(output['id']) for output in callback['outputs']):
+                self.fire(callback, [key for key in changed if any(
+                    (item['id'], item['property']) == key for item in callback['dep']['inputs'])], depth)
+
+    def fire_initial(self, depth=0):
+        """Initial calls of the callbacks whose outputs are on the newly rendered page."""
+        page_ids = {key[0] for key in self.page_props}
+        for callback in self.callbacks.callbacks:
+            if callback['initial'] and any(output['id'] in page_ids for output in callback['outputs']) \
+                    and all(self.mounted(output['id']) for output in callback['outputs']):
+                self.fire(callback, [], depth + 1)
+
+    # -- session -------------------------------------------------------------
+    def start(self):
+        """Open the app: index page, layout, dependencies, then the initial page render."""
+        self.timed('GET /', lambda: get(self.url, '/'))
+        status, body = self.timed('GET /_dash-layout', lambda: get(self.url, '/_dash-layout'))
+        self.layout_props = collect_props(json.loads(body), {}) if status == 200 else {}
+        self.timed('GET /_dash-dependencies', lambda: get(self.url, '/_dash-dependencies'))
+        path = self.rng.choice(PAGE_PATHS)
+        self.layout_props[('url', 'pathname')] = path
+        for callback in self.callbacks.callbacks:
+            if callback['initial'] and all(self.mounted(output['id']) for output in callback['outputs']):
+                self.fire(callback, [])
+
+    def change_filter(self):
+        changes = self.rng.choice(FILTER_CHANGES)
+        for component_id, value in changes.items():
+            self.set(component_id, 'value', value)
+        self.dispatch({(component_id, 'value') for component_id in changes})
+
+    def search(self):
+        self.set('global-search-bar', 'value', self.rng.choice(SEARCH_TERMS))
+        self.dispatch({('global-search-bar', 'value')})
+
+    def switch_page(self, path=None):
+        current = self.value('url', 'pathname')
+        path = path or self.rng.choice([p for p in PAGE_PATHS if p != current])
+        self.set('url', 'pathname', path)
+        self.dispatch({('url', 'pathname')})
+
+    def on_city_map(self):
+        if not self.mounted('jobs-table'):
+            self.switch_page('/city-map')
+        return self.mounted('jobs-table')
+
+    def table_page(self):
+        if not self.on_city_map():
+            return
+        pages = self.value('jobs-table', 'page_count') or 1
+        self.set('jobs-table', 'page_current', self.rng.randrange(max(1, min(pages, 20))))
+        self.dispatch({('jobs-table', 'page_current')})
+
+    def next_prev(self):
+        if not self.on_city_map():
+            return
+        button = self.rng.choice(['btn-next-job', 'btn-next-job', 'btn-prev-job'])
+        self.set(button, 'n_clicks', (self.value(button, 'n_clicks') or 0) + 1)
+        self.dispatch({(button, 'n_clicks')})
+
+    def toggle_theme(self):
+        self.set('theme-toggle-btn', 'n_clicks', (self.value('theme-toggle-btn', 'n_clicks') or 0) + 1)
+        self.dispatch({('theme-toggle-btn', 'n_clicks')})
+
+    def full_map(self):
+        query = [('city', c) for c in self.value('sidebar-city-filter', 'value') or []]
+        query += [('category', c) for c in self.value('sidebar-category-filter', 'value') or []]
+        query += [('work_mode', w) for w in self.value('sidebar-work-mode-filter', 'value') or []]
+        if self.value('global-search-bar', 'value'):
+            query.append(('search', self.value('global-search-bar', 'value')))
+        path = '/full-map' + (f'?{urllib.parse.urlencode(query)}' if query else '')
+        self.timed('GET /full-map', lambda: get(self.url, path))
+
+
+def user(url, callbacks, results, deadline, seed, think):
+    rng = random.Random(seed)
+    session = Session(url, callbacks, results, rng)
+    try:
+        session.start()
+    except Exception as e:
+        results.add('session start', 0, False)
+        print(f"[!] Session {seed} could not start: {e}")
+        return
+    names, weights = zip(*ACTIONS)
+    while time.time() < deadline:
+        if think[1] > 0:
+            time.sleep(rng.uniform(*think))
+            if time.time() >= deadline:
+                break
+        action = rng.choices(names, weights)[0]
+        try:
+            getattr(session, action)()
+        except Exception as e:
+            results.add(action, 0, False)
+            print(f"[!] {action} failed: {e}")
+
+
+def run_stage(url, callbacks, users, duration, spawn_rate, think, seed):
+    results = Results()
+    started = time.time()
+    deadline = started + duration
+    threads = []
+    for i in range(users):
+        thread = threading.Thread(target=user, args=(url, callbacks, results, deadline, seed + i, think), daemon=True)
+        thread.start()
+        threads.append(thread)
+        if spawn_rate > 0 and i < users - 1:
+            time.sleep(1 / spawn_rate)
+    while any(t.is_alive() for t in threads):
+        time.sleep(5)
+        with results.lock:
+            done = len(results.samples)
+            failed = sum(1 for sample in results.samples if not sample[2])
+        elapsed = time.time() - started
+        print(f"  {elapsed:>5.0f}s  {done:>6} requests  {done / elapsed:>6.2f} req/s  {failed} errors")
+    return results, time.time() - started
+
+
+def summarize(results, elapsed):
+    by_name = {}
+    for name, ms, ok, size in results.samples:
+        by_name.setdefault(name, []).append((ms, ok, size))
+    rows = {}
+    for name, samples in list(by_name.items()) + [('TOTAL', [s[1:] for s in results.samples])]:
+        latencies = [ms for ms, ok, _ in samples if ok]
+        errors = sum(1 for _, ok, _ in samples if not ok)
+        rows[name] = {
+            'requests': len(samples),
+            'errors': errors,
+            'error_pct': round(errors / len(samples) * 100, 2) if samples else 0.0,
+            'rps': round(len(samples) / elapsed, 2),
+            'p50_ms': round(percentile(latencies, 50), 1),
+            'p95_ms': round(percentile(latencies, 95), 1),
+            'p99_ms': round(percentile(latencies, 99), 1),
+            'avg_kb': round(sum(size for _, _, size in samples) / len(samples) / 1024, 1) if samples else 0.0,
+        }
+    return rows
+
+
+def print_table(rows):
+    print(f"\n{'Callback / route':<28}{'Reqs':>7}{'Err%':>7}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'KB':>9}")
+    for name, row in sorted(rows.items(), key=lambda item: (item[0] == 'TOTAL', -item[1]['requests'])):
+        print(f"{name:<28}{row['requests']:>7}{row['error_pct']:>7.1f}{row['rps']:>8.2f}"
+              f"{row['p50_ms']:>7.0f}ms{row['p95_ms']:>7.0f}ms{row['p99_ms']:>7.0f}ms{row['avg_kb']:>9.1f}")
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    url = args.url.rstrip('/')
+    stages = [int(u) for u in args.users.split(',')] if args.users else [args.sessions]
+    think = tuple(float(t) for t in args.think.split(',')) if ',' in args.think else (float(args.think),) * 2
+
+    _, body = get(url, '/_dash-dependencies')
+    callbacks = Callbacks(json.loads(body))
+    print(f"Target {url}: {len(callbacks.callbacks)} server callbacks, stages {stages} users x {args.duration:.0f}s, "
+          f"spawn {args.spawn_rate}/s, think {think[0]}-{think[1]}s")
+
+    summary = {}
+    for users in stages:
+        print(f"\n=== {users} users ===")
+        results, elapsed = run_stage(url, callbacks, users, args.duration, args.spawn_rate, think, args.seed)
+        rows = summarize(results, elapsed)
+        print_table(rows)
+        summary[users] = rows
+
+    if len(stages) > 1:
+        print(f"\n{'Users':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'Err%':>7}")
+        for users, rows in summary.items():
+            total = rows['TOTAL']
+            print(f"{users:>6}{total['rps']:>9.2f}{total['p50_ms']:>7.0f}ms{total['p95_ms']:>7.0f}ms"
+                  f"{total['p99_ms']:>7.0f}ms{total['error_pct']:>7.1f}")
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump(summary, fh, indent=1)
+        print(f"\nSaved results to {args.json}")
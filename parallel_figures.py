@@ -0,0 +1,108 @@
+"""
+Opt-in parallel figure building for the page callbacks.
+
+After filtering, the Overview, Deep Analysis and Skills callbacks build
+4-5 figures that don't depend on each other. build_figures() runs them
+sequentially in the request thread by default, or on a small shared pool
+when enabled through the environment:
+
+    FIGURE_WORKERS   pool size; 0 or 1 (default) keeps building sequentially
+    FIGURE_EXECUTOR  'thread' (default) or 'process'. Builders must be
+                     module-level functions and their arguments/results
+                     picklable (pandas objects, figures and dicts are)
+    FIGURE_TIMINGS   '1' to print per-figure build times
+
+The process pool must not be forked from a process that already runs threads
+(gthread request threads, SQLite connections, held locks): the children can
+deadlock. Under gunicorn, the post_fork hook calls start_executor(), which forks
+all pool processes from the new worker before it starts its threads, so they
+inherit the loaded data. Created later on (the dev server, no hook), the pool
+uses the 'forkserver' start method instead: its processes come from a clean
+server process and re-import the app's modules (the data snapshot is mapped,
+not re-read).
+
+Per-figure timings (ms) of the last call are kept in figure_timings[label]
+either way.
+"""
+import os
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+FIGURE_WORKERS = int(os.environ.get('FIGURE_WORKERS', '0') or 0)
+FIGURE_EXECUTOR = os.environ.get('FIGURE_EXECUTOR', 'thread').lower()
+LOG_FIGURE_TIMINGS = os.environ.get('FIGURE_TIMINGS', '').lower() in ('1', 'true', 'yes')
+
+# label -> {figure name: build ms, ..., 'total': wall ms}
+figure_timings = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _timed_build(builder, args):
+    start = time.perf_counter()
+    figure = builder(*args)
+    return figure, (time.perf_counter() - start) * 1000
+
+
+def _noop(_):
+    return None
+
+
+def start_executor():
+    """
+    Create the shared pool now. For the process pool, fork all its processes right away:
+    called from gunicorn's post_fork hook, while the worker is still single-threaded.
+    """
+    global _executor
+    if FIGURE_WORKERS <= 1 or FIGURE_EXECUTOR != 'process' or 'fork' not in multiprocessing.get_all_start_methods():
+        return get_executor()
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=FIGURE_WORKERS, mp_context=multiprocessing.get_context('fork'))
+            # Processes are started on the first submit: start them all before any thread exists
+            list(_executor.map(_noop, range(FIGURE_WORKERS)))
+            print(f"[+] Figure pool: {FIGURE_WORKERS} process workers (forked before worker threads)")
+    return _executor
+
+
+def get_executor():
+    """Shared pool (created on first use), or None when parallel building is off."""
+    global _executor
+    if FIGURE_WORKERS <= 1:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            if FIGURE_EXECUTOR == 'process':
+                # Request threads are running by now: forking here could deadlock the children
+                methods = multiprocessing.get_all_start_methods()
+                method = 'forkserver' if 'forkserver' in methods else 'spawn'
+                _executor = ProcessPoolExecutor(max_workers=FIGURE_WORKERS, mp_context=multiprocessing.get_context(method))
+            else:
+                _executor = ThreadPoolExecutor(max_workers=FIGURE_WORKERS, thread_name_prefix='figures')
+            print(f"[+] Figure pool: {FIGURE_WORKERS} {FIGURE_EXECUTOR} workers")
+    return _executor
+
+
+def build_figures(label, tasks):
+    """
+    Build independent figures.
+    tasks: {name: (builder, *args)} -> returns {name: figure} in the same order.
+    A builder exception propagates to the caller like a sequential build would.
+    """
+    start = time.perf_counter()
+    executor = get_executor()
+    if executor is None:
+        results = {name: _timed_build(task[0], task[1:]) for name, task in tasks.items()}
+    else:
+        futures = {name: executor.submit(_timed_build, task[0], task[1:]) for name, task in tasks.items()}
+        results = {name: future.result() for name, future in futures.items()}
+
+    timings = {name: round(ms, 2) for name, (_, ms) in results.items()}
+    timings['total'] = round((time.perf_counter() - start) * 1000, 2)
+    figure_timings[label] = timings
+    if LOG_FIGURE_TIMINGS:
+        print(f"[figures] {label}: " + ", ".join(f"{name} {ms:.1f}ms" for name, ms in timings.items()))
+    return {name: figure for name, (figure, _) in results.items()}
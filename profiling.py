@@ -0,0 +1,157 @@
+"""
+On-demand cProfile capture of named Dash callbacks.
+
+Arms profiling for the next N executions of a callback (by function name); each
+profiled run is written to PROFILE_DIR as
+
+    <time>_<callback>_<pid>.prof   pstats dump (snakeviz, `python -m pstats`, ...)
+    <time>_<callback>_<pid>.txt    top functions by cumulative time
+    <time>_<callback>_<pid>.json   the callback's input / state values, duration, pid
+
+Arming:
+    PROFILE_CALLBACKS=update_city_map:5,update_skills_analysis   at boot (N defaults to 1)
+    X-Profile-Callback: update_city_map:5                        request header, only honoured
+                                                                 with X-Admin-Token == ADMIN_TOKEN
+GET /admin/profiles (same token) lists what is armed and the files written.
+
+Arming is per worker process: a header arms the worker that receives it, which
+also profiles that request's callback when it matches. Cached callbacks served from the
+shared cache only profile the lookup; vary the inputs or use CACHE_BACKEND=null
+to profile the computation itself.
+"""
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import threading
+import time
+
+from flask import abort, jsonify, request
+from plotly.io.json import to_json_plotly
+
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles'))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+PROFILE_HEADER = 'X-Profile-Callback'
+TOKEN_HEADER = 'X-Admin-Token'
+TOP_FUNCTIONS = 40
+
+
+def parse_targets(spec):
+    """'update_city_map:5,update_skills_analysis' -> {'update_city_map': 5, 'update_skills_analysis': 1}"""
+    targets = {}
+    for item in (spec or '').split(','):
+        name, _, count = item.strip().partition(':')
+        if not name:
+            continue
+        try:
+            targets[name] = max(int(count or 1), 1)
+        except ValueError:
+            print(f"[!] Ignoring profiling target {item!r}: count must be an integer")
+    return targets
+
+
+class CallbackProfiler:
+    """Counts down the remaining profiled executions per callback name."""
+
+    def __init__(self, targets=None):
+        self._lock = threading.Lock()
+        self._remaining = dict(targets or {})
+        self.written = []
+
+    def arm(self, name, count=1):
+        with self._lock:
+            self._remaining[name] = self._remaining.get(name, 0) + count
+
+    def armed(self):
+        with self._lock:
+            return dict(self._remaining)
+
+    def _take(self, name):
+        with self._lock:
+            left = self._remaining.get(name, 0)
+            if not left:
+                return False
+            if left == 1:
+                del self._remaining[name]
+            else:
+                self._remaining[name] = left - 1
+            return True
+
+    def call(self, name, input_names, func, args, kwargs):
+        """Run func(*args, **kwargs), under cProfile if an execution of `name` is armed."""
+        if not self._take(name):
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        error = None
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        except Exception as e:
+            error = repr(e)
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            try:
+                self._save(name, profile, dict(zip(input_names, args)), duration, error)
+            except Exception as e:
+                print(f"[!] Could not save profile of {name}: {e}")
+
+    def _save(self, name, profile, inputs, duration, error):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S') + f'{time.time() % 1:.3f}'[1:]
+        base = os.path.join(PROFILE_DIR, f"{stamp}_{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}_{os.getpid()}")
+
+        profile.dump_stats(base + '.prof')
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        with open(base + '.txt', 'w') as fh:
+            fh.write(summary.getvalue())
+        with open(base + '.json', 'w') as fh:
+            fh.write(to_json_plotly({
+                'callback': name,
+                'inputs': inputs,
+                'duration_ms': round(duration * 1000, 1),
+                'error': error,
+                'pid': os.getpid(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }, pretty=True))
+
+        with self._lock:
+            self.written.append(base + '.prof')
+        print(f"[+] Profiled {name} ({duration * 1000:.0f} ms) -> {base}.prof")
+
+
+profiler = CallbackProfiler(parse_targets(os.environ.get('PROFILE_CALLBACKS')))
+if profiler.armed():
+    print(f"[+] Profiling armed: {profiler.armed()} -> {PROFILE_DIR}")
+
+
+def _is_admin():
+    token = request.headers.get(TOKEN_HEADER, '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def _arm_from_header():
+    spec = request.headers.get(PROFILE_HEADER)
+    if not spec:
+        return
+    if not _is_admin():
+        print(f"[!] Ignoring {PROFILE_HEADER} header without a valid {TOKEN_HEADER}")
+        return
+    for name, count in parse_targets(spec).items():
+        profiler.arm(name, count)
+
+
+def install(server):
+    """Honour the admin profiling header and add GET /admin/profiles."""
+    server.before_request(_arm_from_header)
+
+    @server.route('/admin/profiles')
+    def admin_profiles():
+        if not _is_admin():
+            abort(403)
+        files = sorted(os.listdir(PROFILE_DIR)) if os.path.isdir(PROFILE_DIR) else []
+        return jsonify({'pid': os.getpid(), 'armed': profiler.armed(), 'profile_dir': PROFILE_DIR,
+                        'files': [f for f in files if f.endswith('.prof')]})
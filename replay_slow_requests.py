@@ -0,0 +1,109 @@
+"""
+Slow Request Replay
+Re-executes the requests captured by slow_requests.py against the app's Flask
+test client and reports how long they take now, so real slow filter
+combinations can be used as a regression corpus.
+
+Caching is off by default (CACHE_BACKEND=null) so every replay does the real
+work; set CACHE_BACKEND to replay against a cache instead.
+
+Run: python replay_slow_requests.py [--log slow_requests.jsonl] [--repeats 3]
+                                    [--save results.json] [--baseline results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('CACHE_BACKEND', 'null')
+os.environ['WARMUP'] = '0'
+os.environ['SLOW_REQUEST_MS'] = '0'  # don't capture the replays themselves
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import slow_requests
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+parser.add_argument('--log', default=slow_requests.SLOW_LOG_PATH, help='captured slow request log')
+parser.add_argument('--repeats', type=int, default=3, help='executions per request')
+parser.add_argument('--save', help='write the results as JSON (use as a later --baseline)')
+parser.add_argument('--baseline', help='earlier --save output to compare against')
+args = parser.parse_args()
+
+
+def request_key(entry):
+    """Identical requests (same path, query and body) are replayed once."""
+    return json.dumps([entry['method'], entry['path'], entry.get('query', ''), entry['body']], sort_keys=True)
+
+
+entries = slow_requests.read_log(args.log)
+corpus = {}
+for entry in entries:
+    key = request_key(entry)
+    seen = corpus.setdefault(key, dict(entry, captures=0, captured_ms=[]))
+    seen['captures'] += 1
+    seen['captured_ms'].append(entry['duration_ms'])
+
+if not corpus:
+    print(f"No captured requests in {args.log}")
+    sys.exit(0)
+
+from index import app  # noqa: E402  (loads the data and registers every callback)
+
+client = app.server.test_client()
+print(f"Replaying {len(corpus)} distinct requests ({len(entries)} captured) x {args.repeats}\n")
+
+results = {}
+for key, entry in corpus.items():
+    path = entry['path'] + (f"?{entry['query']}" if entry.get('query') else '')
+    timings, status, size = [], None, 0
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        if entry['method'] == 'POST':
+            response = client.post(path, data=json.dumps(entry['body']), content_type='application/json')
+        else:
+            response = client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        status, size = response.status_code, len(response.get_data())
+    results[key] = {
+        'callback': entry['callback'],
+        'path': entry['path'],
+        'captures': entry['captures'],
+        'captured_ms': round(statistics.median(entry['captured_ms']), 1),
+        'min_ms': round(min(timings), 1),
+        'median_ms': round(statistics.median(timings), 1),
+        'status': status,
+        'bytes': size,
+    }
+
+baseline = {}
+if args.baseline:
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+
+print(f"{'#':>3}  {'Callback':<26}{'Seen':>5}{'Captured':>11}{'Min':>10}{'Median':>10}{'Status':>8}{'KB':>9}"
+      + (f"{'Baseline':>11}{'Change':>9}" if baseline else ''))
+for i, (key, row) in enumerate(sorted(results.items(), key=lambda item: -item[1]['median_ms']), 1):
+    line = (f"{i:>3}  {str(row['callback']):<26}{row['captures']:>5}{row['captured_ms']:>9.0f}ms"
+            f"{row['min_ms']:>8.0f}ms{row['median_ms']:>8.0f}ms{row['status']:>8}{row['bytes'] / 1024:>9.1f}")
+    if key in baseline:
+        before = baseline[key]['median_ms']
+        line += f"{before:>9.0f}ms{(row['median_ms'] - before) / before * 100 if before else 0:>+8.0f}%"
+    print(line)
+
+failed = sum(1 for row in results.values() if row['status'] != 200)
+total = sum(row['median_ms'] for row in results.values())
+print(f"\nTotal median time: {total:.0f} ms" + (f", {failed} failed" if failed else ''))
+if baseline:
+    common = [key for key in results if key in baseline]
+    before = sum(baseline[key]['median_ms'] for key in common)
+    after = sum(results[key]['median_ms'] for key in common)
+    if before:
+        print(f"Against baseline ({len(common)} requests): {before:.0f} -> {after:.0f} ms ({(after - before) / before * 100:+.0f}%)")
+
+if args.save:
+    with open(args.save, 'w') as fh:
+        json.dump(results, fh, indent=1)
+    print(f"Saved results to {args.save}")
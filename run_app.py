@@ -16,6 +16,10 @@ if __name__ == '__main__':
         pass
 
     Timer(1, open_browser).start()
+
+    # Warm the default dashboard state while the browser opens
+    from warmup import start_warmup
+    start_warmup()
     
     # Run server
     # debug=False is important for production/EXE
@@ -0,0 +1,352 @@
+"""
+Shared cache backend and cache key helpers.
+
+Flask-Caching's 'simple' backend lives inside each gunicorn worker: every
+worker fills its own copy, recycled workers (max_requests) start cold and
+nothing bounds its size in bytes. SQLiteCache keeps entries in one SQLite
+file that every worker process on the host shares (WAL mode, so readers
+don't block), survives worker restarts and evicts least-recently-used
+entries once the stored payloads exceed CACHE_MAX_BYTES.
+
+Keys are namespaced ('<namespace>:<digest>', see cache_key) and each
+namespace has its own TTL. Callers pass NAMESPACE_TTLS[namespace] so the
+Redis backend honours them too; SQLiteCache also applies them itself when
+cache.set() is called without a timeout:
+
+    filters   search-text row matches
+    figures   page callback outputs
+    map       Leaflet GeoJSON payloads
+    full_map  rendered /full-map HTML
+
+Misses go through cached_value(), which coalesces concurrent computations of
+the same key within and across workers (see singleflight).
+
+Configured in app_instance through the environment:
+
+    CACHE_BACKEND     'sqlite' (default), 'redis' (CACHE_REDIS_URL), 'simple' or 'null'
+    CACHE_PATH        SQLite file (default: <tmp>/egypt_career_map_cache.sqlite)
+    CACHE_MAX_BYTES   size budget for stored payloads (default 64 MB)
+    CACHE_TTL_<NS>    per-namespace TTL override in seconds, e.g. CACHE_TTL_FIGURES=600
+"""
+import atexit
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+
+from flask_caching.backends.base import BaseCache
+
+from singleflight import flights
+
+NAMESPACE_TTLS = {
+    'filters': 900,
+    'figures': 300,
+    'map': 300,
+    'full_map': 600,
+}
+for _ns in NAMESPACE_TTLS:
+    NAMESPACE_TTLS[_ns] = int(os.environ.get(f'CACHE_TTL_{_ns.upper()}', NAMESPACE_TTLS[_ns]))
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'egypt_career_map_cache.sqlite')
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Cross-worker single-flight: how long a computing worker may hold a key before others
+# take over (matches the gunicorn timeout), and how often the others check for its result
+LEASE_SECONDS = 120
+LEASE_POLL_SECONDS = 0.05
+# A hit only writes its access time back when the stored one is older than this, so most
+# reads stay reads (LRU order at this resolution is plenty for eviction)
+ACCESS_UPDATE_SECONDS = 5
+
+
+def cache_key(namespace, *parts):
+    """'<namespace>:<md5 of parts>' - parts must be JSON serializable (filter values, theme, ...)."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return f"{namespace}:{hashlib.md5(payload.encode()).hexdigest()}"
+
+
+def key_namespace(key):
+    return key.split(':', 1)[0] if ':' in key else 'default'
+
+
+class SQLiteCache(BaseCache):
+    """Flask-Caching backend storing pickled values in a SQLite file shared across processes."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, default_timeout=300,
+                 namespace_ttls=None):
+        super().__init__(default_timeout)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.namespace_ttls = dict(NAMESPACE_TTLS if namespace_ttls is None else namespace_ttls)
+        self._local = threading.local()
+        # In-process hit/miss counters, flushed to the shared stats table periodically
+        self._counts = {}
+        self._counts_lock = threading.Lock()
+        self._pending = 0
+        atexit.register(self.flush_stats)
+        # Total stored bytes kept in one row by triggers, so set() never scans the table
+        self._connect().executescript("""
+            BEGIN IMMEDIATE;
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+            CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY,
+                owner INTEGER NOT NULL,
+                expires REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stats (
+                namespace TEXT PRIMARY KEY,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS totals (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                bytes INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO totals (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+            CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries
+                BEGIN UPDATE totals SET bytes = bytes + NEW.size WHERE id = 0; END;
+            CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries
+                BEGIN UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0; END;
+            CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries
+                BEGIN UPDATE totals SET bytes = bytes - OLD.size WHERE id = 0; END;
+            COMMIT;
+        """)
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.setdefault('path', config.get('CACHE_PATH', DEFAULT_CACHE_PATH))
+        kwargs.setdefault('max_bytes', int(config.get('CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)))
+        return cls(*args, **kwargs)
+
+    def _connect(self):
+        """One connection per thread and process (connections must not cross a fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _expiry(self, key, timeout):
+        if timeout is None:
+            timeout = self.namespace_ttls.get(key_namespace(key), self.default_timeout)
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout else 0
+
+    def _count(self, namespace, hit):
+        with self._counts_lock:
+            hits, misses = self._counts.get(namespace, (0, 0))
+            self._counts[namespace] = (hits + hit, misses + (not hit))
+            self._pending += 1
+            flush = self._pending >= 100
+        if flush:
+            self.flush_stats()
+
+    def flush_stats(self):
+        with self._counts_lock:
+            counts, self._counts, self._pending = self._counts, {}, 0
+        if counts:
+            self._connect().executemany(
+                "INSERT INTO stats (namespace, hits, misses) VALUES (?, ?, ?) "
+                "ON CONFLICT(namespace) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+                [(ns, h, m) for ns, (h, m) in counts.items()]
+            )
+
+    def stats(self):
+        """Per-namespace hits, misses, hit ratio, entry count and bytes (all workers, all restarts)."""
+        self.flush_stats()
+        conn = self._connect()
+        result = {}
+        for ns, hits, misses in conn.execute("SELECT namespace, hits, misses FROM stats"):
+            result[ns] = {'hits': hits, 'misses': misses, 'hit_ratio': round(hits / (hits + misses), 3) if hits + misses else 0.0}
+        for ns, entries, size in conn.execute("SELECT namespace, COUNT(*), SUM(size) FROM entries GROUP BY namespace"):
+            result.setdefault(ns, {'hits': 0, 'misses': 0, 'hit_ratio': 0.0}).update(entries=entries, bytes=size)
+        return result
+
+    def _lookup(self, key):
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] and row[1] <= now):
+            return None
+        if now - row[2] > ACCESS_UPDATE_SECONDS:
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            return None
+
+    def get(self, key):
+        value = self._lookup(key)
+        self._count(key_namespace(key), value is not None)
+        return value
+
+    def peek(self, key):
+        """get() without counting a hit or miss (used while polling for another worker's fill)."""
+        return self._lookup(key)
+
+    def acquire_lease(self, key, ttl=LEASE_SECONDS):
+        """
+        Claim the right to compute key. False while another process holds an unexpired
+        lease, i.e. is computing the same value right now.
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("DELETE FROM leases WHERE key = ? AND expires <= ?", (key, now))
+        return conn.execute(
+            "INSERT OR IGNORE INTO leases (key, owner, expires) VALUES (?, ?, ?)", (key, os.getpid(), now + ttl)
+        ).rowcount == 1
+
+    def release_lease(self, key):
+        self._connect().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, os.getpid()))
+
+    def set(self, key, value, timeout=None):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return False
+        now = time.time()
+        conn = self._connect()
+        # Upsert rather than INSERT OR REPLACE: REPLACE's implicit delete skips the size triggers
+        conn.execute(
+            "INSERT INTO entries (key, namespace, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET namespace = excluded.namespace, value = excluded.value, "
+            "size = excluded.size, expires = excluded.expires, accessed = excluded.accessed",
+            (key, key_namespace(key), sqlite3.Binary(blob), len(blob), self._expiry(key, timeout), now)
+        )
+        self._evict(conn, now)
+        return True
+
+    def add(self, key, value, timeout=None):
+        if self.has(key):
+            return False
+        return self.set(key, value, timeout)
+
+    def _total_bytes(self, conn):
+        return conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then least recently used ones until the size budget holds."""
+        total = self._total_bytes(conn)
+        if total <= self.max_bytes:
+            return
+        conn.execute("DELETE FROM entries WHERE expires != 0 AND expires <= ?", (now,))
+        total = self._total_bytes(conn)
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def delete(self, key):
+        return self._connect().execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount > 0
+
+    def has(self, key):
+        row = self._connect().execute("SELECT expires FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None and (not row[0] or row[0] > time.time())
+
+    def clear(self):
+        self._connect().execute("DELETE FROM entries")
+        return True
+
+
+def _fill(cache, key, compute, namespace):
+    """Compute and store a missing value, letting only one worker compute it when the backend supports leases."""
+    timeout = NAMESPACE_TTLS.get(namespace or key_namespace(key))
+    backend = cache.cache
+    if not hasattr(backend, 'acquire_lease'):
+        flights.record_computation(key)
+        value = compute()
+        if value is not None:
+            cache.set(key, value, timeout=timeout)
+        return value
+
+    start = time.perf_counter()
+    while not backend.acquire_lease(key):
+        # Another worker is computing it: wait for its result to land in the cache
+        time.sleep(LEASE_POLL_SECONDS)
+        value = backend.peek(key)
+        if value is not None:
+            flights.record_cross_worker_wait(key, start)
+            return value
+    try:
+        # It may have been filled between our miss and getting the lease
+        value = backend.peek(key)
+        if value is None:
+            flights.record_computation(key)
+            value = compute()
+            if value is not None:
+                cache.set(key, value, timeout=timeout)
+    finally:
+        backend.release_lease(key)
+    return value
+
+
+# Per-request lookup counters ({'hits': n, 'misses': n}), set by instrumentation while a callback runs
+cache_lookups = ContextVar('cache_lookups', default=None)
+
+
+def cached_value(key, compute, namespace=None):
+    """
+    Cached value for key, computing and storing it on a miss. Concurrent misses for
+    the same key are coalesced (singleflight): threads of this worker share the
+    in-flight result, other workers wait for it to reach the shared cache.
+    """
+    from app_instance import cache
+    value = cache.get(key)
+    lookups = cache_lookups.get()
+    if lookups is not None:
+        lookups['hits' if value is not None else 'misses'] += 1
+    if value is not None:
+        return value
+    return flights.do(key, lambda: _fill(cache, key, compute, namespace))
+
+
+def _cacheable(value):
+    """Figures are stored as plain dicts (cheap to unpickle, same JSON for Dash)."""
+    if hasattr(value, 'to_plotly_json') and hasattr(value, 'layout'):
+        return value.to_plotly_json()
+    return value
+
+
+def cached_callback(namespace):
+    """
+    Cache a pure callback's outputs in the shared cache, keyed by its arguments
+    and the dataset version. Only for callbacks whose outputs depend on nothing
+    but their inputs (no callback_context, no random keys).
+    """
+    def decorator(func):
+        def compute(args):
+            result = func(*args)
+            if isinstance(result, tuple):
+                return tuple(_cacheable(v) for v in result)
+            return _cacheable(result)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            from data_loader import data_version
+            key = cache_key(namespace, func.__module__, func.__name__, data_version, args)
+            return cached_value(key, lambda: compute(args), namespace)
+        return wrapper
+    return decorator
@@ -0,0 +1,100 @@
+"""
+Single-flight coalescing of identical expensive computations.
+
+Right after a deploy, every session opening the dashboard misses the cache for
+the same default filters, figures and /full-map HTML, and each request used to
+compute them independently. SingleFlight.do(key, fn) runs fn once per key at a
+time: threads asking for a key that is already being computed wait for that
+result instead (the waiter receives the same value, or the same exception).
+
+Across gunicorn workers the shared SQLite cache provides a lease
+(SQLiteCache.acquire_lease): the worker holding it computes, the others poll
+the cache until the value lands (see shared_cache.cached_value).
+
+Metrics per namespace (key prefix), see stats():
+    leaders              calls that ran fn (one per key at a time in this worker)
+    computed             actual computations (leaders minus those served by another worker)
+    coalesced            threads that reused an in-flight result in this worker
+    cross_worker_waits   leaders that waited for another worker's computation
+    wait_ms              total time spent waiting by coalesced callers
+"""
+import threading
+import time
+from collections import defaultdict
+
+
+def _namespace(key):
+    return key.split(':', 1)[0] if ':' in key else 'default'
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = defaultdict(lambda: {'leaders': 0, 'computed': 0, 'coalesced': 0, 'cross_worker_waits': 0, 'wait_ms': 0.0})
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats[_namespace(key)]['leaders'] += 1
+            else:
+                call.waiters += 1
+
+        if not leader:
+            start = time.perf_counter()
+            call.done.wait()
+            self._record_wait(key, start, 'coalesced')
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _record_wait(self, key, start, counter):
+        with self._lock:
+            stats = self._stats[_namespace(key)]
+            stats[counter] += 1
+            stats['wait_ms'] += (time.perf_counter() - start) * 1000
+
+    def record_cross_worker_wait(self, key, start):
+        self._record_wait(key, start, 'cross_worker_waits')
+
+    def record_computation(self, key):
+        with self._lock:
+            self._stats[_namespace(key)]['computed'] += 1
+
+    def in_flight(self):
+        with self._lock:
+            return {key: call.waiters for key, call in self._calls.items()}
+
+    def stats(self):
+        with self._lock:
+            return {ns: dict(values, wait_ms=round(values['wait_ms'], 1)) for ns, values in self._stats.items()}
+
+
+# Shared by everything in this worker process
+flights = SingleFlight()
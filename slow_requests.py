@@ -0,0 +1,83 @@
+"""
+Slow-request capture.
+
+Every /_dash-update-component request (and instrumented route, e.g. /full-map)
+slower than SLOW_REQUEST_MS is appended to a JSON-lines log with its exact
+request body, so real slow filter combinations can be replayed offline with
+replay_slow_requests.py. One entry per line:
+
+    {"time": ..., "pid": ..., "callback": "update_city_map", "duration_ms": 1840.2,
+     "callback_ms": 1812.0, "status": 200, "method": "POST",
+     "path": "/_dash-update-component", "query": "", "body": {...}}
+
+The log is bounded: once it exceeds SLOW_LOG_MAX_BYTES it is rotated to
+<path>.1 (replacing the previous one), so at most twice that is kept on disk.
+Workers append whole lines, which is safe for concurrent writers.
+
+    SLOW_REQUEST_MS=1000                  threshold, 0 disables capture
+    SLOW_LOG_PATH=./slow_requests.jsonl
+    SLOW_LOG_MAX_BYTES=5242880
+"""
+import json
+import os
+import threading
+import time
+
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 1000))
+SLOW_LOG_PATH = os.environ.get('SLOW_LOG_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'slow_requests.jsonl'))
+SLOW_LOG_MAX_BYTES = int(os.environ.get('SLOW_LOG_MAX_BYTES', 5 * 1024 * 1024))
+
+_lock = threading.Lock()
+
+
+def is_slow(duration_ms):
+    return SLOW_REQUEST_MS > 0 and duration_ms >= SLOW_REQUEST_MS
+
+
+def record(callback, duration_ms, callback_ms, status, method, path, query, body, log_path=None):
+    """Append one slow request to the log, rotating it first when it is over the size limit."""
+    log_path = log_path or SLOW_LOG_PATH
+    try:
+        body = json.loads(body) if body else None
+    except ValueError:
+        body = body.decode('utf-8', 'replace') if isinstance(body, bytes) else body
+    line = json.dumps({
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'pid': os.getpid(),
+        'callback': callback,
+        'duration_ms': round(duration_ms, 1),
+        'callback_ms': round(callback_ms, 1) if callback_ms is not None else None,
+        'status': status,
+        'method': method,
+        'path': path,
+        'query': query,
+        'body': body,
+    }, separators=(',', ':')) + '\n'
+
+    with _lock:
+        try:
+            if os.path.getsize(log_path) + len(line) > SLOW_LOG_MAX_BYTES:
+                os.replace(log_path, log_path + '.1')
+        except OSError:
+            pass
+        try:
+            with open(log_path, 'a', encoding='utf-8') as fh:
+                fh.write(line)
+        except OSError as e:
+            print(f"[!] Could not write slow request log {log_path}: {e}")
+
+
+def read_log(log_path=None):
+    """All captured entries, oldest first (rotated file included)."""
+    log_path = log_path or SLOW_LOG_PATH
+    entries = []
+    for path in (log_path + '.1', log_path):
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # partially written line
+    return entries
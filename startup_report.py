@@ -0,0 +1,47 @@
+"""
+Startup report: how long each boot phase took in this process.
+
+Phases are recorded as they happen (data load, cache warm-up steps, ...) and
+printed once the warm-up finishes; GET /ready returns the same report.
+
+    with timed('load_data'):
+        ...
+    record('warmup:overview', 412.5)
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+# Wall-clock time this module was first imported (i.e. process boot, it is imported by data_loader)
+BOOT_TIME = time.time()
+
+_phases = {}  # phase -> ms, in recording order
+_lock = threading.Lock()
+
+
+def record(phase, ms):
+    with _lock:
+        _phases[phase] = round(ms, 1)
+
+
+@contextmanager
+def timed(phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, (time.perf_counter() - start) * 1000)
+
+
+def report():
+    """{'phases': {phase: ms}, 'since_boot_s': seconds since the process started}"""
+    with _lock:
+        phases = dict(_phases)
+    return {'phases': phases, 'since_boot_s': round(time.time() - BOOT_TIME, 1)}
+
+
+def print_report(title='Startup report'):
+    data = report()
+    print(f"[+] {title} ({data['since_boot_s']}s since boot):")
+    for phase, ms in data['phases'].items():
+        print(f"    {phase:<32}{ms:>10.1f} ms")
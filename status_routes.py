@@ -0,0 +1,63 @@
+"""
+Flask routes reporting server status
+Access via: /ready (open, for health checks), /memory, /cache-stats
+(X-Admin-Token == ADMIN_TOKEN, as for /admin/profiles)
+"""
+import os
+
+from flask import abort, jsonify
+from app_instance import server, cache
+from dataset_snapshot import process_memory
+from profiling import _is_admin
+from singleflight import flights
+from startup_report import report
+from warmup import warmup_status
+
+
+@server.route('/ready')
+def ready():
+    """200 once this worker finished warming the default dashboard state, 503 until then."""
+    status = warmup_status()
+    body = dict(status, pid=os.getpid(), startup=report())
+    return jsonify(body), (200 if status['status'] == 'ready' else 503)
+
+
+def _sibling_workers():
+    """PIDs of all workers under the same gunicorn master (just this process when run standalone)."""
+    ppid = os.getppid()
+    try:
+        with open(f'/proc/{ppid}/task/{ppid}/children') as fh:
+            pids = [int(pid) for pid in fh.read().split()]
+    except (OSError, ValueError):
+        pids = []
+    return pids if os.getpid() in pids else [os.getpid()]
+
+
+@server.route('/memory')
+def memory():
+    """RSS/PSS per worker (MB). Total PSS is the real combined footprint of the workers."""
+    if not _is_admin():
+        abort(403)
+    workers = {pid: process_memory(pid) for pid in _sibling_workers()}
+    workers = {pid: usage for pid, usage in workers.items() if usage}
+    return jsonify({
+        'pid': os.getpid(),
+        'workers': workers,
+        'total_pss_mb': round(sum(usage.get('pss_mb', 0) for usage in workers.values()), 1),
+        'master': process_memory(os.getppid()) if len(workers) > 1 else {},
+    })
+
+
+@server.route('/cache-stats')
+def cache_stats():
+    """Shared cache hit ratios per namespace and this worker's single-flight counters."""
+    if not _is_admin():
+        abort(403)
+    backend = cache.cache
+    return jsonify({
+        'pid': os.getpid(),
+        'backend': type(backend).__name__,
+        'namespaces': backend.stats() if hasattr(backend, 'stats') else {},
+        'singleflight': flights.stats(),
+        'in_flight': flights.in_flight(),
+    })
@@ -0,0 +1,171 @@
+"""
+Synthetic Jobs / Skills dataset generator for scale testing.
+
+Generates Jobs.xlsx-shaped postings at any size, with value distributions
+sampled from the real data, plus the matching unpivoted Skills table, and
+writes them straight to a pinned data snapshot (see dataset_snapshot) that the
+loader can use without going through Excel:
+
+    python synthetic_data.py 100000                # -> bench_data/jobs_100000_seed42
+    DATA_SNAPSHOT_DIR=bench_data/jobs_100000_seed42 python index.py
+
+Columns that belong together are sampled as a unit from the same real row, so
+their joint distribution is kept (a city with its districts and coordinates, a
+title with its categories, a career level with its experience range, a posting
+date with its "N days ago" text); unrelated groups are sampled independently.
+Every job gets a unique Link and jittered coordinates. Skills are drawn per job:
+the number of skills follows the real skills-per-posting distribution and the
+skills themselves the real skill frequencies within the job's category. The
+Skills table holds one row per (job, skill), like Skills_Cleaned_UnPivot.xlsx.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BENCH_DATA_DIR = os.path.join(ROOT, 'bench_data')
+
+# Sampled together from one real row each
+JOINT_COLUMNS = [
+    ('Company', 'Image_link'),
+    ('Location', 'location_2', 'City', 'In_City', 'Location_ID', 'Latitude', 'Longitude'),
+    ('Job Title', 'Category', 'Category 2', 'Category 3', 'Category_ID'),
+    ('Career Level', 'Career Level_ID', 'Year Of Exp', 'Year Of Exp_Avg', 'Year Of Exp_ID', 'education_level'),
+    ('posted', 'How Long Ago', 'job_status'),
+    ('applicants', 'open_positions', 'viewed', 'in_consideration', 'not_selected'),
+]
+# Generated rather than sampled
+GENERATED_COLUMNS = {'Link', 'Skills', 'Skill_List', 'exp_bucket'}
+COORDINATE_JITTER = 0.005
+
+
+def load_real():
+    """Real Jobs / Skills dataframes: from the app's data snapshot when present, else the Excel files."""
+    from dataset_snapshot import load_snapshot
+    snapshot = load_snapshot(os.path.join(ROOT, 'data_snapshot'))
+    if snapshot is not None and not snapshot['jobs'].empty:
+        return snapshot['jobs'], snapshot['skills']
+    from data_loader import load_from_sources
+    return load_from_sources()
+
+
+def _skill_model(jobs, skills):
+    """Skills-per-posting counts and, per category, the skill values with their frequencies."""
+    per_job = jobs['Skills'].fillna('').astype(str).str.split(',').map(lambda items: sum(1 for s in items if s.strip()))
+    counts = per_job[per_job > 0].to_numpy()
+    if len(counts) == 0:
+        counts = np.array([1])
+
+    by_category = {}
+    for category, group in skills.dropna(subset=['Skills']).groupby('Category'):
+        freq = group['Skills'].value_counts()
+        by_category[category] = (freq.index.to_numpy(dtype=object), (freq / freq.sum()).to_numpy())
+    freq = skills['Skills'].dropna().value_counts()
+    overall = (freq.index.to_numpy(dtype=object), (freq / freq.sum()).to_numpy())
+    mapped = skills.dropna(subset=['Skills']).drop_duplicates('Skills').set_index('Skills').get('Mapped_Category')
+    return counts, by_category, overall, mapped
+
+
+def _draw_skills(rng, categories, counts, by_category, overall):
+    """(job position, skill) pairs: a sampled skill count per job, skills drawn by category frequency."""
+    per_job = rng.choice(counts, size=len(categories))
+    job_pos = np.repeat(np.arange(len(categories)), per_job)
+    slot_category = np.repeat(np.asarray(categories, dtype=object), per_job)
+    drawn = np.empty(len(job_pos), dtype=object)
+    for category in pd.unique(slot_category):
+        mask = slot_category == category
+        values, p = by_category.get(category, overall)
+        drawn[mask] = rng.choice(values, size=int(mask.sum()), p=p)
+    pairs = pd.DataFrame({'job': job_pos, 'Skills': drawn}).drop_duplicates()
+    return pairs.reset_index(drop=True)
+
+
+def generate(jobs, skills, rows, seed=42):
+    """(jobs, skills) synthetic dataframes with `rows` postings and the real columns and dtypes."""
+    from data_index import bucket_experience
+    rng = np.random.default_rng(seed)
+    real = jobs.reset_index(drop=True)
+    data = {}
+
+    grouped = [tuple(col for col in group if col in real.columns) for group in JOINT_COLUMNS]
+    grouped += [(col,) for col in real.columns
+                if col not in GENERATED_COLUMNS and not any(col in group for group in grouped)]
+    for group in grouped:
+        if not group:
+            continue
+        picked = rng.integers(0, len(real), rows)
+        for col in group:
+            data[col] = real[col].iloc[picked].reset_index(drop=True)
+
+    if 'Latitude' in data and 'Longitude' in data:
+        data['Latitude'] = data['Latitude'] + rng.uniform(-COORDINATE_JITTER, COORDINATE_JITTER, rows)
+        data['Longitude'] = data['Longitude'] + rng.uniform(-COORDINATE_JITTER, COORDINATE_JITTER, rows)
+    data['Link'] = pd.Series([f'https://wuzzuf.net/jobs/p/synthetic-{i:08d}' for i in range(rows)])
+
+    # Skills: one (job, skill) row per drawn skill, joined back as the job's Skills / Skill_List text
+    counts, by_category, overall, mapped = _skill_model(real, skills)
+    pairs = _draw_skills(rng, data['Category'].to_numpy(dtype=object), counts, by_category, overall)
+    joined = pairs.groupby('job')['Skills'].agg(', '.join).reindex(range(rows))
+    data['Skills'] = joined
+    data['Skill_List'] = '[' + pairs.assign(Skills=pairs['Skills'].str.lower()).groupby('job')['Skills'].agg(', '.join).reindex(range(rows)) + ']'
+
+    synthetic = pd.DataFrame({col: data[col] for col in real.columns if col in data})
+    for col in synthetic.columns:
+        if synthetic[col].dtype != real[col].dtype:
+            synthetic[col] = synthetic[col].astype(real[col].dtype)
+    if 'Year Of Exp_Avg' in synthetic.columns:
+        synthetic['exp_bucket'] = bucket_experience(synthetic['Year Of Exp_Avg'])
+
+    job_fields = synthetic.loc[pairs['job'], ['Job Title', 'Category', 'Category 2', 'Category 3']].reset_index(drop=True)
+    skills_out = pd.DataFrame({
+        col: (job_fields[col] if col in job_fields.columns
+              else pairs['Skills'] if col == 'Skills'
+              else pairs['Skills'].map(mapped) if col == 'Mapped_Category' and mapped is not None
+              else pd.Series(np.nan, index=pairs.index, dtype=object))
+        for col in skills.columns
+    })
+    for col in skills_out.columns:
+        if skills_out[col].dtype != skills[col].dtype:
+            skills_out[col] = skills_out[col].astype(skills[col].dtype)
+    return synthetic, skills_out
+
+
+def write_dataset(rows, seed=42, path=None, jobs=None, skills=None):
+    """Generate `rows` postings and write them as a pinned snapshot; returns its directory."""
+    from dataset_snapshot import write_snapshot
+    path = path or os.path.join(BENCH_DATA_DIR, f'jobs_{rows}_seed{seed}')
+    if jobs is None:
+        jobs, skills = load_real()
+    start = time.perf_counter()
+    synthetic, synthetic_skills = generate(jobs, skills, rows, seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    write_snapshot(path, {'jobs': synthetic, 'skills': synthetic_skills},
+                   pinned={'generator': 'synthetic_data', 'rows': rows, 'seed': seed,
+                           'sampled_from': len(jobs), 'skills_rows': len(synthetic_skills)})
+    print(f"[+] Wrote {rows:,} synthetic jobs, {len(synthetic_skills):,} skills rows to {path} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def ensure_dataset(rows, seed=42):
+    """Snapshot directory for `rows` synthetic jobs, generated on first use."""
+    path = os.path.join(BENCH_DATA_DIR, f'jobs_{rows}_seed{seed}')
+    if not os.path.exists(os.path.join(path, 'meta.json')):
+        write_dataset(rows, seed, path)
+    return path
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, ROOT)
+    parser = argparse.ArgumentParser(description='Write a synthetic Jobs/Skills data snapshot.')
+    parser.add_argument('rows', type=int, nargs='+', help='number of jobs (several sizes allowed)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help='snapshot directory (single size only)')
+    args = parser.parse_args()
+    real_jobs, real_skills = load_real()
+    for size in args.rows:
+        write_dataset(size, args.seed, args.out if len(args.rows) == 1 else None, real_jobs, real_skills)
@@ -0,0 +1,193 @@
+"""
+Precomputed time-series cube for the Time Analysis page.
+
+At load time every job is assigned a day slot (one per distinct posting day,
+plus a trailing slot for undated jobs) and the job count / applicant totals are
+accumulated into a dense array indexed by day x low-cardinality sidebar
+dimensions. The page then derives its monthly, weekday and applicant-trend
+series with array reductions over the active selection instead of re-deriving
+Month/Day strings and running several groupbys per call.
+"""
+import numpy as np
+import pandas as pd
+
+# Sidebar filters small enough to keep as dense cube axes
+CUBE_DIMENSIONS = ['Work Mode', 'Employment Type', 'Career Level', 'education_level']
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+class TimeSeriesCube:
+    """Day x dimension job-count / applicant-sum cube built once from the jobs dataframe."""
+
+    def __init__(self, frame, dimensions=CUBE_DIMENSIONS):
+        n_rows = len(frame)
+        posted = pd.to_datetime(frame['posted'], errors='coerce') if 'posted' in frame.columns else pd.Series(pd.NaT, index=frame.index)
+        posted_days = posted.dt.normalize()
+
+        # Day axis: distinct posting days, then one slot for undated jobs
+        self.days = pd.DatetimeIndex(posted_days.dropna().unique()).sort_values()
+        self.n_days = len(self.days)
+        day_idx = np.full(n_rows, self.n_days, dtype=np.int64)
+        dated = posted_days.notna().to_numpy()
+        day_idx[dated] = self.days.get_indexer(posted_days[dated])
+        self.day_idx = day_idx
+        self.posted = posted.to_numpy()
+
+        # Calendar attributes per day slot (month keys are year * 12 + month - 1)
+        month_keys = self.days.year * 12 + self.days.month - 1
+        self.month_keys = np.unique(np.asarray(month_keys))
+        self.day_month = np.searchsorted(self.month_keys, np.asarray(month_keys))
+        self.day_calendar_month = np.asarray(self.days.month)
+        self.day_weekday = np.asarray(self.days.weekday)
+        self.month_labels = [pd.Timestamp(year=int(k // 12), month=int(k % 12) + 1, day=1).strftime('%B %Y') for k in self.month_keys]
+
+        # Applicants: sum and number of non-missing values (for means)
+        if 'applicants' in frame.columns:
+            applicants = pd.to_numeric(frame['applicants'], errors='coerce').to_numpy(dtype=float)
+        else:
+            applicants = np.full(n_rows, np.nan)
+        self.has_applicants = 'applicants' in frame.columns
+        self.applicant_present = ~np.isnan(applicants)
+        self.applicant_values = np.where(self.applicant_present, applicants, 0.0)
+
+        # Dimension codes; missing values get their own trailing code which no filter selects
+        self.dimensions = [d for d in dimensions if d in frame.columns]
+        self.levels = {}
+        self.codes = {}
+        for dim in self.dimensions:
+            codes, uniques = pd.factorize(frame[dim])
+            codes = np.where(codes < 0, len(uniques), codes)
+            self.codes[dim] = codes
+            self.levels[dim] = {value: i for i, value in enumerate(uniques)}
+
+        shape = (self.n_days + 1,) + tuple(len(self.levels[d]) + 1 for d in self.dimensions)
+        flat = np.ravel_multi_index((day_idx,) + tuple(self.codes[d] for d in self.dimensions), shape)
+        size = int(np.prod(shape))
+        self.jobs = np.bincount(flat, minlength=size).reshape(shape)
+        self.applicant_sum = np.bincount(flat, weights=self.applicant_values, minlength=size).reshape(shape)
+        self.applicant_n = np.bincount(flat, weights=self.applicant_present, minlength=size).reshape(shape)
+
+    def _selected_codes(self, dim, values):
+        levels = self.levels[dim]
+        return np.array([levels[v] for v in values if v in levels], dtype=np.int64)
+
+    def covers_dates(self, start_date, end_date):
+        """True when [start_date, end_date] keeps every dated job (so the range needs no row filter)."""
+        valid = ~pd.isna(self.posted)
+        if not valid.any():
+            return True
+        return pd.Timestamp(start_date) <= self.posted[valid].min() and pd.Timestamp(end_date) >= self.posted[valid].max()
+
+    def select(self, filters=None, positions=None, months=None, dated_only=False):
+        """
+        Reduce the cube for the active selection.
+
+        filters: {dimension: [values]} for cube dimensions (empty/None = no filter)
+        positions: optional row positions already narrowed by non-cube filters
+        months: optional calendar month numbers (1-12); drops undated jobs like dt.month.isin
+        dated_only: drop undated jobs (an active date range excludes them)
+        """
+        filters = {d: v for d, v in (filters or {}).items() if v and d in self.levels}
+        n_slots = self.n_days + 1
+
+        if positions is None:
+            jobs, app_sum, app_n = self.jobs, self.applicant_sum, self.applicant_n
+            for axis, dim in enumerate(self.dimensions, start=1):
+                if dim in filters:
+                    codes = self._selected_codes(dim, filters[dim])
+                    jobs, app_sum, app_n = (np.take(a, codes, axis=axis) for a in (jobs, app_sum, app_n))
+            axes = tuple(range(1, jobs.ndim))
+            daily = (jobs.sum(axis=axes), app_sum.sum(axis=axes), app_n.sum(axis=axes))
+        else:
+            positions = np.asarray(positions, dtype=np.int64)
+            for dim, values in filters.items():
+                positions = positions[np.isin(self.codes[dim][positions], self._selected_codes(dim, values))]
+            slots = self.day_idx[positions]
+            daily = (
+                np.bincount(slots, minlength=n_slots),
+                np.bincount(slots, weights=self.applicant_values[positions], minlength=n_slots),
+                np.bincount(slots, weights=self.applicant_present[positions], minlength=n_slots),
+            )
+
+        if months or dated_only:
+            keep = np.isin(self.day_calendar_month, months) if months else np.ones(self.n_days, dtype=bool)
+            keep = np.append(keep, False)
+            daily = tuple(np.where(keep, arr, 0) for arr in daily)
+        return TimeSelection(self, *daily)
+
+
+class TimeSelection:
+    """Daily arrays for one selection plus the series the Time Analysis page needs."""
+
+    def __init__(self, cube, jobs, applicant_sum, applicant_n):
+        self.cube = cube
+        self.jobs = np.asarray(jobs, dtype=np.int64)
+        self.applicant_sum = np.asarray(applicant_sum, dtype=float)
+        self.applicant_n = np.asarray(applicant_n, dtype=float)
+
+    @property
+    def total_jobs(self):
+        return int(self.jobs.sum())
+
+    @property
+    def avg_applicants(self):
+        n = self.applicant_n.sum()
+        return self.applicant_sum.sum() / n if n else float('nan')
+
+    def _by_month(self, values):
+        n_days = self.cube.n_days
+        return np.bincount(self.cube.day_month, weights=values[:n_days], minlength=len(self.cube.month_keys))
+
+    def monthly(self):
+        """Jobs and mean applicants per calendar month (chronological, months with jobs only)."""
+        counts = self._by_month(self.jobs)
+        app_sum = self._by_month(self.applicant_sum)
+        app_n = self._by_month(self.applicant_n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_applicants = np.where(app_n > 0, app_sum / app_n, np.nan)
+        present = counts > 0
+        return pd.DataFrame({
+            'Month': np.array(self.cube.month_labels, dtype=object)[present],
+            'Month_Sort': self.cube.month_keys[present],
+            'count': counts[present].astype(np.int64),
+            'applicants': mean_applicants[present],
+        })
+
+    def month_weekday(self):
+        """Jobs per (month, weekday), chronological then Monday..Sunday."""
+        cube = self.cube
+        n_months = len(cube.month_keys)
+        flat = cube.day_month * 7 + cube.day_weekday
+        counts = np.bincount(flat, weights=self.jobs[:cube.n_days], minlength=n_months * 7).reshape(n_months, 7)
+        month_pos, weekday = np.nonzero(counts)
+        return pd.DataFrame({
+            'Month': np.array(cube.month_labels, dtype=object)[month_pos],
+            'Month_Sort': cube.month_keys[month_pos],
+            'Day': np.array(WEEKDAY_NAMES, dtype=object)[weekday],
+            'count': counts[month_pos, weekday].astype(np.int64),
+        })
+
+    def weekday_counts(self):
+        return np.bincount(self.cube.day_weekday, weights=self.jobs[:self.cube.n_days], minlength=7)
+
+    def peak_day(self):
+        counts = self.weekday_counts()
+        return WEEKDAY_NAMES[int(np.argmax(counts))] if counts.sum() > 0 else "N/A"
+
+    def mom_growth(self):
+        """
+        Growth of the latest month with postings vs. the calendar month before it.
+        Month keys carry the year, so December -> January compares across years.
+        Returns None when the previous month has no postings.
+        """
+        counts = self._by_month(self.jobs)
+        present = np.flatnonzero(counts > 0)
+        if not len(present):
+            return None
+        latest = present[-1]
+        prev_key = self.cube.month_keys[latest] - 1
+        prev = np.searchsorted(self.cube.month_keys, prev_key)
+        if prev >= len(self.cube.month_keys) or self.cube.month_keys[prev] != prev_key or counts[prev] == 0:
+            return None
+        return (counts[latest] - counts[prev]) / counts[prev] * 100
@@ -1,5 +1,6 @@
 from dash import html
 import plotly.graph_objects as go
+from chart_templates import chart_template
 
 def format_kpi_value(value, theme, is_pct=False):
     """
@@ -28,18 +29,11 @@ def format_kpi_value(value, theme, is_pct=False):
 
 import plotly.express as px
 import pandas as pd
-from data_loader import skills_df
+from data_loader import skills_df, df as jobs_df, data_version
+from shared_cache import cache_key, cached_value
 
-def filter_dataframe_by_search(df, search_text):
-    """
-    Filter the dataframe based on a global search text across ALL columns
-    in both the main Jobs dataframe and the Skills dataframe.
-    """
-    if not search_text or not search_text.strip():
-        return df
-        
-    search_term = search_text.strip().lower()
-    
+def _search_mask(df, search_term):
+    """Row mask for search_term over df's string columns and the Skills dataframe."""
     # 1. Search in main Jobs dataframe (df)
     # Create a mask for all columns
     # Optimization: Select only object/string columns for string search to avoid errors
@@ -62,9 +56,31 @@ def filter_dataframe_by_search(df, search_text):
         
     # 3. Combine results
     # Include rows where the search term was found in df OR the Job Title matches a skill search result
-    final_mask = mask_df | df['Job Title'].isin(matching_titles)
+    return mask_df | df['Job Title'].isin(matching_titles)
+
+def filter_dataframe_by_search(df, search_text):
+    """
+    Filter the dataframe based on a global search text across ALL columns
+    in both the main Jobs dataframe and the Skills dataframe.
+    Matching is row-local, so for slices of the loaded jobs dataframe the
+    matching rows are computed once per term over the whole dataset and
+    shared between workers (cache namespace 'filters').
+    """
+    if not search_text or not search_text.strip():
+        return df
+        
+    search_term = search_text.strip().lower()
     
-    return df[final_mask]
+    is_slice = df.columns.equals(jobs_df.columns) and df.index.isin(jobs_df.index).all()
+    if not is_slice:
+        return df[_search_mask(df, search_term)]
+
+    matching_index = cached_value(
+        cache_key('filters', data_version, search_term),
+        lambda: jobs_df.index[_search_mask(jobs_df, search_term)].to_numpy()
+    )
+    
+    return df[df.index.isin(matching_index)]
 
 
 def get_color_scale(theme):
@@ -92,6 +108,10 @@ def get_color_scale(theme):
             [1.0, '#3399FF']     # Sky Blue (highest values)
         ]
 
+# Selection highlighting colors (shared with figure_factory)
+HIGHLIGHT_COLOR = '#00E5FF'  # Electric Cyan for selection (pops on any background)
+DIMMED_COLOR = 'rgba(100, 100, 100, 0.25)'  # Very dim gray
+
 def apply_visual_highlighting(fig, counts, selected_items, is_pie=False):
     """
     Apply visual highlighting to charts based on selection.
@@ -107,8 +127,8 @@ def apply_visual_highlighting(fig, counts, selected_items, is_pie=False):
         return
 
     # Enhanced colors for better visibility
-    highlight_color = '#00E5FF'  # Electric Cyan for selection (pops on any background)
-    dimmed_color = 'rgba(100, 100, 100, 0.25)'  # Very dim gray
+    highlight_color = HIGHLIGHT_COLOR
+    dimmed_color = DIMMED_COLOR
     
     if is_pie:
         # For pie charts, update marker colors
@@ -146,6 +166,7 @@ def create_empty_chart(title="No Data Available", theme='light'):
     
     fig = go.Figure()
     fig.update_layout(
+        template=chart_template(theme),
         xaxis={"visible": False},
         yaxis={"visible": False},
         annotations=[
@@ -194,6 +215,9 @@ def apply_chart_styling(fig, is_horizontal_bar=True, add_margin=True, theme='lig
     
     # 🎨 CORE STYLING - Transparent, Clean, Professional
     fig.update_layout(
+        # Compact theme template (replaces the ~7 KB stock template in the JSON)
+        template=chart_template(theme),
+        
         # Backgrounds - FULLY TRANSPARENT
         paper_bgcolor='rgba(0,0,0,0)',  # Outer background
         plot_bgcolor='rgba(0,0,0,0)',   # Chart area background
@@ -306,6 +330,8 @@ def apply_large_fonts_to_chart(fig, theme='light'):
     grid_color = 'rgba(255, 255, 255, 0.08)' if theme == 'dark' else 'rgba(0, 0, 0, 0.08)'
     
     fig.update_layout(
+        template=chart_template(theme),
+        
         # Base font - Optimized
         font=dict(
             size=13,
@@ -0,0 +1,140 @@
+"""
+Background cache warm-up for the default dashboard state.
+
+Almost every visitor first sees the default state (job status Open, no other
+filters, light theme), and after each machine auto-start the first of them used
+to pay for filtering, 20+ figure builds, the map GeoJSON and /full-map. After
+boot, a background thread replays the requests a first visit makes, through
+the Flask test client so the real callbacks run with a proper callback context:
+
+  * every page callback (Overview, City Map, Deep Analysis, Time Analysis,
+    Skills) with the layouts' default input values -> fills the 'figures'
+    cache and, for the City Map, the Leaflet GeoJSON ('map')
+  * GET /full-map -> 'full_map'
+
+The default state has no search text, so its filtering happens inside those
+cached page callbacks. Results land in the shared cache; with several workers
+the single-flight leases make sure each default output is computed once.
+GET /ready answers 503 while warming and 200 once done.
+
+WARMUP=0 disables it (/ready is then ready immediately).
+"""
+import os
+import threading
+import time
+
+from plotly.io.json import to_json_plotly
+
+from startup_report import record, print_report
+
+WARMUP_ENABLED = os.environ.get('WARMUP', '1').lower() not in ('0', 'false', 'no')
+
+# Page callbacks are identified by their first output id
+PAGE_CALLBACKS = {
+    'total-jobs-kpi': 'overview',
+    'city-total-jobs-kpi': 'city_map',
+    'top-companies-chart': 'deep_analysis',
+    'time-jobs-kpi': 'time_analysis',
+    'total-skills-kpi': 'skills',
+}
+
+_state = {'status': 'ready' if not WARMUP_ENABLED else 'pending', 'errors': {}}
+_state_lock = threading.Lock()
+_thread = None
+
+
+def _set_state(**values):
+    with _state_lock:
+        _state.update(values)
+
+
+def warmup_status():
+    with _state_lock:
+        return dict(_state, errors=dict(_state['errors']))
+
+
+def is_ready():
+    return warmup_status()['status'] == 'ready'
+
+
+def default_inputs(app):
+    """{component id: component} over the app and page layouts; their props are the values a first visit sends."""
+    from layouts.overview import overview_layout
+    from layouts.city_map import city_map_layout
+    from layouts.deep_analysis import deep_analysis_layout
+    from layouts.time_analysis import time_analysis_layout
+    from layouts.skills_analysis import skills_page_layout
+
+    components = {}
+    for layout in (app.layout, overview_layout(), city_map_layout(), deep_analysis_layout(),
+                   time_analysis_layout(), skills_page_layout()):
+        for component in layout._traverse():
+            component_id = getattr(component, 'id', None)
+            if isinstance(component_id, str):
+                components[component_id] = component
+    return components
+
+
+def page_requests(app):
+    """(page name, /_dash-update-component payload) for each page callback in its default state."""
+    components = default_inputs(app)
+
+    def with_value(item):
+        component = components.get(item['id'])
+        value = getattr(component, item['property'], None) if component is not None else None
+        return dict(item, value=value)
+
+    requests = []
+    for output, spec in app.callback_map.items():
+        outputs = output[2:-2].split('...') if output.startswith('..') else [output]
+        page = PAGE_CALLBACKS.get(outputs[0].rsplit('.', 1)[0])
+        if not page:
+            continue
+        output_specs = [{'id': part.rsplit('.', 1)[0], 'property': part.rsplit('.', 1)[1]} for part in outputs]
+        requests.append((page, {
+            'output': output,
+            'outputs': output_specs if len(output_specs) > 1 else output_specs[0],
+            'inputs': [with_value(item) for item in spec['inputs']],
+            'state': [with_value(item) for item in spec['state']],
+            'changedPropIds': [],
+        }))
+    return requests
+
+
+def run_warmup():
+    """Replay the default-state requests; records each step in the startup report."""
+    from app_instance import app
+    _set_state(status='warming', started=time.time())
+    client = app.server.test_client()
+    total_start = time.perf_counter()
+
+    steps = [(f'warmup:{page}', 'post', '/_dash-update-component', payload) for page, payload in page_requests(app)]
+    steps.append(('warmup:full_map', 'get', '/full-map', None))
+    for name, method, path, payload in steps:
+        start = time.perf_counter()
+        try:
+            if method == 'post':
+                # Encode like Dash serializes the layout, so values (e.g. dates) match what browsers send back
+                response = client.post(path, data=to_json_plotly(payload), content_type='application/json')
+            else:
+                response = client.get(path)
+            if response.status_code >= 400:
+                raise RuntimeError(f"HTTP {response.status_code}")
+        except Exception as e:
+            with _state_lock:
+                _state['errors'][name] = str(e)
+            print(f"[!] Warm-up step {name} failed: {e}")
+        record(name, (time.perf_counter() - start) * 1000)
+
+    record('warmup:total', (time.perf_counter() - total_start) * 1000)
+    _set_state(status='ready', finished=time.time())
+    print_report()
+
+
+def start_warmup():
+    """Start the warm-up thread once per process (call after forking, never in the gunicorn master)."""
+    global _thread
+    if not WARMUP_ENABLED or _thread is not None:
+        return
+    _thread = threading.Thread(target=run_warmup, name='cache-warmup', daemon=True)
+    _thread.start()